@@ -26,14 +26,21 @@ export async function DELETE(request: Request, { params }: { params: Promise<{ i
         userId: userId,
       },
     });
+    // Los eventos precalculados también se sirven en la primera vista
+    const precomputed = await prisma.precomputedEventsCache.deleteMany({
+      where: {
+        userId: userId,
+      },
+    });
 
     console.log(
-      `[Admin] Caché de calendario limpiada para usuario ${userId}. Registros eliminados: ${result.count}`
+      `[Admin] Caché de calendario limpiada para usuario ${userId}. Registros eliminados: ${result.count} (+${precomputed.count} precalculados)`
     );
 
     return NextResponse.json({
       message: 'Caché de calendario limpiada exitosamente',
       deletedCount: result.count,
+      precomputedDeletedCount: precomputed.count,
     });
   } catch (error) {
     console.error('Error al limpiar caché de calendario:', error);
@@ -176,6 +176,7 @@ export async function DELETE(request: NextRequest) {
       // A. Tablas de Caché y Datos Astrológicos
       await tx.interpretacionCache.deleteMany({ where: { userId } });
       await tx.personalCalendarCache.deleteMany({ where: { userId } });
+      await tx.precomputedEventsCache.deleteMany({ where: { userId } });
       await tx.lunarPhasesCache.deleteMany({ where: { userId } });
       // AstrogematriaCache is global, not per-user
 
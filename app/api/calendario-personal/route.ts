@@ -1,7 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import { authOptions } from '@/lib/auth-options';
-import { getCalendarCache, setCalendarCache } from '@/lib/calendar-cache';
+import { getCalendarCache, getPrecomputedEvents, setCalendarCache } from '@/lib/calendar-cache';
 import { setLunarCache } from '@/lib/lunar-cache';
 import prisma from '@/lib/prisma';
 import { getApiUrl } from '@/lib/api-config';
@@ -36,6 +36,73 @@ interface NatalData {
   year: number;
 }
 
+// Cálculos en segundo plano en curso (userId:year), para no lanzar dos veces el mismo
+const backgroundCalculations = new Set<string>();
+
+/**
+ * Calcula el calendario completo en el microservicio y lo guarda en el cache
+ * (PersonalCalendarCache y, para las fases, LunarPhasesCache)
+ */
+async function calcularCalendarioCompleto(
+  microserviceUrl: string,
+  natalData: NatalData,
+  userId: string,
+  year: number
+) {
+  // Initialize generated client
+  const client = new CalendarClient({ BASE: microserviceUrl });
+
+  // Adapt legacy NatalData to BirthDataRequest for the NEW strict endpoint
+  // natalData.hora_local is typically "YYYY-MM-DDTHH:MM" or similar ISO
+  const [birthDate, birthTimeFull] = natalData.hora_local.split('T');
+  const birthTime = birthTimeFull ? birthTimeFull.substring(0, 5) : "12:00"; // Ensure HH:MM
+
+  const data = await client.default.calculatePersonalCalendarDynamicEndpointCalculatePersonalCalendarDynamicPost({
+    name: natalData.name,
+    birth_date: birthDate,
+    birth_time: birthTime,
+    location: {
+      latitude: natalData.location.latitude,
+      longitude: natalData.location.longitude,
+      name: natalData.location.name,
+      timezone: natalData.location.timezone,
+    },
+    year: year,
+  });
+
+  // Guardar en cache
+  const cacheSuccess = await setCalendarCache(userId, year, data.events);
+
+  if (!cacheSuccess) {
+    console.warn('⚠️ No se pudo guardar en cache');
+  }
+
+  // Guardar en cache lunar (Fases y sus aspectos)
+  try {
+    const lunarEvents = data.events.filter((e: any) => {
+      const isPhaseType = [
+        'Luna Nueva',
+        'Luna Llena',
+        'Cuarto Creciente',
+        'Cuarto Menguante',
+        'Eclipse Solar',
+        'Eclipse Lunar',
+      ].includes(e.tipo_evento);
+      const isPhaseAspect = e.metadata && (e.metadata as any).phase_type;
+      return isPhaseType || isPhaseAspect;
+    });
+
+    if (lunarEvents.length > 0) {
+      await setLunarCache(userId, year, lunarEvents);
+      console.log(`🌙 Guardados ${lunarEvents.length} eventos lunares en cache auxiliar`);
+    }
+  } catch (lunarError) {
+    console.error('Error guardando cache lunar:', lunarError);
+  }
+
+  return data;
+}
+
 export async function POST(request: NextRequest) {
   // Retrieve configuration lazily inside handler
   const MICROSERVICE_URL = getApiUrl('CALENDARIO');
@@ -99,62 +166,47 @@ export async function POST(request: NextRequest) {
       }
     }
 
+    // Primera vista: servir los eventos precalculados y calcular el calendario completo en segundo plano
+    if (!forceRecalculate) {
+      const precomputed = await getPrecomputedEvents(userId, year);
+
+      if (precomputed) {
+        const key = `${userId}:${year}`;
+        if (!backgroundCalculations.has(key)) {
+          backgroundCalculations.add(key);
+          calcularCalendarioCompleto(MICROSERVICE_URL, natalData, userId, year)
+            .catch((backgroundError) =>
+              console.error('Error calculando calendario en segundo plano:', backgroundError)
+            )
+            .finally(() => backgroundCalculations.delete(key));
+        }
+
+        console.log(`📦 Devolviendo eventos precalculados (calendario completo en segundo plano)`);
+        return NextResponse.json({
+          events: precomputed.events,
+          calculation_time: 0,
+          total_events: precomputed.events.length,
+          transits_count: precomputed.events.filter((e: any) => e.tipo_evento?.includes('Tránsito'))
+            .length,
+          progressed_moon_count: precomputed.events.filter(
+            (e: any) => e.tipo_evento === 'Luna Progresada'
+          ).length,
+          profections_count: 0,
+          from_cache: true,
+          precomputed: true,
+          calculated_at: precomputed.calculatedAt,
+          expires_at: precomputed.expiresAt,
+        });
+      }
+    }
+
     // Cache miss o recalculación forzada: llamar al microservicio
     console.log(`🔄 Calculando eventos (cache miss o recalculación)`);
 
     const startTime = Date.now();
 
-    // Initialize generated client
-    const client = new CalendarClient({ BASE: MICROSERVICE_URL });
-
-    // Adapt legacy NatalData to BirthDataRequest for the NEW strict endpoint
-    // natalData.hora_local is typically "YYYY-MM-DDTHH:MM" or similar ISO
-    const [birthDate, birthTimeFull] = natalData.hora_local.split('T');
-    const birthTime = birthTimeFull ? birthTimeFull.substring(0, 5) : "12:00"; // Ensure HH:MM
-
     try {
-      const data = await client.default.calculatePersonalCalendarDynamicEndpointCalculatePersonalCalendarDynamicPost({
-        name: natalData.name,
-        birth_date: birthDate,
-        birth_time: birthTime,
-        location: {
-          latitude: natalData.location.latitude,
-          longitude: natalData.location.longitude,
-          name: natalData.location.name,
-          timezone: natalData.location.timezone,
-        },
-        year: year,
-      });
-
-      // Guardar en cache
-      const cacheSuccess = await setCalendarCache(userId, year, data.events);
-
-      if (!cacheSuccess) {
-        console.warn('⚠️ No se pudo guardar en cache');
-      }
-
-      // Guardar en cache lunar (Fases y sus aspectos)
-      try {
-        const lunarEvents = data.events.filter((e: any) => {
-          const isPhaseType = [
-            'Luna Nueva',
-            'Luna Llena',
-            'Cuarto Creciente',
-            'Cuarto Menguante',
-            'Eclipse Solar',
-            'Eclipse Lunar',
-          ].includes(e.tipo_evento);
-          const isPhaseAspect = e.metadata && (e.metadata as any).phase_type;
-          return isPhaseType || isPhaseAspect;
-        });
-
-        if (lunarEvents.length > 0) {
-          await setLunarCache(userId, year, lunarEvents);
-          console.log(`🌙 Guardados ${lunarEvents.length} eventos lunares en cache auxiliar`);
-        }
-      } catch (lunarError) {
-        console.error('Error guardando cache lunar:', lunarError);
-      }
+      const data = await calcularCalendarioCompleto(MICROSERVICE_URL, natalData, userId, year);
 
       const calculationTime = (Date.now() - startTime) / 1000;
 
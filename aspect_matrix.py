@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Motor de aspectos vectorizado (matriz N×N con NumPy).
+
+En lugar de recorrer el dict anidado de aspectos de Immanuel, toma un
+arreglo de longitudes (y opcionalmente velocidades, para aplicativo /
+separativo), calcula la matriz completa de separaciones angulares y prueba
+todos los ángulos de aspecto y sus orbes a la vez.
+
+Funciona para una carta (longitudes de forma (N,)) o para un lote de
+cartas apiladas (forma (M, N), por ejemplo todos los usuarios): la búsqueda
+de aspectos de todo el lote es una sola operación sobre arreglos.
+
+El movimiento (aplicativo / separativo) es geométrico: aplicativo si la
+diferencia con el aspecto exacto se achica según las velocidades actuales.
+Puede diferir de la regla de Immanuel con planetas retrógrados.
+
+Uso:
+    nombres, longitudes, velocidades = point_arrays(chart_obj.objects)
+    tabla = find_aspects(longitudes, velocidades, orbs={0: 8, 60: 6, 90: 8, 120: 8, 180: 8})
+    aspectos = tabla.to_list(nombres)
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from natal_chart_records import ASPECT_ORDER
+
+# Ángulo de aspecto -> nombre en español
+ASPECT_NAMES = {
+    0.0: 'Conjunción',
+    60.0: 'Sextil',
+    90.0: 'Cuadratura',
+    120.0: 'Trígono',
+    180.0: 'Oposición'
+}
+
+# Orbes por defecto (los de NATAL_PROFILE)
+DEFAULT_ORBS = {0: 8, 60: 6, 90: 8, 120: 8, 180: 8}
+
+# Diferencia (en grados) por debajo de la cual el aspecto se considera exacto
+DEFAULT_EXACT_ORB = 0.3
+
+# Cartas por bloque al procesar lotes grandes (acota la memoria de la matriz M×P×K)
+DEFAULT_CHUNK_SIZE = 4096
+
+# Estado del movimiento del aspecto
+MOVEMENT_UNKNOWN = -1
+MOVEMENT_SEPARATIVE = 0
+MOVEMENT_APPLICATIVE = 1
+MOVEMENT_EXACT = 2
+
+MOVEMENT_NAMES = {
+    MOVEMENT_UNKNOWN: None,
+    MOVEMENT_SEPARATIVE: 'Separative',
+    MOVEMENT_APPLICATIVE: 'Applicative',
+    MOVEMENT_EXACT: 'Exact'
+}
+
+
+@dataclass
+class AspectTable:
+    """
+    Tabla de aspectos (una fila por aspecto) en columnas de NumPy, ordenada
+    por carta, importancia del aspecto y par de puntos.
+
+    chart: índice de la carta dentro del lote
+    point1, point2: índices de los puntos (point1 < point2)
+    angle: ángulo del aspecto (0, 60, 90...)
+    separation: separación angular entre los puntos (0-180)
+    difference: separación - ángulo (negativo: antes del exacto)
+    movement: MOVEMENT_* (MOVEMENT_UNKNOWN si no se pasaron velocidades)
+    """
+    chart: np.ndarray
+    point1: np.ndarray
+    point2: np.ndarray
+    angle: np.ndarray
+    separation: np.ndarray
+    difference: np.ndarray
+    movement: np.ndarray
+
+    def __len__(self):
+        return len(self.chart)
+
+    def for_chart(self, index):
+        """Filas de una carta del lote"""
+        start, end = np.searchsorted(self.chart, [index, index + 1])
+        return AspectTable(*(getattr(self, name)[start:end] for name in self.__dataclass_fields__))
+
+    def to_list(self, names, names2=None):
+        """
+        Aspectos como lista de dicts (point1, point2, aspect, difference,
+        movement, chart). `names2` nombra los puntos de la segunda carta en
+        los aspectos cruzados.
+        """
+        names2 = names if names2 is None else names2
+        return [
+            {
+                'chart': int(chart),
+                'point1': names[point1],
+                'point2': names2[point2],
+                'aspect': ASPECT_NAMES[angle],
+                'angle': angle,
+                'separation': separation,
+                'difference': difference,
+                'movement': MOVEMENT_NAMES[movement]
+            }
+            for chart, point1, point2, angle, separation, difference, movement in zip(
+                self.chart.tolist(), self.point1.tolist(), self.point2.tolist(), self.angle.tolist(),
+                self.separation.tolist(), self.difference.tolist(), self.movement.tolist())
+        ]
+
+
+def separation_matrix(longitudes):
+    """
+    Separaciones angulares (0-180) entre todos los pares de puntos.
+    longitudes: (..., N) -> (..., N, N)
+    """
+    longitudes = np.asarray(longitudes, dtype=float)
+    delta = np.abs(longitudes[..., None, :] - longitudes[..., :, None]) % 360.0
+    return np.minimum(delta, 360.0 - delta)
+
+
+def _aspect_arrays(orbs):
+    """
+    Ángulos, orbes y rango de importancia de los aspectos configurados.
+    `orbs` es un dict ángulo -> orbe o, como settings.aspects de Immanuel,
+    una lista de ángulos: en ese caso cada ángulo toma su orbe de
+    DEFAULT_ORBS y se omiten los que no tienen nombre en la salida
+    (150°...), igual que en natal_chart_records.
+    """
+    if not isinstance(orbs, dict):
+        orbs = {float(angle): DEFAULT_ORBS[int(angle)] for angle in orbs if float(angle) in ASPECT_NAMES}
+    angles = np.array(sorted(float(angle) for angle in orbs), dtype=float)
+    unknown = [angle for angle in angles if angle not in ASPECT_NAMES]
+    if unknown:
+        raise ValueError(f"Ángulos de aspecto no soportados: {unknown}")
+    orb_values = np.array([float(orbs.get(angle, orbs.get(int(angle)))) for angle in angles])
+    ranks = np.array([ASPECT_ORDER[ASPECT_NAMES[angle]] for angle in angles])
+    return angles, orb_values, ranks
+
+
+def _find_chunk(longitudes, speeds, pairs, angles, orb_values, exact_orb):
+    """Aspectos de un bloque de cartas (M, N) -> columnas sin ordenar"""
+    first, second = pairs
+    # Diferencia firmada de cada par en (-180, 180]
+    delta = (longitudes[:, second] - longitudes[:, first] + 180.0) % 360.0 - 180.0
+    separation = np.abs(delta)                                       # (M, P)
+
+    deviation = separation[..., None] - angles                       # (M, P, K)
+    within = np.abs(deviation) <= orb_values
+    # Si los orbes se superponen, gana el aspecto más cercano al exacto
+    if angles.size:
+        distance = np.where(within, np.abs(deviation), np.inf)
+        best = distance.argmin(axis=-1)                              # (M, P)
+        hit = np.take_along_axis(within, best[..., None], axis=-1)[..., 0]
+    else:
+        best = np.zeros(separation.shape, dtype=np.intp)
+        hit = np.zeros(separation.shape, dtype=bool)
+
+    chart_index, pair_index = np.nonzero(hit)
+    aspect_index = best[chart_index, pair_index]
+    difference = deviation[chart_index, pair_index, aspect_index]
+
+    movement = np.full(len(chart_index), MOVEMENT_UNKNOWN, dtype=np.int8)
+    if speeds is not None:
+        # La separación crece si el par se abre en el sentido de delta
+        relative = speeds[chart_index, second[pair_index]] - speeds[chart_index, first[pair_index]]
+        opening = np.sign(delta[chart_index, pair_index]) * relative
+        movement[:] = np.where(difference * opening < 0, MOVEMENT_APPLICATIVE, MOVEMENT_SEPARATIVE)
+        movement[np.abs(difference) <= exact_orb] = MOVEMENT_EXACT
+
+    return (chart_index, first[pair_index], second[pair_index],
+            angles[aspect_index], separation[chart_index, pair_index], difference, movement)
+
+
+def _as_batch(longitudes, speeds):
+    """Longitudes y velocidades como arreglos (M, N)"""
+    longitudes = np.atleast_2d(np.asarray(longitudes, dtype=float))
+    if speeds is not None:
+        speeds = np.atleast_2d(np.asarray(speeds, dtype=float))
+        if speeds.shape != longitudes.shape:
+            raise ValueError("speeds debe tener la misma forma que longitudes")
+    return longitudes, speeds
+
+
+def _find(longitudes, speeds, pairs, orbs, exact_orb, chunk_size):
+    """Aspectos de los pares indicados en todo el lote, ordenados"""
+    angles, orb_values, ranks = _aspect_arrays(orbs)
+
+    chunks = []
+    for start in range(0, len(longitudes), chunk_size):
+        columns = _find_chunk(longitudes[start:start + chunk_size],
+                              None if speeds is None else speeds[start:start + chunk_size],
+                              pairs, angles, orb_values, exact_orb)
+        chunks.append((columns[0] + start,) + columns[1:])
+    if not chunks:
+        # Lote vacío: un bloque sin filas da columnas vacías con los tipos correctos
+        chunks.append(_find_chunk(longitudes, speeds, pairs, angles, orb_values, exact_orb))
+
+    columns = [np.concatenate(column) for column in zip(*chunks)]
+    chart, point1, point2, angle = columns[:4]
+    order = np.lexsort((point2, point1, ranks[np.searchsorted(angles, angle)], chart))
+    return AspectTable(*(column[order] for column in columns))
+
+
+def find_aspects(longitudes, speeds=None, orbs=DEFAULT_ORBS, exact_orb=DEFAULT_EXACT_ORB,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Aspectos entre todos los pares de puntos de una carta o de un lote.
+
+    Args:
+        longitudes: (N,) para una carta o (M, N) para M cartas
+        speeds: velocidades en °/día con la misma forma (opcional)
+        orbs: dict ángulo -> orbe o lista de ángulos (como settings.aspects)
+        exact_orb: diferencia máxima para considerar el aspecto exacto
+        chunk_size: cartas por bloque en lotes grandes
+
+    Returns:
+        AspectTable sin duplicados (cada par una vez, point1 < point2),
+        ordenada por carta, importancia del aspecto y par de puntos
+    """
+    longitudes, speeds = _as_batch(longitudes, speeds)
+    pairs = np.triu_indices(longitudes.shape[1], k=1)
+    return _find(longitudes, speeds, pairs, orbs, exact_orb, chunk_size)
+
+
+def find_cross_aspects(longitudes1, longitudes2, speeds1=None, speeds2=None, orbs=DEFAULT_ORBS,
+                       exact_orb=DEFAULT_EXACT_ORB, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Aspectos cruzados entre dos conjuntos de puntos (p. ej. tropical vs
+    dracónica, o sinastría): todos los pares (i de la primera, j de la
+    segunda), incluido el mismo punto en ambas.
+
+    Returns:
+        AspectTable donde point1 indexa longitudes1 y point2 indexa longitudes2
+    """
+    longitudes1, speeds1 = _as_batch(longitudes1, speeds1)
+    longitudes2, speeds2 = _as_batch(longitudes2, speeds2)
+    first_count, second_count = longitudes1.shape[1], longitudes2.shape[1]
+
+    longitudes = np.concatenate([longitudes1, longitudes2], axis=1)
+    speeds = None
+    if speeds1 is not None and speeds2 is not None:
+        speeds = np.concatenate([speeds1, speeds2], axis=1)
+    first, second = np.meshgrid(np.arange(first_count), np.arange(second_count) + first_count, indexing='ij')
+
+    table = _find(longitudes, speeds, (first.ravel(), second.ravel()), orbs, exact_orb, chunk_size)
+    table.point2 = table.point2 - first_count
+    return table
+
+
+def point_arrays(objects, names=None):
+    """
+    Nombres, longitudes y velocidades desde los objetos de Immanuel
+    (chart_obj.objects). Los objetos sin velocidad (ángulos) quedan con 0.
+    """
+    selected = [obj for obj in objects.values() if names is None or obj.name in names]
+    longitudes = np.array([getattr(obj.longitude, 'raw', obj.longitude) for obj in selected])
+    speeds = np.array([getattr(obj, 'speed', 0.0) for obj in selected])
+    return [obj.name for obj in selected], longitudes, speeds
+
+
+def points_from_result(points, names=None):
+    """Nombres y longitudes desde result['points'] de calcular_carta_natal"""
+    names = list(points) if names is None else list(names)
+    return names, np.array([points[name]['longitude'] for name in names])
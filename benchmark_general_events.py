@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark: generación de los archivos de eventos generales
+Serie (un año tras otro) vs un año por proceso, y extensión incremental.
+
+Escribe en un directorio temporal y mide eventos por segundo.
+
+Uso:
+    python benchmark_general_events.py [año_inicial] [año_final]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from general_events import calcular_eventos_anio, generar_eventos
+
+def medir_serie(start_year, end_year):
+    start = time.perf_counter()
+    eventos = sum(len(calcular_eventos_anio(year)) for year in range(start_year, end_year + 1))
+    return time.perf_counter() - start, eventos
+
+def medir_pool(start_year, end_year, output_dir, workers=None):
+    start = time.perf_counter()
+    eventos = sum(count for _, count in generar_eventos(start_year, end_year, output_dir, workers=workers))
+    return time.perf_counter() - start, eventos
+
+def imprimir(nombre, elapsed, eventos):
+    rate = eventos / elapsed if elapsed else 0.0
+    print(f"{nombre:<22} | {elapsed:>8.2f}s | {eventos:>6} eventos | {rate:>9.0f} eventos/s")
+
+def main():
+    start_year = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+    end_year = int(sys.argv[2]) if len(sys.argv) > 2 else 2030
+    cpus = os.cpu_count() or 1
+
+    print("⏱️  BENCHMARK: Eventos generales")
+    print("=" * 72)
+    print(f"Años: {start_year}-{end_year} | CPUs: {cpus}")
+    print("=" * 72)
+
+    imprimir("Serie", *medir_serie(start_year, end_year))
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        imprimir(f"Pool x{cpus}", *medir_pool(start_year, end_year, output_dir, workers=cpus))
+        imprimir("Sin cambios (skip)", *medir_pool(start_year, end_year, output_dir))
+        imprimir("Extender un año", *medir_pool(start_year, end_year + 1, output_dir))
+
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
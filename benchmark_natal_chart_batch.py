@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cálculo de cartas natales en lote
+Serie vs pool de procesos con distinta cantidad de workers.
+
+Genera nativos sintéticos (un nacimiento cada 13 días desde 1950,
+rotando entre varias ciudades) y mide cartas por segundo.
+
+Uso:
+    python benchmark_natal_chart_batch.py [cantidad_de_cartas]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from natal_chart_batch import calcular_cartas_natales, calcular_cartas_natales_serial
+
+CIUDADES = [
+    ('Buenos Aires', -34.6118, -58.3960, 'America/Argentina/Buenos_Aires'),
+    ('Madrid', 40.4168, -3.7038, 'Europe/Madrid'),
+    ('Ciudad de México', 19.4326, -99.1332, 'America/Mexico_City'),
+    ('Santiago', -33.4489, -70.6693, 'America/Santiago'),
+]
+
+def generar_usuarios(cantidad):
+    """Nativos sintéticos con el formato de datos_usuario"""
+    base = datetime(1950, 1, 1, 6, 30)
+    for i in range(cantidad):
+        lugar, lat, lon, zona = CIUDADES[i % len(CIUDADES)]
+        momento = base + timedelta(days=13 * i, minutes=37 * i)
+        yield {
+            'hora_local': momento.isoformat(),
+            'lat': lat,
+            'lon': lon,
+            'zona_horaria': zona,
+            'lugar': lugar
+        }
+
+def medir(nombre, resultados, cantidad):
+    """Consume el generador y devuelve (segundos, errores)"""
+    start = time.perf_counter()
+    errores = sum(1 for item in resultados if item.error)
+    elapsed = time.perf_counter() - start
+    print(f"{nombre:<14} | {elapsed:>8.2f}s | {cantidad / elapsed:>9.1f} cartas/s | errores: {errores}")
+    return elapsed
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    cpus = os.cpu_count() or 1
+
+    print("⏱️  BENCHMARK: Cartas natales en lote")
+    print("=" * 64)
+    print(f"Cartas: {cantidad} | CPUs: {cpus}")
+    print("=" * 64)
+
+    serial = medir("Serie", calcular_cartas_natales_serial(generar_usuarios(cantidad)), cantidad)
+
+    workers = 1
+    while workers <= cpus:
+        elapsed = medir(f"Pool x{workers}",
+                        calcular_cartas_natales(generar_usuarios(cantidad), workers=workers),
+                        cantidad)
+        print(f"{'':<14} |  aceleración x{serial / elapsed:.2f} (ideal x{workers})")
+        workers *= 2
+
+    print("=" * 64)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: carta tropical + dracónica + cruzada
+Tres llamadas separadas vs calcular_cartas_dual (una pasada de efemérides).
+
+Las tres llamadas separadas reproducen lo que pide el front-end: la
+tropical, la dracónica (charts.DraconicChart) y la cruzada, que vuelve a
+calcular ambas cartas antes de cruzarlas.
+
+Antes de medir verifica la carta dual:
+- Velocidades dracónicas de planetas y nodos contra la diferencia finita
+  de las longitudes dracónicas diez minutos después.
+- Dracónica por rotación contra charts.DraconicChart (longitudes, cúspides
+  y aspectos). Si la versión de Immanuel instalada no tiene DraconicChart,
+  esa verificación y la comparación de tiempos se omiten.
+
+Uso:
+    python benchmark_natal_chart_dual.py [cantidad_de_nativos]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from immanuel import charts
+
+from benchmark_natal_chart_batch import generar_usuarios
+from natal_chart_dual import NORTH_NODE, calcular_cartas_dual, cruzar_cartas
+from natal_chart_proposed import calcular_carta_natal, calcular_registros_carta_natal
+
+# Tolerancias de la verificación
+LONGITUDE_TOLERANCE = 1e-6          # grados
+SPEED_TOLERANCE = 0.01              # °/día (la diferencia finita incluye la aceleración)
+SPEED_STEP = timedelta(minutes=10)
+MAX_CHECKED_SPEED = 30.0            # °/día: se verifican planetas, nodos y puntos lentos
+
+def _diferencia_angular(a, b):
+    return abs((a - b + 180) % 360 - 180)
+
+def _claves_aspectos(carta):
+    return {(aspecto['point1'], aspecto['point2'], aspecto['aspect']) for aspecto in carta['aspects']}
+
+def verificar_velocidades(usuarios):
+    """Máxima diferencia (°/día) entre la velocidad dracónica y la diferencia finita de la longitud dracónica"""
+    peor = 0.0
+    for datos_usuario in usuarios:
+        despues = dict(datos_usuario)
+        despues['hora_local'] = (datetime.fromisoformat(datos_usuario['hora_local']) + SPEED_STEP).isoformat()
+        ahora = calcular_registros_carta_natal(datos_usuario)
+        luego = calcular_registros_carta_natal(despues)
+        node, node_luego = ahora.point(NORTH_NODE), luego.point(NORTH_NODE)
+        draconica = ahora.rotated(node.longitude, node.speed)
+        draconica_luego = luego.rotated(node_luego.longitude, node_luego.speed)
+        dias = SPEED_STEP / timedelta(days=1)
+        for tropical, record, record_luego in zip(ahora.points, draconica.points, draconica_luego.points):
+            # Sin velocidad de efemérides (Parte de la Fortuna) o con giro diario (ángulos, Vertex)
+            if tropical.speed == 0.0 or abs(tropical.speed) > MAX_CHECKED_SPEED:
+                continue
+            delta = (record_luego.longitude - record.longitude + 180) % 360 - 180
+            peor = max(peor, abs(delta / dias - record.speed))
+    return peor
+
+def verificar_equivalencia(usuarios):
+    """Máxima diferencia de longitud entre la dracónica por rotación y charts.DraconicChart"""
+    peor = 0.0
+    for datos_usuario in usuarios:
+        dual = calcular_cartas_dual(datos_usuario)['draconica']
+        referencia = calcular_carta_natal(datos_usuario, draconica=True)
+        for seccion in ('points', 'houses', 'angles'):
+            for nombre, valores in referencia[seccion].items():
+                peor = max(peor, _diferencia_angular(dual[seccion][nombre]['longitude'], valores['longitude']))
+        if _claves_aspectos(dual) != _claves_aspectos(referencia):
+            return float('inf')
+    return peor
+
+def tres_llamadas(datos_usuario):
+    """Tropical, dracónica y cruzada como llamadas independientes"""
+    calcular_carta_natal(datos_usuario)
+    calcular_carta_natal(datos_usuario, draconica=True)
+    cruzar_cartas(calcular_registros_carta_natal(datos_usuario),
+                  calcular_registros_carta_natal(datos_usuario, draconica=True))
+
+def medir(nombre, funcion, usuarios, referencia=None):
+    """Tiempo por nativo en milisegundos"""
+    start = time.perf_counter()
+    for datos_usuario in usuarios:
+        funcion(datos_usuario)
+    elapsed = (time.perf_counter() - start) / len(usuarios) * 1000
+    comparacion = f" | x{referencia / elapsed:.2f}" if referencia else ""
+    print(f"{nombre:<28} | {elapsed:>8.2f} ms/nativo{comparacion}")
+    return elapsed
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    usuarios = list(generar_usuarios(cantidad))
+
+    print("⏱️  BENCHMARK: Tropical + dracónica + cruzada")
+    print("=" * 64)
+    print(f"Nativos: {cantidad}")
+    print("=" * 64)
+
+    muestra = usuarios[:10]
+    peor = verificar_velocidades(muestra)
+    estado = "✅" if peor <= SPEED_TOLERANCE else "❌"
+    print(f"{estado} Velocidades dracónicas vs diferencia finita: diferencia máxima {peor:.2e} °/día")
+
+    if not hasattr(charts, 'DraconicChart'):
+        print("⏭️  charts.DraconicChart no está disponible: se omiten la equivalencia y la comparación de tiempos")
+        print("=" * 64)
+        return
+
+    peor = verificar_equivalencia(muestra)
+    estado = "✅" if peor <= LONGITUDE_TOLERANCE else "❌"
+    print(f"{estado} Dracónica por rotación vs charts.DraconicChart: diferencia máxima {peor:.2e}°")
+    print("-" * 64)
+
+    base = medir("Tres llamadas separadas", tres_llamadas, usuarios)
+    medir("calcular_cartas_dual", calcular_cartas_dual, usuarios, base)
+
+    print("=" * 64)
+
+if __name__ == "__main__":
+    main()
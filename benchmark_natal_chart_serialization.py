@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: post-procesamiento del resultado de calcular_carta_natal
+Bucles originales (hasattr por campo) vs extracción por tipo (natal_chart_records).
+
+Calcula la carta una sola vez y mide sólo la conversión del raw_data de
+Immanuel al resultado, más las salidas JSON y binaria. El dict de siempre
+sale a la par de los bucles originales (entre x1.0 y x1.2 según la corrida);
+la mejora se ve en los registros, to_json y to_bytes.
+
+Uso:
+    python benchmark_natal_chart_serialization.py [repeticiones]
+"""
+
+import json
+import sys
+import timeit
+from datetime import datetime
+
+from natal_chart_proposed import NATAL_PROFILE, charts, use_profile
+from natal_chart_records import ChartRecords
+
+BIRTH_DATA = {
+    'hora_local': '1964-12-26T21:12:00',
+    'lat': -34.6118,
+    'lon': -58.3960
+}
+
+def procesar_original(raw_data):
+    """Bucles de natal_chart_proposed antes de la extracción por tipo (referencia)"""
+    result = {'points': {}, 'houses': {}, 'angles': {}, 'aspects': []}
+
+    for index, obj in raw_data.get('objects', {}).items():
+        point_data = {
+            'longitude': obj.longitude.raw if hasattr(obj.longitude, 'raw') else obj.longitude,
+            'latitude': (obj.latitude.raw if hasattr(obj.latitude, 'raw') else obj.latitude) if hasattr(obj, 'latitude') else 0.0,
+            'distance': (obj.distance.raw if hasattr(obj.distance, 'raw') else obj.distance) if hasattr(obj, 'distance') else 0.0,
+            'sign': obj.sign.name,
+            'degrees': obj.sign_longitude.raw if hasattr(obj.sign_longitude, 'raw') else obj.sign_longitude,
+            'retrograde': obj.movement.retrograde if hasattr(obj, 'movement') and hasattr(obj.movement, 'retrograde') else False
+        }
+        result['points'][obj.name] = point_data
+
+        if obj.name in ['Asc', 'MC']:
+            result['angles'][obj.name] = {
+                'longitude': obj.longitude.raw if hasattr(obj.longitude, 'raw') else obj.longitude,
+                'sign': obj.sign.name,
+                'degrees': obj.sign_longitude.raw if hasattr(obj.sign_longitude, 'raw') else obj.sign_longitude
+            }
+            opposite_name = 'Dsc' if obj.name == 'Asc' else 'Ic'
+            opposite_longitude = ((obj.longitude.raw if hasattr(obj.longitude, 'raw') else obj.longitude) + 180) % 360
+            opposite_sign = ['Aries', 'Tauro', 'Géminis', 'Cáncer', 'Leo', 'Virgo',
+                             'Libra', 'Escorpio', 'Sagitario', 'Capricornio', 'Acuario', 'Piscis'][int(opposite_longitude / 30)]
+            result['angles'][opposite_name] = {
+                'longitude': opposite_longitude,
+                'sign': opposite_sign,
+                'degrees': opposite_longitude % 30
+            }
+
+    for index, house in raw_data.get('houses', {}).items():
+        result['houses'][str(house.number)] = {
+            'longitude': house.longitude.raw if hasattr(house.longitude, 'raw') else house.longitude,
+            'sign': house.sign.name,
+            'degrees': house.sign_longitude.raw if hasattr(house.sign_longitude, 'raw') else house.sign_longitude
+        }
+
+    aspect_names = {'Conjunction': 'Conjunción', 'Sextile': 'Sextil', 'Square': 'Cuadratura',
+                    'Trine': 'Trígono', 'Opposition': 'Oposición'}
+    aspects_set = set()
+    for p1_idx, aspects_dict in raw_data.get('aspects', {}).items():
+        for p2_idx, aspect in aspects_dict.items():
+            aspect_key = tuple(sorted([aspect._active_name, aspect._passive_name]) + [aspect.type])
+            if aspect_key in aspects_set:
+                continue
+            aspects_set.add(aspect_key)
+            if aspect.type not in aspect_names:
+                continue
+            result['aspects'].append({
+                'point1': aspect._active_name,
+                'point2': aspect._passive_name,
+                'aspect': aspect_names[aspect.type],
+                'difference': {
+                    'raw': aspect.difference.raw if hasattr(aspect.difference, 'raw') else aspect.difference,
+                    'formatted': aspect.difference.formatted if hasattr(aspect.difference, 'formatted') else None,
+                    'direction': aspect.difference.direction if hasattr(aspect.difference, 'direction') else None,
+                    'degrees': aspect.difference.degrees if hasattr(aspect.difference, 'degrees') else None,
+                    'minutes': aspect.difference.minutes if hasattr(aspect.difference, 'minutes') else None,
+                    'seconds': aspect.difference.seconds if hasattr(aspect.difference, 'seconds') else None
+                },
+                'movement': {
+                    'applicative': aspect.movement.applicative if hasattr(aspect.movement, 'applicative') else False,
+                    'exact': aspect.movement.exact if hasattr(aspect.movement, 'exact') else False,
+                    'separative': aspect.movement.separative if hasattr(aspect.movement, 'separative') else False,
+                    'formatted': aspect.movement.formatted if hasattr(aspect.movement, 'formatted') else None
+                },
+                'condition': {
+                    'associate': aspect.condition.associate if hasattr(aspect.condition, 'associate') else False,
+                    'dissociate': aspect.condition.dissociate if hasattr(aspect.condition, 'dissociate') else False,
+                    'formatted': aspect.condition.formatted if hasattr(aspect.condition, 'formatted') else None
+                }
+            })
+
+    aspect_order = {'Conjunción': 1, 'Oposición': 2, 'Cuadratura': 3, 'Trígono': 4, 'Sextil': 5}
+    result['aspects'].sort(key=lambda x: (aspect_order[x['aspect']], x['point1'], x['point2']))
+    return result
+
+def medir(nombre, funcion, repeticiones, referencia=None, rondas=5):
+    """Tiempo por carta en microsegundos (mejor de varias rondas)"""
+    funcion()
+    elapsed = min(timeit.repeat(funcion, number=repeticiones, repeat=rondas)) / repeticiones * 1e6
+    comparacion = f" | x{referencia / elapsed:.2f}" if referencia else ""
+    print(f"{nombre:<34} | {elapsed:>9.1f} µs/carta{comparacion}")
+    return elapsed
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    native = charts.Subject(
+        date_time=datetime.fromisoformat(BIRTH_DATA['hora_local']),
+        latitude=BIRTH_DATA['lat'],
+        longitude=BIRTH_DATA['lon']
+    )
+    with use_profile(NATAL_PROFILE):
+        raw_data = charts.Natal(native).to_dict()
+
+    original = procesar_original(raw_data)
+    nuevo = ChartRecords.from_raw(raw_data).to_dict()
+    iguales = json.dumps(original, ensure_ascii=False) == json.dumps(nuevo, ensure_ascii=False)
+
+    print("⏱️  BENCHMARK: Post-procesamiento de carta natal")
+    print("=" * 64)
+    print(f"Repeticiones: {repeticiones} | Aspectos: {len(nuevo['aspects'])} | Resultado idéntico: {'✅' if iguales else '❌'}")
+    print("=" * 64)
+
+    base = medir("Bucles originales (dict)", lambda: procesar_original(raw_data), repeticiones)
+    medir("Extracción por tipo (registros)", lambda: ChartRecords.from_raw(raw_data), repeticiones, base)
+    medir("Extracción por tipo (dict)", lambda: ChartRecords.from_raw(raw_data).to_dict(), repeticiones, base)
+
+    records = ChartRecords.from_raw(raw_data)
+    print("-" * 64)
+    medir("json.dumps del dict original",
+          lambda: json.dumps(original, ensure_ascii=False, separators=(',', ':')), repeticiones)
+    medir("ChartRecords.to_json", records.to_json, repeticiones)
+    medir("ChartRecords.to_bytes", records.to_bytes, repeticiones)
+    print("-" * 64)
+    print(f"Tamaño JSON: {len(records.to_json())} bytes | binario: {len(records.to_bytes())} bytes")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    main()
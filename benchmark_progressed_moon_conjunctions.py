@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: búsqueda de conjunciones de Luna progresada
+Barrido día a día (find_conjunction_simple) vs solver por raíces (find_conjunction_exact)
+
+Datos de prueba: Persona nacida 26/12/1964, 21:12, Buenos Aires, Argentina
+
+Uso:
+    python benchmark_progressed_moon_conjunctions.py [año]
+"""
+
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+
+import test_simple_progressed_moon_immanuel as simple
+
+def count_calls(function):
+    """Envuelve una función de posición contando sus llamadas"""
+    def wrapper(*args, **kwargs):
+        wrapper.calls += 1
+        return function(*args, **kwargs)
+    wrapper.calls = 0
+    return wrapper
+
+def run(search, position_name, planet_name, target_year):
+    """Ejecuta una búsqueda silenciosa y devuelve (resultado, segundos, llamadas)"""
+    original = getattr(simple, position_name)
+    counter = count_calls(original)
+    setattr(simple, position_name, counter)
+    try:
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            result = search(planet_name, target_year)
+        elapsed = time.perf_counter() - start
+    finally:
+        setattr(simple, position_name, original)
+    return result, elapsed, counter.calls
+
+def main():
+    target_year = int(sys.argv[1]) if len(sys.argv) > 1 else 2025
+
+    print("⏱️  BENCHMARK: Conjunciones de Luna progresada")
+    print("=" * 78)
+    print(f"Datos natales: {simple.BIRTH_DATA['date'].strftime('%d/%m/%Y %H:%M')} - Buenos Aires")
+    print(f"Año: {target_year}")
+    print("=" * 78)
+    print(f"{'Planeta':<10} | {'Día a día':>16} | {'Raíces':>16} | {'Fecha día a día':<16} | {'Exacta (local)':<16}")
+    print("-" * 78)
+
+    totals = {'simple_time': 0.0, 'simple_calls': 0, 'exact_time': 0.0, 'exact_calls': 0}
+
+    for planet_name in simple.NATAL_POSITIONS.keys():
+        if planet_name == 'Moon':
+            continue
+
+        simple_result, simple_time, simple_calls = run(
+            simple.find_conjunction_simple, 'calculate_progressed_moon_position', planet_name, target_year)
+        exact_result, exact_time, exact_calls = run(
+            simple.find_conjunction_exact, 'calculate_progressed_moon_position_jd', planet_name, target_year)
+
+        totals['simple_time'] += simple_time
+        totals['simple_calls'] += simple_calls
+        totals['exact_time'] += exact_time
+        totals['exact_calls'] += exact_calls
+
+        simple_date = simple_result[0].strftime('%Y-%m-%d') if simple_result else '-'
+        exact_date = exact_result[0].strftime('%Y-%m-%d %H:%M') if exact_result else '-'
+        print(f"{planet_name:<10} | {simple_calls:>5} / {simple_time * 1000:>7.1f}ms | "
+              f"{exact_calls:>5} / {exact_time * 1000:>7.1f}ms | {simple_date:<16} | {exact_date:<16}")
+
+    print("-" * 78)
+    print(f"{'TOTAL':<10} | {totals['simple_calls']:>5} / {totals['simple_time'] * 1000:>7.1f}ms | "
+          f"{totals['exact_calls']:>5} / {totals['exact_time'] * 1000:>7.1f}ms |")
+    print("=" * 78)
+
+    if totals['exact_time'] > 0:
+        print(f"Aceleración: x{totals['simple_time'] / totals['exact_time']:.1f}")
+    if totals['exact_calls'] > 0:
+        print(f"Reducción de llamadas a efemérides: x{totals['simple_calls'] / totals['exact_calls']:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de los caminos calientes del cálculo, con línea base y
+umbrales de regresión.
+
+Casos (fixtures: test_cases.json y astroseek_reference_data.json):
+- carta_natal_tropical / carta_natal_draconica: calcular_carta_natal para
+  todos los nativos de los fixtures.
+- luna_progresada_individual: ProgressedNativeContext.moon_at, una fecha
+  por mes del año del caso principal.
+- luna_progresada_lote: moon_at_array sobre los 365 días del año.
+- conjunciones_anio: sweep_aspects de conjunciones de todo el año a los
+  planetas natales de AstroSeek.
+- titulos_interpretacion: load_target_titles_from_file sobre el markdown de
+  títulos (el real si se pasa --titles, si no uno generado con el catálogo
+  de eventos y el espacio natal de interpretation_coverage).
+- titulos_indice: TitleIndex.load desde el cache persistido.
+
+Cada caso se corre --repeat veces (después de una vuelta de calentamiento)
+y se reportan mediana y p95 en milisegundos. Si un caso no se puede preparar
+en este entorno (falta un módulo, p. ej. la copia vendorizada src.immanuel,
+o la versión de Immanuel no tiene charts.DraconicChart), se informa como
+omitido con el motivo y no cuenta como regresión; cualquier otro error al
+prepararlo sí cuenta como regresión (y no se regraba la línea base). Con --update-baseline se
+guardan en benchmark_baseline.json (versionado en el repo); sin él se
+compara contra esa línea base y el script sale con código 1 si la mediana
+o el p95 empeoran más que el umbral.
+
+Uso:
+    python benchmark_suite.py                      # comparar contra la línea base
+    python benchmark_suite.py --update-baseline    # regrabar la línea base
+    python benchmark_suite.py --only carta_natal_tropical,conjunciones_anio --repeat 50
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from reference_cases import load_astroseek_reference, load_reference_cases
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+DEFAULT_REPEAT = 20
+# Empeoramiento tolerado respecto de la línea base
+DEFAULT_MEDIAN_THRESHOLD = 0.20
+DEFAULT_P95_THRESHOLD = 0.50
+# Margen absoluto para casos de microsegundos (ruido del reloj y del sistema)
+MIN_SLACK_MS = 0.05
+
+def percentile(values, fraction):
+    """Percentil con interpolación lineal (como numpy.percentile)"""
+    return float(np.percentile(values, fraction * 100))
+
+def titles_fixture(directory):
+    """Markdown de títulos con el formato del interpretador, generado desde el catálogo"""
+    from interpretation_coverage import event_space
+    from title_search import load_catalog_titles
+
+    path = Path(directory) / 'titulos_fixture.md'
+    lines = ['# Títulos Numerados (fixture de benchmark)', '']
+    for number, (_, query) in enumerate(event_space(load_catalog_titles()), start=1):
+        section, item = divmod(number, 100)
+        lines.append(f"## {section + 1}.{item} {query[:1].upper()}{query[1:]}")
+        lines.append('Texto de interpretación.')
+    path.write_text('\n'.join(lines), encoding='utf-8')
+    return path
+
+class UnsupportedBenchmark(Exception):
+    """El caso no se puede correr en este entorno (no es una falla del cálculo)"""
+
+# Cada benchmark recibe el contexto compartido y devuelve la función a medir
+
+def bench_carta_natal_tropical(context):
+    from natal_chart_proposed import calcular_carta_natal
+    cases = context['cases']
+    return lambda: [calcular_carta_natal(case.datos_usuario) for case in cases]
+
+def bench_carta_natal_draconica(context):
+    from natal_chart_proposed import calcular_carta_natal, charts
+    if not hasattr(charts, 'DraconicChart'):
+        raise UnsupportedBenchmark("la versión de Immanuel no tiene charts.DraconicChart")
+    cases = context['cases']
+    return lambda: [calcular_carta_natal(case.datos_usuario, draconica=True) for case in cases]
+
+def bench_luna_progresada_individual(context):
+    native, jds = context['native'], context['year_jds'][::31]
+    return lambda: [native.moon_at(jd) for jd in jds]
+
+def bench_luna_progresada_lote(context):
+    native, jds = context['native'], context['year_jds']
+    return lambda: native.moon_at_array(jds)
+
+def bench_conjunciones_anio(context):
+    from progressed_moon import sweep_aspects
+    native, jds, points = context['native'], context['year_jds'], context['natal_points']
+    return lambda: sweep_aspects(native, points, jds[0], jds[-1] + 1.0, aspects=[0.0])
+
+def bench_titulos_interpretacion(context):
+    from diagnostico_eventos_detectables import load_target_titles_from_file
+    path = context['titles_path']
+
+    def run():
+        with redirect_stdout(io.StringIO()):
+            return load_target_titles_from_file(path)
+    return run
+
+def bench_titulos_indice(context):
+    from title_index import TitleIndex
+    path = context['titles_path']
+    cache_path = Path(context['workdir']) / 'titulos.index.json'
+    TitleIndex.load(path, cache_path)
+    return lambda: TitleIndex.load(path, cache_path)
+
+BENCHMARKS = {
+    'carta_natal_tropical': bench_carta_natal_tropical,
+    'carta_natal_draconica': bench_carta_natal_draconica,
+    'luna_progresada_individual': bench_luna_progresada_individual,
+    'luna_progresada_lote': bench_luna_progresada_lote,
+    'conjunciones_anio': bench_conjunciones_anio,
+    'titulos_interpretacion': bench_titulos_interpretacion,
+    'titulos_indice': bench_titulos_indice,
+}
+
+def build_context(workdir, titles_path=None):
+    """Fixtures compartidos por todos los benchmarks"""
+    from progressed_moon import ProgressedNativeContext, utc_to_jd
+
+    reference = load_astroseek_reference()
+    native = ProgressedNativeContext(reference.birth_date, reference.latitude, reference.longitude)
+    start_jd = utc_to_jd(datetime(reference.year, 1, 1, tzinfo=timezone.utc))
+    return {
+        'workdir': workdir,
+        'cases': load_reference_cases(),
+        'native': native,
+        'year_jds': start_jd + np.arange(365, dtype=np.float64),
+        'natal_points': {name: longitude for name, longitude in reference.expected_points.items()
+                         if name not in ('Asc', 'MC', 'Moon')},
+        'titles_path': Path(titles_path) if titles_path else titles_fixture(workdir),
+    }
+
+def prepare(name, context):
+    """
+    Arma el caso y corre la vuelta de calentamiento. Devuelve (función, None)
+    o (None, motivo) si el caso no se puede correr en este entorno (falta un
+    módulo o charts.DraconicChart). Cualquier otro error se propaga.
+    """
+    try:
+        # calcular_carta_natal imprime su traceback antes de relanzar el error
+        with redirect_stdout(io.StringIO()):
+            function = BENCHMARKS[name](context)
+            function()
+    except (ImportError, UnsupportedBenchmark) as e:
+        return None, f"{type(e).__name__}: {e}"
+    return function, None
+
+def measure(function, repeat):
+    """
+    Mediana y p95 en milisegundos de `repeat` corridas (la de calentamiento
+    la hace prepare), con el recolector de basura apagado como en timeit.
+    """
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        'median_ms': round(statistics.median(samples), 4),
+        'p95_ms': round(percentile(samples, 0.95), 4),
+        'repeat': repeat,
+    }
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def compare(name, result, baseline, median_threshold, p95_threshold):
+    """Lista de regresiones (texto) del caso respecto de la línea base"""
+    if baseline is None:
+        return []
+    regressions = []
+    for metric, threshold in (('median_ms', median_threshold), ('p95_ms', p95_threshold)):
+        limit = baseline[metric] * (1 + threshold) + MIN_SLACK_MS
+        if result[metric] > limit:
+            regressions.append(f"{name}: {metric} {result[metric]:.3f} ms > {limit:.3f} ms "
+                               f"(base {baseline[metric]:.3f} ms, +{threshold:.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de los caminos calientes con umbrales de regresión")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH))
+    parser.add_argument('--update-baseline', action='store_true', help="Regrabar la línea base con esta corrida")
+    parser.add_argument('--only', help="Casos separados por coma (por defecto todos)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_MEDIAN_THRESHOLD,
+                        help="Empeoramiento tolerado de la mediana (0.20 = 20%%)")
+    parser.add_argument('--p95-threshold', type=float, default=DEFAULT_P95_THRESHOLD)
+    parser.add_argument('--titles', help="Markdown de títulos real (por defecto se genera uno)")
+    parser.add_argument('--json', help="Guardar los resultados de esta corrida en un JSON")
+    args = parser.parse_args()
+
+    names = list(BENCHMARKS)
+    if args.only:
+        names = [name.strip() for name in args.only.split(',')]
+        unknown = [name for name in names if name not in BENCHMARKS]
+        if unknown:
+            parser.error(f"Casos desconocidos: {', '.join(unknown)}")
+
+    baseline = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    base_results = baseline.get('resultados', {})
+
+    print("⏱️  BENCHMARK SUITE: caminos calientes del cálculo")
+    print("=" * 86)
+    env = environment()
+    print(f"Python {env['python']} | CPUs: {env['cpu_count']} | Repeticiones: {args.repeat}")
+    if baseline and not args.update_baseline:
+        base_env = baseline.get('entorno', {})
+        print(f"Línea base: {baseline.get('fecha', '?')} (Python {base_env.get('python', '?')}, "
+              f"CPUs: {base_env.get('cpu_count', '?')})")
+        if base_env.get('python') != env['python'] or base_env.get('cpu_count') != env['cpu_count']:
+            print("⚠️  La línea base se grabó en otro entorno: las comparaciones son orientativas")
+    print("=" * 86)
+    print(f"{'Caso':<28} | {'Mediana':>10} | {'p95':>10} | {'Base med.':>10} | {'Base p95':>10} | Estado")
+    print("-" * 86)
+
+    results = {}
+    skipped = {}
+    failures = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as workdir:
+        context = build_context(workdir, args.titles)
+        for name in names:
+            try:
+                function, reason = prepare(name, context)
+            except Exception as e:
+                # Un caso que no corre por un error del cálculo es una regresión
+                failures[name] = f"{type(e).__name__}: {e}"
+                print(f"{name:<28} | {'-':>10} | {'-':>10} | {'-':>10} | {'-':>10} | ❌ error")
+                continue
+            if function is None:
+                skipped[name] = reason
+                print(f"{name:<28} | {'-':>10} | {'-':>10} | {'-':>10} | {'-':>10} | ⏭️  omitido")
+                continue
+            result = measure(function, args.repeat)
+            results[name] = result
+            base = None if args.update_baseline else base_results.get(name)
+            failed = compare(name, result, base, args.threshold, args.p95_threshold)
+            regressions.extend(failed)
+
+            status = "❌" if failed else ("✅" if base else "·")
+            base_median = f"{base['median_ms']:>10.3f}" if base else f"{'-':>10}"
+            base_p95 = f"{base['p95_ms']:>10.3f}" if base else f"{'-':>10}"
+            print(f"{name:<28} | {result['median_ms']:>10.3f} | {result['p95_ms']:>10.3f} | "
+                  f"{base_median} | {base_p95} | {status}")
+
+    print("=" * 86)
+    if skipped:
+        print("⏭️  OMITIDOS:")
+        for name, reason in skipped.items():
+            print(f"  • {name}: {reason}")
+    for name, error in failures.items():
+        if name in base_results:
+            regressions.append(f"{name}: falló al preparar ({error})")
+        else:
+            regressions.append(f"{name}: falló al preparar, sin línea base ({error})")
+
+    run = {
+        'fecha': datetime.now(timezone.utc).strftime('%Y-%m-%d'),
+        'entorno': env,
+        'resultados': results,
+    }
+    if args.json:
+        run['omitidos'] = skipped
+        run['errores'] = failures
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2, ensure_ascii=False)
+        del run['omitidos'], run['errores']
+
+    if args.update_baseline and not failures:
+        # Se conservan los casos que no se corrieron esta vez (--only u omitidos)
+        run['resultados'] = {**base_results, **results}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"💾 Línea base guardada en {args.baseline}")
+        return
+
+    if regressions:
+        print("❌ REGRESIONES:")
+        for regression in regressions:
+            print(f"  • {regression}")
+        sys.exit(1)
+    print("✅ Sin regresiones")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: emparejamiento de títulos de eventos
+Búsqueda exacta / escaneo lineal (enfoque actual) vs alias de TitleIndex vs
+índice de tokens y trigramas (TitleSearchIndex).
+
+Lee las 1.116 líneas de TITULOS_EVENTOS_PERSONALES_COMPLETOS.txt. Usa sus
+títulos como objetivo y, como consultas, variantes de cada título tal como
+llegan desde el cálculo:
+- Sin tildes.
+- Con "a" tras el aspecto.
+- Casa en palabras.
+- Mayúsculas.
+- Un error de tipeo.
+También agrega consultas negativas (combinaciones sin título) para medir
+falsos positivos.
+
+Uso:
+    python benchmark_title_search.py [archivo_de_titulos]
+"""
+
+import random
+import sys
+import time
+import unicodedata
+
+from title_index import NUMBER_WORDS, build_aliases, canonical_key, normalize_title
+from title_search import CATALOG_PATH, STOPWORDS, TitleSearchIndex, load_catalog_titles
+
+DIGITS_TO_WORDS = {digit: word for word, digit in NUMBER_WORDS.items()}
+ASPECTOS = ('conjunción', 'cuadratura', 'oposición')
+
+def sin_tildes(text):
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if not unicodedata.combining(c))
+
+def variantes(title, rng):
+    """Variantes del título como las generaría el cálculo u otro servicio"""
+    words = title.split()
+    result = [title, sin_tildes(title).lower(), title.upper()]
+    for aspect in ASPECTOS:
+        if aspect in words:
+            result.append(title.replace(f'{aspect} ', f'{aspect} a ', 1))
+    if words[-2:-1] == ['casa']:
+        result.append(' '.join(words[:-1] + [DIGITS_TO_WORDS[words[-1]]]))
+    # Un error de tipeo en la palabra más larga
+    longest = max(range(len(words)), key=lambda index: len(words[index]))
+    word = words[longest]
+    drop = rng.randrange(1, len(word) - 1)
+    typo = words[:longest] + [word[:drop] + word[drop + 1:]] + words[longest + 1:]
+    result.append(' '.join(typo))
+    return result
+
+def negativas(titles):
+    """Combinaciones sin título en el catálogo (puntos y aspectos que no se calculan)"""
+    result = []
+    for title in titles:
+        if ' en tránsito conjunción ' in title and title.endswith(' Sol natal'):
+            result.append(title.replace(' Sol natal', ' Lilith natal'))
+            result.append(title.replace('conjunción', 'trígono'))
+        if title.startswith('Luna nueva en Aries conjunción') and title.endswith(' Sol natal'):
+            result.append(title.replace(' Sol natal', ' Ascendente natal'))
+    return result
+
+class ExactoYEscaneo:
+    """Enfoque actual: pertenencia exacta y, si falla, escaneo lineal por Jaccard de palabras"""
+
+    def __init__(self, titles, min_score=0.75):
+        self.titles = {normalize_title(title): title for title in titles}
+        self.words = [(set(key.split()) - STOPWORDS, title) for key, title in self.titles.items()]
+        self.min_score = min_score
+
+    def match(self, query):
+        key = normalize_title(query)
+        if key in self.titles:
+            return self.titles[key]
+        words = set(key.split()) - STOPWORDS
+        best, best_score = None, self.min_score
+        for candidate, title in self.words:
+            score = len(words & candidate) / len(words | candidate)
+            if score > best_score:
+                best, best_score = title, score
+        return best
+
+class SoloExacto(ExactoYEscaneo):
+    def match(self, query):
+        return self.titles.get(normalize_title(query))
+
+class Alias:
+    """TitleIndex: exacto y por clave canónica"""
+
+    def __init__(self, titles):
+        self.aliases, _ = build_aliases(titles)
+
+    def match(self, query):
+        return self.aliases.get(canonical_key(query))
+
+class Ngramas:
+    def __init__(self, titles):
+        self.index = TitleSearchIndex(titles)
+
+    def match(self, query):
+        return self.index.match(query)
+
+def medir(nombre, factory, titles, positivas, negativas_):
+    start = time.perf_counter()
+    matcher = factory(titles)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    aciertos = sum(matcher.match(query) == expected for query, expected in positivas)
+    falsos = sum(matcher.match(query) is not None for query in negativas_)
+    elapsed = time.perf_counter() - start
+
+    consultas = len(positivas) + len(negativas_)
+    print(f"{nombre:<24} | {build * 1000:>7.1f} ms | {elapsed / consultas * 1e6:>8.1f} µs | "
+          f"{aciertos / len(positivas):>7.1%} | {falsos / max(len(negativas_), 1):>7.1%}")
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else CATALOG_PATH
+    with open(path, encoding='utf-8') as f:
+        lineas = sum(1 for _ in f)
+    titles = load_catalog_titles(path)
+
+    rng = random.Random(42)
+    positivas = [(query, title) for title in titles for query in variantes(title, rng)]
+    negativas_ = negativas(titles)
+
+    print("⏱️  BENCHMARK: Emparejamiento de títulos")
+    print("=" * 78)
+    print(f"Líneas: {lineas} | Títulos: {len(titles)} | Consultas: {len(positivas)} positivas, "
+          f"{len(negativas_)} negativas")
+    print("=" * 78)
+    print(f"{'Método':<24} | {'Índice':>10} | {'Consulta':>11} | {'Aciertos':>7} | {'Falsos+':>7}")
+    print("-" * 78)
+
+    medir("Exacto (actual)", SoloExacto, titles, positivas, negativas_)
+    medir("Exacto + escaneo lineal", ExactoYEscaneo, titles, positivas, negativas_)
+    medir("Alias (TitleIndex)", Alias, titles, positivas, negativas_)
+    medir("Tokens + trigramas", Ngramas, titles, positivas, negativas_)
+
+    print("=" * 78)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Perfiles de configuración de Immanuel por llamada (seguros para concurrencia).
+
+Immanuel guarda su configuración en un único objeto global (`settings`):
+asignar settings.objects o settings.aspects desde un módulo afecta a todos
+los cálculos del proceso. Con un ThreadPool o un executor de asyncio eso
+impide atender en paralelo cartas con listas de objetos u orbes distintos
+(por ejemplo tropical vs dracónica, o el orbe de 2° de los scripts de
+Luna progresada).
+
+install(setup) reemplaza la instancia detrás de `settings` por un proxy que
+resuelve cada atributo contra el perfil activo en el contexto actual
+(contextvars). La instalación es explícita: la hace quien usa perfiles
+(por ejemplo natal_chart_proposed sobre src.immanuel.setup); importar este
+módulo no modifica Immanuel. Fuera de un perfil todo sigue funcionando
+como antes.
+
+Cada activación de un perfil (cada bloque `with use_profile`) arma su
+propia configuración al primer acceso: copia superficial de la base actual
+más los valores del perfil. Los cambios posteriores de la base se ven en
+las activaciones siguientes, y las asignaciones dentro del bloque sólo
+afectan a esa activación (no al perfil ni a otros hilos o tareas). Las
+mutaciones en el lugar de contenedores heredados de la base (por ejemplo
+settings.chart_data[...].append) no se aíslan: hay que reasignarlos.
+
+Uso:
+    install(setup)
+    PERFIL_NATAL = ChartProfile('natal', objects=[...], aspects={0: 8, ...})
+
+    with use_profile(PERFIL_NATAL):
+        chart_obj = charts.Natal(native)
+"""
+
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Activación en el contexto actual (hilo / tarea asyncio): _Activation o None
+_active = ContextVar('immanuel_chart_profile', default=None)
+
+# Configuraciones base con el proxy instalado
+_installed = []
+
+
+class _Activation:
+    """Un perfil activo y su configuración propia, armada al primer acceso por cada base."""
+
+    __slots__ = ('profile', 'instances')
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.instances = {}
+
+    def settings_for(self, base):
+        instance = self.instances.get(id(base))
+        if instance is None:
+            instance = self.instances[id(base)] = self.profile.settings_for(base)
+        return instance
+
+
+class _ContextLocalSettings:
+    """
+    Proxy instalado en lugar de la instancia de configuración de Immanuel.
+    Lee y escribe sobre la configuración de la activación en curso, o sobre
+    la configuración base si no hay perfil activo.
+    """
+
+    def __init__(self, base):
+        object.__setattr__(self, '_base', base)
+
+    def _current(self):
+        base = object.__getattribute__(self, '_base')
+        activation = _active.get()
+        return base if activation is None else activation.settings_for(base)
+
+    def __getattr__(self, name):
+        return getattr(self._current(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._current(), name, value)
+
+
+def install(setup_module):
+    """
+    Instala el proxy sobre el módulo setup de Immanuel (idempotente) y
+    devuelve la configuración base. Se llama explícitamente con el setup que
+    usa el cálculo: immanuel.setup o src.immanuel.setup.
+    """
+    singleton = setup_module.StaticSingleton
+    instance = singleton._instance
+    if isinstance(instance, _ContextLocalSettings):
+        return object.__getattribute__(instance, '_base')
+
+    # type.__setattr__ evita el __setattr__ del metaclass, que redirige a la instancia
+    type.__setattr__(singleton, '_instance', _ContextLocalSettings(instance))
+    _installed.append(instance)
+    return instance
+
+
+def installed():
+    """True si se instaló el proxy sobre algún setup de Immanuel"""
+    return bool(_installed)
+
+
+class ChartProfile:
+    """
+    Configuración de carta aplicada por llamada.
+
+    Args:
+        name: nombre descriptivo del perfil (tropical, dracónica, progresada...)
+        objects: lista de objetos de Immanuel (settings.objects)
+        aspects: aspectos (settings.aspects), lista de ángulos o dict ángulo -> orbe
+        **overrides: cualquier otro atributo de settings (default_orb, exact_orb,
+                     house_system, ...)
+    """
+
+    def __init__(self, name, objects=None, aspects=None, **overrides):
+        self.name = name
+        self.values = dict(overrides)
+        if objects is not None:
+            self.values['objects'] = list(objects)
+        if aspects is not None:
+            self.values['aspects'] = copy.deepcopy(aspects)
+
+    def __getattr__(self, name):
+        # Acceso directo a los valores configurados (perfil.default_orb, perfil.aspects...)
+        values = self.__dict__.get('values', {})
+        if name in values:
+            return values[name]
+        raise AttributeError(f"El perfil no define '{name}'")
+
+    def __repr__(self):
+        return f"ChartProfile({self.name!r}, {sorted(self.values)})"
+
+    def settings_for(self, base):
+        """
+        Configuración nueva para una activación: copia superficial de la
+        base en su estado actual más copias de los valores del perfil.
+        """
+        instance = copy.copy(base)
+        for key, value in self.values.items():
+            setattr(instance, key, copy.deepcopy(value))
+        return instance
+
+
+@contextmanager
+def use_profile(profile):
+    """Activa un perfil en el contexto actual mientras dura el bloque `with`"""
+    if profile is None:
+        yield None
+        return
+    if not _installed:
+        raise RuntimeError("Perfiles sin instalar: llamar a chart_profiles.install(setup) antes de use_profile")
+
+    token = _active.set(_Activation(profile))
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
+
+
+def active_profile():
+    """Perfil activo en el contexto actual (None si se usa la configuración base)"""
+    activation = _active.get()
+    return None if activation is None else activation.profile
@@ -18,6 +18,9 @@ import re
 from pathlib import Path
 from collections import defaultdict
 
+from interpretation_coverage import DEFAULT_COVERAGE_PATH, CoverageMatrix
+from title_index import TitleIndex
+
 def load_target_titles_from_file(filepath):
     """
     Cargar y procesar títulos desde archivo MD
@@ -139,7 +142,7 @@ def search_specific_patterns(titles):
     
     return results
 
-def generate_report(titles, categories, lilith_titles, patterns):
+def generate_report(titles, categories, lilith_titles, patterns, coverage=None):
     """Generar reporte completo"""
     report = []
     report.append("=" * 80)
@@ -164,6 +167,11 @@ def generate_report(titles, categories, lilith_titles, patterns):
         report.append(f"{pattern_name}: {status}")
     report.append("")
     
+    # Cobertura de los eventos calculables (matriz de interpretation_coverage)
+    if coverage is not None:
+        report.extend(coverage.report_lines())
+        report.append("")
+    
     # Títulos de Lilith
     report.append("🌙 TÍTULOS RELACIONADOS CON LILITH")
     report.append("-" * 40)
@@ -197,14 +205,15 @@ def main():
     
     print(f"📄 Cargando títulos desde: {titles_file}")
     
-    # Cargar títulos usando el mismo método que el interpretador
-    titles = load_target_titles_from_file(titles_file)
+    # Cargar títulos con las reglas del interpretador (índice compilado y cacheado)
+    index = TitleIndex.load(titles_file)
+    titles = set(index.titles)
     
     if not titles:
         print("❌ Error: No se pudieron cargar los títulos")
         sys.exit(1)
     
-    print(f"✅ Títulos cargados: {len(titles)}")
+    print(f"✅ Títulos cargados: {len(titles)} (alias: {len(index.aliases)}, conflictos: {len(index.conflicts)})")
     
     # Analizar títulos
     print("📊 Categorizando títulos...")
@@ -216,9 +225,13 @@ def main():
     print("🔍 Buscando patrones específicos...")
     patterns = search_specific_patterns(titles)
     
+    # Matriz de cobertura: el mismo artefacto que usa el cálculo para descartar eventos
+    print("🧩 Cargando matriz de cobertura...")
+    coverage = CoverageMatrix.load_or_build(titles_file, DEFAULT_COVERAGE_PATH, index=index)
+    
     # Generar reporte
     print("📝 Generando reporte...")
-    report = generate_report(titles, categories, lilith_titles, patterns)
+    report = generate_report(titles, categories, lilith_titles, patterns, coverage)
     
     # Guardar reporte
     report_file = "diagnostico_eventos_detectables_reporte.txt"
@@ -233,6 +246,7 @@ def main():
     print("=" * 60)
     print(f"Total títulos: {len(titles)}")
     print(f"Títulos de Lilith: {len(lilith_titles)}")
+    print(f"Eventos calculables con interpretación: {int(coverage.covered_bits.sum())}/{len(coverage)}")
     
     print("\nPatrones críticos:")
     for pattern_name, found in patterns.items():
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Conteo de llamadas a efemérides y perfil por etapa (opt-in).
+
+No se sabe cuántas llamadas a swisseph e Immanuel hace un cálculo ni dónde
+se va el tiempo. Este módulo envuelve los puntos de entrada que usan los
+scripts sólo mientras hay un perfil activo:
+- immanuel.tools.ephemeris: angle, armc_objects, obliquity y los getters
+  de alto nivel (objects, angles, houses, get).
+- immanuel.tools.date.to_jd.
+- swisseph: calc_ut, houses_ex, houses_armc, julday.
+Si existe la copia vendorizada (src.immanuel), se envuelve también.
+
+Por cada (etapa, función) registra:
+- Cantidad de llamadas.
+- Tiempo acumulado. Es inclusivo: una llamada anidada cuenta en ambas.
+- Histograma de latencias en potencias de 2 de microsegundos.
+Las etapas se marcan con stage('nombre') y se anidan ("calendario/carta").
+La construcción de la carta en calcular_carta_natal y las etapas de
+personal_calendar_precompute.calcular_calendario ya vienen marcadas.
+
+Apagado (sin perfil activo) las funciones originales quedan intactas y
+stage() devuelve un contexto nulo compartido: costo casi cero.
+
+El reporte sale como dict (summary) o como líneas JSON (log_lines / emit)
+con la forma de PerformanceMetric de lib/performance.ts (name, duration en
+ms, timestamp en ms, metadata), para que los levante el mismo pipeline de
+Sentry/performance.
+
+Uso:
+    with profile('calendario_personal') as report:
+        eventos = calcular_calendario(datos_usuario, 2025)
+    print(report.format())
+    report.emit()          # logging 'astro.performance', una línea JSON por métrica
+
+    # o por variable de entorno (ASTRO_PROFILE=1)
+    with profile_from_env('calendario_personal') as report:
+        ...
+"""
+
+import importlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+ENV_FLAG = 'ASTRO_PROFILE'
+LOGGER_NAME = 'astro.performance'
+
+# Puntos de entrada envueltos: (módulo, función)
+TARGETS = (
+    ('immanuel.tools.ephemeris', 'angle'),
+    ('immanuel.tools.ephemeris', 'armc_objects'),
+    ('immanuel.tools.ephemeris', 'obliquity'),
+    ('immanuel.tools.ephemeris', 'objects'),
+    ('immanuel.tools.ephemeris', 'angles'),
+    ('immanuel.tools.ephemeris', 'houses'),
+    ('immanuel.tools.ephemeris', 'get'),
+    ('immanuel.tools.date', 'to_jd'),
+    ('src.immanuel.tools.ephemeris', 'angle'),
+    ('src.immanuel.tools.ephemeris', 'armc_objects'),
+    ('src.immanuel.tools.ephemeris', 'obliquity'),
+    ('src.immanuel.tools.ephemeris', 'objects'),
+    ('src.immanuel.tools.ephemeris', 'angles'),
+    ('src.immanuel.tools.ephemeris', 'houses'),
+    ('src.immanuel.tools.ephemeris', 'get'),
+    ('src.immanuel.tools.date', 'to_jd'),
+    ('swisseph', 'calc_ut'),
+    ('swisseph', 'houses_ex'),
+    ('swisseph', 'houses_armc'),
+    ('swisseph', 'julday'),
+)
+
+# Cubetas del histograma: la cubeta k cuenta latencias < 2**k µs (la última, el resto)
+HISTOGRAM_BUCKETS = 24
+
+ROOT_STAGE = '-'
+
+_report = ContextVar('ephemeris_profile_report', default=None)
+_stage = ContextVar('ephemeris_profile_stage', default=ROOT_STAGE)
+_NULL_CONTEXT = nullcontext()
+
+# Funciones originales de los objetivos envueltos y cantidad de perfiles activos
+_originals = {}
+_active = 0
+
+
+class Stat:
+    """Llamadas, tiempo acumulado e histograma de una función en una etapa."""
+
+    __slots__ = ('calls', 'total_ns', 'max_ns', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, elapsed_ns):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.histogram[min((elapsed_ns // 1000).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def to_dict(self):
+        last = max((index for index, count in enumerate(self.histogram) if count), default=-1)
+        return {
+            'calls': self.calls,
+            'total_ms': round(self.total_ns / 1e6, 4),
+            'mean_us': round(self.total_ns / self.calls / 1e3, 3) if self.calls else 0.0,
+            'max_us': round(self.max_ns / 1e3, 3),
+            # Cubeta k: latencias < 2**k µs
+            'histogram_us': {f'<{2 ** index}': count for index, count in enumerate(self.histogram[:last + 1])
+                             if count},
+        }
+
+
+class ProfileReport:
+    """Mediciones de un perfil: llamadas por (etapa, función) y tiempos de las etapas."""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = {}
+        self.stages = {}
+        self.started = time.time()
+        self.duration_ms = 0.0
+
+    def record_call(self, stage_name, function, elapsed_ns):
+        key = (stage_name, function)
+        stat = self.calls.get(key)
+        if stat is None:
+            stat = self.calls[key] = Stat()
+        stat.add(elapsed_ns)
+
+    def record_stage(self, stage_name, elapsed_ns):
+        stat = self.stages.get(stage_name)
+        if stat is None:
+            stat = self.stages[stage_name] = Stat()
+        stat.add(elapsed_ns)
+
+    def total_calls(self):
+        return sum(stat.calls for stat in self.calls.values())
+
+    def summary(self):
+        """{'name', 'duration_ms', 'stages': {etapa: {...}}, 'calls': {etapa: {función: {...}}}}"""
+        calls = {}
+        for (stage_name, function), stat in sorted(self.calls.items()):
+            calls.setdefault(stage_name, {})[function] = stat.to_dict()
+        return {
+            'name': self.name,
+            'duration_ms': round(self.duration_ms, 3),
+            'total_calls': self.total_calls(),
+            'stages': {stage_name: stat.to_dict() for stage_name, stat in sorted(self.stages.items())},
+            'calls': calls,
+        }
+
+    def metrics(self):
+        """Métricas con la forma de PerformanceMetric (lib/performance.ts)"""
+        timestamp = int(self.started * 1000)
+        yield {
+            'name': f'{self.name}',
+            'duration': round(self.duration_ms, 3),
+            'timestamp': timestamp,
+            'metadata': {'kind': 'profile', 'total_calls': self.total_calls()},
+        }
+        for stage_name, stat in sorted(self.stages.items()):
+            yield {
+                'name': f'{self.name}.{stage_name}',
+                'duration': round(stat.total_ns / 1e6, 3),
+                'timestamp': timestamp,
+                'metadata': {'kind': 'stage', 'count': stat.calls},
+            }
+        for (stage_name, function), stat in sorted(self.calls.items()):
+            details = stat.to_dict()
+            yield {
+                'name': f'{self.name}.{stage_name}.{function}',
+                'duration': details['total_ms'],
+                'timestamp': timestamp,
+                'metadata': {'kind': 'ephemeris', 'stage': stage_name, 'function': function,
+                             'calls': details['calls'], 'mean_us': details['mean_us'],
+                             'max_us': details['max_us'], 'histogram_us': details['histogram_us']},
+            }
+
+    def log_lines(self):
+        """Una línea JSON por métrica"""
+        return [json.dumps(metric, ensure_ascii=False, separators=(',', ':')) for metric in self.metrics()]
+
+    def emit(self, logger=None, level=logging.INFO):
+        """Escribe las líneas en el logger (por defecto 'astro.performance')"""
+        logger = logger or logging.getLogger(LOGGER_NAME)
+        for line in self.log_lines():
+            logger.log(level, line)
+
+    def format(self):
+        """Tabla legible para consola"""
+        lines = [f"⏱️  {self.name}: {self.duration_ms:.2f} ms, {self.total_calls()} llamadas a efemérides"]
+        for stage_name, stat in sorted(self.stages.items()):
+            lines.append(f"  📍 {stage_name:<56} {stat.total_ns / 1e6:>10.2f} ms  x{stat.calls}")
+        for (stage_name, function), stat in sorted(self.calls.items()):
+            lines.append(f"     {stage_name + ' · ' + function:<56} {stat.total_ns / 1e6:>10.2f} ms  "
+                         f"{stat.calls:>6} llamadas  {stat.total_ns / stat.calls / 1e3:>8.1f} µs/llamada")
+        return '\n'.join(lines)
+
+
+def _wrap(label, function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        report = _report.get()
+        if report is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            report.record_call(_stage.get(), label, time.perf_counter_ns() - start)
+    return wrapper
+
+
+def _install():
+    """Reemplaza los objetivos por sus envoltorios (módulos no instalados se ignoran)"""
+    for module_name, attribute in TARGETS:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        original = getattr(module, attribute, None)
+        if original is None or (module_name, attribute) in _originals:
+            continue
+        _originals[(module_name, attribute)] = original
+        label = f"{module_name.replace('src.', '').split('.')[-1]}.{attribute}"
+        setattr(module, attribute, _wrap(label, original))
+
+
+def _uninstall():
+    for (module_name, attribute), original in _originals.items():
+        setattr(importlib.import_module(module_name), attribute, original)
+    _originals.clear()
+
+
+def enabled():
+    """True si hay un perfil activo en este contexto"""
+    return _report.get() is not None
+
+
+@contextmanager
+def profile(name='perfil'):
+    """
+    Activa el perfil dentro del bloque y entrega el ProfileReport. Los
+    envoltorios se instalan con el primer perfil activo y se quitan con el
+    último.
+    """
+    global _active
+    if _active == 0:
+        _install()
+    _active += 1
+    report = ProfileReport(name)
+    report_token = _report.set(report)
+    stage_token = _stage.set(ROOT_STAGE)
+    start = time.perf_counter_ns()
+    try:
+        yield report
+    finally:
+        report.duration_ms = (time.perf_counter_ns() - start) / 1e6
+        _stage.reset(stage_token)
+        _report.reset(report_token)
+        _active -= 1
+        if _active == 0:
+            _uninstall()
+
+
+def profile_from_env(name='perfil'):
+    """profile(name) si ASTRO_PROFILE está activo; si no, un contexto que entrega None"""
+    if os.environ.get(ENV_FLAG, '').lower() in ('1', 'true', 'yes', 'si', 'sí'):
+        return profile(name)
+    return nullcontext()
+
+
+@contextmanager
+def _stage_context(report, name):
+    parent = _stage.get()
+    full_name = name if parent == ROOT_STAGE else f'{parent}/{name}'
+    token = _stage.set(full_name)
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        report.record_stage(full_name, time.perf_counter_ns() - start)
+        _stage.reset(token)
+
+
+def stage(name):
+    """Marca una etapa lógica; sin perfil activo es un contexto nulo compartido"""
+    report = _report.get()
+    if report is None:
+        return _NULL_CONTEXT
+    return _stage_context(report, name)
+
+
+def main():
+    """Perfila el calendario personal del caso de referencia"""
+    # Como script este módulo es __main__; los cálculos marcan sus etapas con
+    # el módulo importado ephemeris_profiling, así que el perfil tiene que ser
+    # el de ese módulo (si no, las etapas no lo ven y todo cae en '-')
+    import ephemeris_profiling
+    from personal_calendar_precompute import calcular_calendario
+    from reference_cases import load_astroseek_reference
+
+    case = load_astroseek_reference()
+    print(f"🔬 Perfil de efemérides: calendario personal {case.year} de {case.nombre}")
+    with ephemeris_profiling.profile('calendario_personal') as report:
+        eventos = calcular_calendario(case.datos_usuario, case.year)
+    print(f"✅ {len(eventos)} eventos")
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
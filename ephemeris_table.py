@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Tabla de efemérides muestreada y mapeada en memoria (1900-2100).
+
+Todos los cálculos (Luna progresada, cartas natales, generadores de
+tránsitos e ingresos) llaman a Swiss Ephemeris punto por punto. Este módulo
+tiene un paso de construcción que escribe en UN archivo de floats:
+
+- Muestras diarias (0h UT) de longitud, latitud y velocidad (más la
+  velocidad en latitud) de todos los cuerpos configurados.
+- Muestras horarias de la Luna.
+
+La consulta interpola con Hermite cúbico (usa la posición y la velocidad en
+ambos extremos del intervalo). Sólo se llama a swisseph si se piden
+valores exactos (exact=True). El archivo se abre con np.memmap en modo de
+sólo lectura: los procesos worker comparten las páginas del sistema
+operativo, y la búsqueda de candidatos de cualquier evento se vuelve un
+recorte de arreglos en lugar de llamadas a C.
+
+Cota de error: se mide al construir la tabla contra swisseph en instantes
+al azar y queda guardada en el encabezado (accuracy()). Valores medidos
+con la tabla 1900-2100 (~87 MB): Sol, Luna (horaria) y Lilith < 1e-6° en
+longitud; planetas, Quirón y True North Node < 1e-3° (peor caso Marte,
+8e-4° = 3"). Ese residuo viene de pequeños saltos de las propias posiciones
+de swisseph entre segmentos del archivo de efemérides, no de la
+interpolación.
+
+Uso:
+    python ephemeris_table.py 1900 2100 data/ephemeris_table_1900_2100.bin
+
+    tabla = EphemerisTable.open('data/ephemeris_table_1900_2100.bin')
+    lon = tabla.longitude('Moon', jds)                 # interpolado, vectorizado
+    lon, lat, speed = tabla.position('Mars', jd, exact=True)  # swisseph
+    jds, muestras = tabla.samples('Sun', start_jd, end_jd)    # vista sin copiar
+"""
+
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+import swisseph as swe
+from immanuel import setup  # configura la ruta de archivos de efemérides de Immanuel
+
+# Cuerpos por nombre (los nombres de Immanuel) -> índice de swisseph
+BODY_IDS = {
+    'Sun': swe.SUN,
+    'Moon': swe.MOON,
+    'Mercury': swe.MERCURY,
+    'Venus': swe.VENUS,
+    'Mars': swe.MARS,
+    'Jupiter': swe.JUPITER,
+    'Saturn': swe.SATURN,
+    'Uranus': swe.URANUS,
+    'Neptune': swe.NEPTUNE,
+    'Pluto': swe.PLUTO,
+    'True North Node': swe.TRUE_NODE,
+    'Lilith': swe.MEAN_APOG,
+    'Chiron': swe.CHIRON,
+}
+
+DEFAULT_BODIES = tuple(BODY_IDS)
+
+# Columnas de cada muestra
+COLUMNS = ('longitude', 'latitude', 'speed', 'latitude_speed')
+LONGITUDE, LATITUDE, SPEED, LATITUDE_SPEED = range(len(COLUMNS))
+
+FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+DAILY_STEP = 1.0
+HOURLY_STEP = 1.0 / 24.0
+
+MAGIC = b'EPHT'
+FORMAT_VERSION = 1
+DATA_ALIGNMENT = 64
+
+# Instantes al azar por cuerpo para medir la cota de error al construir
+ACCURACY_SAMPLES = 2000
+
+
+def _swe_row(body_id, jd):
+    """(longitud, latitud, velocidad, velocidad en latitud) exactos de swisseph"""
+    values = swe.calc_ut(jd, body_id, FLAGS)[0]
+    return values[0], values[1], values[3], values[4]
+
+
+def _body_id(body):
+    return BODY_IDS[body] if isinstance(body, str) else int(body)
+
+
+def _hermite(samples, start_jd, step, jds):
+    """
+    Interpolación de Hermite cúbica de longitud y latitud (con sus
+    velocidades) y lineal de la velocidad. `samples` es (count, 4).
+    """
+    position = (jds - start_jd) / step
+    index = np.clip(np.floor(position).astype(np.int64), 0, len(samples) - 2)
+    t = position - index
+
+    left = samples[index]
+    right = samples[index + 1]
+
+    h00 = (1 + 2 * t) * (1 - t) ** 2
+    h10 = t * (1 - t) ** 2
+    h01 = t ** 2 * (3 - 2 * t)
+    h11 = t ** 2 * (t - 1)
+
+    # La longitud se desenvuelve respecto del extremo izquierdo (cruce 360° -> 0°)
+    longitude_delta = (right[:, LONGITUDE] - left[:, LONGITUDE] + 180.0) % 360.0 - 180.0
+    longitude = (left[:, LONGITUDE] + h10 * step * left[:, SPEED]
+                 + h01 * longitude_delta + h11 * step * right[:, SPEED]) % 360.0
+    latitude = (h00 * left[:, LATITUDE] + h10 * step * left[:, LATITUDE_SPEED]
+                + h01 * right[:, LATITUDE] + h11 * step * right[:, LATITUDE_SPEED])
+    speed = left[:, SPEED] + t * (right[:, SPEED] - left[:, SPEED])
+    return longitude, latitude, speed
+
+
+class EphemerisTable:
+    """Tabla de efemérides mapeada en memoria (sólo lectura)."""
+
+    def __init__(self, path, header, daily, hourly):
+        self.path = path
+        self.header = header
+        self.bodies = header['bodies']
+        self.start_jd = header['start_jd']
+        self.end_jd = header['end_jd']
+        self.daily = daily
+        self.hourly = hourly
+        self._columns = {body_id: index for index, body_id in enumerate(header['body_ids'])}
+
+    @classmethod
+    def open(cls, path):
+        """Abre la tabla con np.memmap (las páginas se comparten entre procesos)"""
+        with open(path, 'rb') as f:
+            magic, version, header_size = struct.unpack('<4sHI', f.read(10))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} no es una tabla de efemérides compatible")
+            header = json.loads(f.read(header_size).decode('utf-8'))
+
+        daily = np.memmap(path, dtype='<f8', mode='r', offset=header['daily_offset'],
+                          shape=(header['daily_count'], len(header['bodies']), len(COLUMNS)))
+        hourly = None
+        if header['hourly_count']:
+            hourly = np.memmap(path, dtype='<f8', mode='r', offset=header['hourly_offset'],
+                               shape=(header['hourly_count'], len(COLUMNS)))
+        return cls(path, header, daily, hourly)
+
+    def accuracy(self, body):
+        """Error máximo medido al construir: {'longitude': grados, 'latitude': grados}"""
+        return self.header['accuracy'][self._name(body)]
+
+    def contains(self, jd):
+        jd = np.asarray(jd)
+        return bool(np.all((jd >= self.start_jd) & (jd <= self.end_jd)))
+
+    def _name(self, body):
+        return body if isinstance(body, str) else self.bodies[self._columns[int(body)]]
+
+    def _series(self, body):
+        """(muestras (count, 4), jd inicial, paso) del cuerpo; horaria para la Luna"""
+        body_id = _body_id(body)
+        if body_id not in self._columns:
+            raise KeyError(f"Cuerpo no incluido en la tabla: {body}")
+        if body_id == swe.MOON and self.hourly is not None:
+            return self.hourly, self.start_jd, HOURLY_STEP
+        return self.daily[:, self._columns[body_id]], self.start_jd, DAILY_STEP
+
+    def position(self, body, jd, exact=False):
+        """
+        (longitud, latitud, velocidad) del cuerpo en uno o varios JD (UT).
+        Interpolado desde la tabla, o exacto desde swisseph con exact=True.
+        """
+        scalar = np.ndim(jd) == 0
+        jds = np.atleast_1d(np.asarray(jd, dtype=float))
+
+        if exact:
+            body_id = _body_id(body)
+            rows = np.array([_swe_row(body_id, value)[:3] for value in jds]).reshape(-1, 3)
+            longitude, latitude, speed = rows[:, 0], rows[:, 1], rows[:, 2]
+        else:
+            if not self.contains(jds):
+                raise ValueError(f"JD fuera del rango de la tabla ({self.start_jd} - {self.end_jd})")
+            samples, start_jd, step = self._series(body)
+            longitude, latitude, speed = _hermite(samples, start_jd, step, jds)
+
+        if scalar:
+            return float(longitude[0]), float(latitude[0]), float(speed[0])
+        return longitude, latitude, speed
+
+    def longitude(self, body, jd, exact=False):
+        """Longitud eclíptica del cuerpo (escalar o arreglo)"""
+        return self.position(body, jd, exact)[0]
+
+    def samples(self, body, start_jd, end_jd):
+        """
+        Muestras crudas entre dos JD, sin copiar (vista del memmap): para
+        filtrar candidatos de un evento con operaciones de arreglos.
+
+        Returns:
+            (jds, muestras) con muestras de forma (n, 4) en el orden de COLUMNS
+        """
+        series, first_jd, step = self._series(body)
+        start = max(int(np.ceil((start_jd - first_jd) / step)), 0)
+        end = min(int(np.floor((end_jd - first_jd) / step)) + 1, len(series))
+        return first_jd + np.arange(start, end) * step, series[start:end]
+
+
+def _repair_speeds(series, step):
+    """
+    Corrige velocidades defectuosas de swisseph. En algunos bordes de
+    segmento del archivo de efemérides la velocidad devuelta se aleja mucho
+    de la real (p. ej. Neptuno 2003-01-27: 0.014°/día en lugar de 0.038°/día),
+    y la interpolación de Hermite la arrastra. Se compara cada velocidad con
+    la derivada numérica de 4° orden de las posiciones muestreadas y se
+    reemplaza donde la diferencia supera 10 veces la diferencia mediana.
+    Devuelve la cantidad de valores corregidos.
+    """
+    repaired = 0
+    for value_column, speed_column, wrap in ((LONGITUDE, SPEED, True), (LATITUDE, LATITUDE_SPEED, False)):
+        values = np.asarray(series[:, value_column])
+        if wrap:
+            values = np.unwrap(values, period=360.0)
+        derivative = (-values[4:] + 8 * values[3:-1] - 8 * values[1:-3] + values[:-4]) / (12 * step)
+        speeds = series[2:-2, speed_column]
+        discrepancy = np.abs(speeds - derivative)
+        bad = discrepancy > 10 * max(np.median(discrepancy), 1e-9)
+        series[2:-2, speed_column] = np.where(bad, derivative, speeds)
+        repaired += int(bad.sum())
+    return repaired
+
+
+def _measure_accuracy(daily, hourly, bodies, start_jd, end_jd, samples=ACCURACY_SAMPLES, seed=0):
+    """Error máximo de la interpolación contra swisseph en instantes al azar"""
+    rng = np.random.default_rng(seed)
+    accuracy = {}
+    for column, body in enumerate(bodies):
+        body_id = BODY_IDS[body]
+        jds = rng.uniform(start_jd, end_jd - DAILY_STEP, samples)
+        if body_id == swe.MOON and hourly is not None:
+            longitude, latitude, _ = _hermite(hourly, start_jd, HOURLY_STEP, jds)
+        else:
+            longitude, latitude, _ = _hermite(daily[:, column], start_jd, DAILY_STEP, jds)
+        exact = np.array([_swe_row(body_id, jd)[:2] for jd in jds])
+        longitude_error = np.abs((longitude - exact[:, 0] + 180.0) % 360.0 - 180.0)
+        accuracy[body] = {
+            'longitude': float(longitude_error.max()),
+            'latitude': float(np.abs(latitude - exact[:, 1]).max())
+        }
+    return accuracy
+
+
+def build_table(path, start_year=1900, end_year=2100, bodies=DEFAULT_BODIES, moon_hourly=True,
+                ephemeris_path=None):
+    """
+    Construye la tabla (desde el 1/1 de start_year hasta el 1/1 de end_year + 1)
+    y la escribe en `path`. Se escribe en un archivo temporal y se reemplaza
+    al final, así los lectores nunca ven una tabla a medio escribir.
+    """
+    if ephemeris_path:
+        setup.set_filepath(ephemeris_path)
+
+    bodies = tuple(bodies)
+    start_jd = swe.julday(start_year, 1, 1, 0.0)
+    end_jd = swe.julday(end_year + 1, 1, 1, 0.0)
+    daily_count = int(round((end_jd - start_jd) / DAILY_STEP)) + 1
+    hourly_count = int(round((end_jd - start_jd) / HOURLY_STEP)) + 1 if moon_hourly and 'Moon' in bodies else 0
+
+    header = {
+        'bodies': list(bodies),
+        'body_ids': [BODY_IDS[body] for body in bodies],
+        'columns': list(COLUMNS),
+        'start_jd': start_jd,
+        'end_jd': end_jd,
+        'daily_count': daily_count,
+        'hourly_count': hourly_count,
+        'swisseph_version': swe.version,
+    }
+    # Espacio fijo para el encabezado (se completa con la cota de error al final)
+    header_size = 4096
+    daily_offset = DATA_ALIGNMENT * -(-(10 + header_size) // DATA_ALIGNMENT)
+    hourly_offset = daily_offset + daily_count * len(bodies) * len(COLUMNS) * 8
+    header['daily_offset'] = daily_offset
+    header['hourly_offset'] = hourly_offset
+    total_size = hourly_offset + hourly_count * len(COLUMNS) * 8
+
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as f:
+        f.truncate(total_size)
+
+    daily = np.memmap(temporary, dtype='<f8', mode='r+', offset=daily_offset,
+                      shape=(daily_count, len(bodies), len(COLUMNS)))
+    for column, body in enumerate(bodies):
+        body_id = BODY_IDS[body]
+        daily[:, column] = [_swe_row(body_id, start_jd + day * DAILY_STEP) for day in range(daily_count)]
+        repaired = _repair_speeds(daily[:, column], DAILY_STEP)
+        print(f"  {body}: {daily_count} muestras diarias ({repaired} velocidades corregidas)")
+
+    hourly = None
+    if hourly_count:
+        hourly = np.memmap(temporary, dtype='<f8', mode='r+', offset=hourly_offset,
+                           shape=(hourly_count, len(COLUMNS)))
+        hourly[:] = [_swe_row(swe.MOON, start_jd + hour * HOURLY_STEP) for hour in range(hourly_count)]
+        repaired = _repair_speeds(hourly, HOURLY_STEP)
+        print(f"  Moon: {hourly_count} muestras horarias ({repaired} velocidades corregidas)")
+
+    header['accuracy'] = _measure_accuracy(daily, hourly, bodies, start_jd, end_jd)
+    daily.flush()
+    if hourly is not None:
+        hourly.flush()
+    del daily, hourly
+
+    encoded = json.dumps(header).encode('utf-8')
+    if len(encoded) > header_size:
+        raise ValueError("Encabezado demasiado grande para la tabla")
+    with open(temporary, 'r+b') as f:
+        f.write(struct.pack('<4sHI', MAGIC, FORMAT_VERSION, len(encoded)) + encoded)
+    os.replace(temporary, path)
+    return header
+
+
+def main():
+    start_year = int(sys.argv[1]) if len(sys.argv) > 1 else 1900
+    end_year = int(sys.argv[2]) if len(sys.argv) > 2 else 2100
+    path = sys.argv[3] if len(sys.argv) > 3 else f'data/ephemeris_table_{start_year}_{end_year}.bin'
+
+    print(f"📦 Construyendo tabla de efemérides {start_year}-{end_year} -> {path}")
+    header = build_table(path, start_year, end_year)
+
+    print("=" * 64)
+    print(f"{'Cuerpo':<18} | {'Error máx. longitud':>20} | {'Error máx. latitud':>20}")
+    for body, accuracy in header['accuracy'].items():
+        print(f"{body:<18} | {accuracy['longitude']:>19.2e}° | {accuracy['latitude']:>19.2e}°")
+    print("=" * 64)
+    print(f"✅ {os.path.getsize(path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
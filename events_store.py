@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Almacén columnar mapeado en memoria para los eventos generales por año.
+
+El calendario general lee archivos data/eventos_astrologicos_UTC_YYYY.json
+completos (115-145 KB cada uno) y los filtra en memoria. Este módulo tiene
+un paso de construcción que convierte todos los años en UN archivo binario:
+
+- timestamp: segundos epoch UTC de cada evento (int64), ordenado: el rango
+  de fechas se resuelve con searchsorted.
+- tipo, planeta1, planeta2: códigos de diccionario (int16, -1 = sin valor).
+  Los eventos sin planeta1/planeta2 (ingresos, estaciones, lunaciones) usan
+  el planeta con el que empieza la descripción ("Luna ingresa a ...").
+- payload: el evento original como JSON compacto, con una columna de
+  offsets; sólo se decodifican las filas que pasan los filtros.
+
+La consulta abre las columnas con np.memmap en modo de sólo lectura, así que
+una vista mensual toca unos pocos KB en lugar de parsear un año de JSON.
+
+Uso:
+    python events_store.py data/eventos_astrologicos_UTC_*.json data/eventos_astrologicos_UTC.bin
+
+    store = EventStore.open('data/eventos_astrologicos_UTC.bin')
+    eventos = store.query('2025-03-01', '2025-04-01', tipos=['Aspecto'], planetas=['Venus'])
+    cuerpo = store.query_json('2025-03-01', '2025-04-01')  # bytes de un array JSON
+"""
+
+import glob
+import json
+import os
+import struct
+import sys
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Planetas que pueden encabezar la descripción de un evento general
+PLANETAS = ('Sol', 'Luna', 'Mercurio', 'Venus', 'Marte', 'Júpiter', 'Saturno',
+            'Urano', 'Neptuno', 'Plutón')
+
+# Columnas de tamaño fijo (nombre, dtype)
+COLUMNS = (
+    ('timestamp', '<i8'),
+    ('tipo', '<i2'),
+    ('planeta1', '<i2'),
+    ('planeta2', '<i2'),
+)
+
+MAGIC = b'EVST'
+FORMAT_VERSION = 1
+DATA_ALIGNMENT = 64
+NO_VALUE = -1
+
+
+def _dumps(event):
+    if orjson is not None:
+        return orjson.dumps(event)
+    return json.dumps(event, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(payload):
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def event_timestamp(event):
+    """Segundos epoch UTC de fecha_utc + hora_utc"""
+    moment = datetime.strptime(f"{event['fecha_utc']} {event['hora_utc']}", '%Y-%m-%d %H:%M')
+    return int(moment.replace(tzinfo=timezone.utc).timestamp())
+
+
+def to_timestamp(value):
+    """Segundos epoch UTC desde 'YYYY-MM-DD', date, datetime (naive = UTC) o número"""
+    if value is None or isinstance(value, (int, float, np.integer)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def event_planets(event):
+    """(planeta1, planeta2) del evento; sin planeta1 se toma el de la descripción"""
+    planeta1 = event.get('planeta1')
+    if planeta1 is None:
+        first_word = event.get('descripcion', '').split(' ', 1)[0]
+        planeta1 = first_word if first_word in PLANETAS else None
+    return planeta1, event.get('planeta2')
+
+
+def _align(offset):
+    return DATA_ALIGNMENT * -(-offset // DATA_ALIGNMENT)
+
+
+def build_store(path, sources):
+    """
+    Construye el almacén desde una lista de archivos JSON de eventos (uno por
+    año) y lo escribe en `path`. Se escribe en un archivo temporal y se
+    reemplaza al final, así los lectores nunca ven un archivo a medio escribir.
+    """
+    events = []
+    years = []
+    for source in sorted(sources):
+        with open(source, encoding='utf-8') as f:
+            year_events = json.load(f)
+        events.extend(year_events)
+        years.append({'source': os.path.basename(source), 'count': len(year_events)})
+
+    timestamps = np.array([event_timestamp(event) for event in events], dtype='<i8')
+    order = np.argsort(timestamps, kind='stable')
+    events = [events[index] for index in order]
+
+    tipos = sorted({event['tipo_evento'] for event in events})
+    planetas = sorted({planet for event in events for planet in event_planets(event) if planet})
+    tipo_codes = {tipo: code for code, tipo in enumerate(tipos)}
+    planeta_codes = {planeta: code for code, planeta in enumerate(planetas)}
+
+    columns = {
+        'timestamp': timestamps[order],
+        'tipo': np.array([tipo_codes[event['tipo_evento']] for event in events], dtype='<i2'),
+    }
+    planet_pairs = [event_planets(event) for event in events]
+    for index, name in enumerate(('planeta1', 'planeta2')):
+        columns[name] = np.array([planeta_codes.get(pair[index], NO_VALUE) for pair in planet_pairs],
+                                 dtype='<i2')
+
+    payloads = [_dumps(event) for event in events]
+    payload_offsets = np.zeros(len(payloads) + 1, dtype='<i8')
+    payload_offsets[1:] = np.cumsum([len(payload) for payload in payloads])
+
+    header = {
+        'count': len(events),
+        'tipos': tipos,
+        'planetas': planetas,
+        'years': years,
+        'columns': {},
+    }
+    # El encabezado se escribe al principio: se reserva según su tamaño sin offsets
+    offset = _align(10 + len(json.dumps(header).encode('utf-8')) + 1024)
+    blocks = []
+    for name, dtype in COLUMNS + (('payload_offsets', '<i8'),):
+        data = payload_offsets if name == 'payload_offsets' else columns[name]
+        header['columns'][name] = {'offset': offset, 'dtype': dtype, 'count': len(data)}
+        blocks.append((offset, data.astype(dtype).tobytes()))
+        offset = _align(offset + data.nbytes)
+    header['payload_offset'] = offset
+    blocks.append((offset, b''.join(payloads)))
+
+    encoded = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    if 10 + len(encoded) > blocks[0][0]:
+        raise ValueError("Encabezado demasiado grande para el almacén")
+
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(struct.pack('<4sHI', MAGIC, FORMAT_VERSION, len(encoded)) + encoded)
+        for block_offset, data in blocks:
+            f.seek(block_offset)
+            f.write(data)
+    os.replace(temporary, path)
+    return header
+
+
+class EventStore:
+    """Almacén de eventos generales mapeado en memoria (sólo lectura)."""
+
+    def __init__(self, path, header, columns, payload):
+        self.path = path
+        self.header = header
+        self.tipos = header['tipos']
+        self.planetas = header['planetas']
+        self.columns = columns
+        self.payload = payload
+        self._tipo_codes = {tipo: code for code, tipo in enumerate(self.tipos)}
+        self._planeta_codes = {planeta: code for code, planeta in enumerate(self.planetas)}
+
+    @classmethod
+    def open(cls, path):
+        """Abre el almacén con np.memmap (las páginas se comparten entre procesos)"""
+        with open(path, 'rb') as f:
+            magic, version, header_size = struct.unpack('<4sHI', f.read(10))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} no es un almacén de eventos compatible")
+            header = json.loads(f.read(header_size).decode('utf-8'))
+
+        columns = {
+            name: np.memmap(path, dtype=spec['dtype'], mode='r', offset=spec['offset'], shape=(spec['count'],))
+            for name, spec in header['columns'].items()
+        }
+        payload_size = int(columns['payload_offsets'][-1])
+        payload = np.memmap(path, dtype=np.uint8, mode='r', offset=header['payload_offset'],
+                            shape=(max(payload_size, 1),))
+        return cls(path, header, columns, payload)
+
+    def __len__(self):
+        return self.header['count']
+
+    def _codes(self, values, codes):
+        return [codes[value] for value in values if value in codes]
+
+    def select(self, start=None, end=None, tipos=None, planetas=None):
+        """
+        Índices de filas que cumplen los filtros (sin decodificar eventos).
+
+        Args:
+            start, end: rango [start, end) como 'YYYY-MM-DD', date, datetime o epoch
+            tipos: tipos de evento aceptados (p. ej. ['Aspecto', 'Luna Nueva'])
+            planetas: planetas aceptados en planeta1 o planeta2
+        """
+        timestamps = self.columns['timestamp']
+        first = 0 if start is None else int(np.searchsorted(timestamps, to_timestamp(start), side='left'))
+        last = len(timestamps) if end is None else int(np.searchsorted(timestamps, to_timestamp(end), side='left'))
+        if first >= last:
+            return np.empty(0, dtype=np.int64)
+
+        mask = np.ones(last - first, dtype=bool)
+        if tipos is not None:
+            mask &= np.isin(self.columns['tipo'][first:last], self._codes(tipos, self._tipo_codes))
+        if planetas is not None:
+            codes = self._codes(planetas, self._planeta_codes)
+            mask &= (np.isin(self.columns['planeta1'][first:last], codes)
+                     | np.isin(self.columns['planeta2'][first:last], codes))
+        return np.nonzero(mask)[0] + first
+
+    def _payloads(self, rows):
+        offsets = self.columns['payload_offsets']
+        return [self.payload[offsets[row]:offsets[row + 1]].tobytes() for row in rows.tolist()]
+
+    def query(self, start=None, end=None, tipos=None, planetas=None):
+        """Eventos (dicts originales) que cumplen los filtros, en orden cronológico"""
+        return [_loads(payload) for payload in self._payloads(self.select(start, end, tipos, planetas))]
+
+    def query_json(self, start=None, end=None, tipos=None, planetas=None):
+        """Array JSON (bytes) de los eventos filtrados, sin decodificarlos"""
+        return b'[' + b','.join(self._payloads(self.select(start, end, tipos, planetas))) + b']'
+
+    def count(self, start=None, end=None, tipos=None, planetas=None):
+        return len(self.select(start, end, tipos, planetas))
+
+
+def main():
+    if len(sys.argv) > 2:
+        sources, path = sys.argv[1:-1], sys.argv[-1]
+    else:
+        sources = glob.glob('data/eventos_astrologicos_UTC_[0-9][0-9][0-9][0-9].json')
+        path = sys.argv[1] if len(sys.argv) > 1 else 'data/eventos_astrologicos_UTC.bin'
+    if not sources:
+        print("❌ No se encontraron archivos de eventos")
+        sys.exit(1)
+
+    print(f"📦 Construyendo almacén de eventos ({len(sources)} archivos) -> {path}")
+    header = build_store(path, sources)
+    for year in header['years']:
+        print(f"  {year['source']}: {year['count']} eventos")
+    print(f"  Tipos: {len(header['tipos'])} | Planetas: {len(header['planetas'])}")
+
+    store = EventStore.open(path)
+    check = store.query()
+    original = sum(year['count'] for year in header['years'])
+    status = "✅" if len(check) == original else "❌"
+    print(f"{status} {len(check)}/{original} eventos | {os.path.getsize(path) / 1e3:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
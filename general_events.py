@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Generador de los archivos de eventos generales por año.
+
+Produce data/eventos_astrologicos_UTC_YYYY.json (el formato que lee el
+calendario general) para cualquier rango de años:
+
+- Ingresos a signo de Sol, Luna y planetas ("Luna ingresa a 0.00° de
+  Acuario (Directo)", "Mercurio deja a 29.99° de Virgo (Retrógrado)").
+- Aspectos exactos entre todos los pares de planetas, Sol incluido
+  (conjunción, sextil, cuadratura, trígono, oposición) con
+  posicion1/posicion2.
+- Estaciones (inicio y fin de retrogradación).
+- Lunas nuevas y llenas, con elevación y azimut de la Luna en Buenos Aires,
+  y los eclipses (solares y lunares no penumbrales) que caen en ellas.
+- Ingresos de signo del Nodo Norte medio y verdadero.
+
+Cada año se calcula en un proceso: muestras diarias de todos los cuerpos en
+arreglos, búsqueda vectorizada de cruces y refinamiento con Brent sobre
+swisseph. Los años son independientes: cada uno se queda con los eventos
+de [1/1 0h UT, 1/1 del año siguiente), así que no hay estado entre años.
+
+La salida es incremental: cada año se escribe apenas termina, y los años
+que ya tienen archivo no se recalculan (salvo force=True). Extender el
+rango en un año sólo calcula ese año.
+
+Uso:
+    python general_events.py 2031 2035
+    python general_events.py 2024 2030 --force
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+import numpy as np
+import swisseph as swe
+from immanuel import setup  # configura la ruta de archivos de efemérides de Immanuel
+
+from natal_chart_records import SIGNOS
+from julian_time import year_bounds
+from progressed_moon import brent, jd_to_utc
+
+OUTPUT_DIR = 'data'
+OUTPUT_PATTERN = 'eventos_astrologicos_UTC_{year}.json'
+
+# Cuerpos muestreados, en el orden en que se nombran en los aspectos
+PLANETAS = {
+    'Sol': swe.SUN,
+    'Mercurio': swe.MERCURY,
+    'Venus': swe.VENUS,
+    'Marte': swe.MARS,
+    'Júpiter': swe.JUPITER,
+    'Saturno': swe.SATURN,
+    'Urano': swe.URANUS,
+    'Neptuno': swe.NEPTUNE,
+    'Plutón': swe.PLUTO,
+}
+LUNA = ('Luna', swe.MOON)
+NODOS = {
+    'Nodo Norte Medio': ('Ingreso Nodo Medio', swe.MEAN_NODE),
+    'Nodo Norte Verdadero': ('Ingreso Nodo Verdadero', swe.TRUE_NODE),
+}
+
+BODIES = {**PLANETAS, LUNA[0]: LUNA[1], **{name: body_id for name, (_, body_id) in NODOS.items()}}
+BODY_NAMES = tuple(BODIES)
+
+# Planetas con estaciones (Sol y Luna nunca retrogradan)
+PLANETAS_RETROGRADOS = tuple(name for name in PLANETAS if name != 'Sol')
+
+# Ángulo -> (nombre, armonía). Los aspectos no simétricos se buscan en ±ángulo
+ASPECTOS = {
+    0.0: ('Conjunción', 'Neutro'),
+    60.0: ('Sextil', 'Armónico'),
+    90.0: ('Cuadratura', 'Tensión'),
+    120.0: ('Trígono', 'Armónico'),
+    180.0: ('Oposición', 'Tensión'),
+}
+ASPECT_TARGETS = (0.0, 60.0, -60.0, 90.0, -90.0, 120.0, -120.0, 180.0)
+
+# Observador para la elevación y el azimut de las lunaciones (Buenos Aires)
+OBSERVADOR = (-58.3816, -34.6037, 25.0)
+
+FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+# Precisión del refinamiento (días): bastante menos que el minuto publicado
+REFINE_TOLERANCE = 1.0 / 86400.0
+
+# Un cruce real nunca salta más que esto entre dos muestras diarias
+MAX_DAILY_JUMP = 90.0
+
+
+def _wrap(values):
+    return (values + 180.0) % 360.0 - 180.0
+
+
+def _position(body_id, jd):
+    values = swe.calc_ut(jd, body_id, FLAGS)[0]
+    return values[0], values[3]
+
+
+def _moment(jd):
+    """datetime UTC redondeado al minuto"""
+    return (jd_to_utc(jd) + timedelta(seconds=30)).replace(second=0, microsecond=0)
+
+
+def _format_position(longitude):
+    """1°08' Leo"""
+    longitude %= 360.0
+    degrees = longitude % 30.0
+    return f"{int(degrees)}°{int((degrees % 1) * 60):02d}' {SIGNOS[int(longitude // 30)]}"
+
+
+def _base_event(jd, tipo, descripcion, elevacion='', azimut=''):
+    moment = _moment(jd)
+    return {
+        'fecha_utc': moment.strftime('%Y-%m-%d'),
+        'hora_utc': moment.strftime('%H:%M'),
+        'tipo_evento': tipo,
+        'descripcion': descripcion,
+        'elevacion': elevacion,
+        'azimut': azimut
+    }
+
+
+def sample_year(year):
+    """
+    Muestras diarias (0h UT) de longitud y velocidad de todos los cuerpos,
+    del 1/1 del año al 1/1 del siguiente inclusive.
+
+    Returns:
+        (jds, longitudes (B, S), velocidades (B, S)) en el orden de BODY_NAMES
+    """
+    start_jd, end_jd = year_bounds(year)
+    jds = np.arange(start_jd, end_jd + 0.5, 1.0)
+    longitudes = np.empty((len(BODY_NAMES), len(jds)))
+    speeds = np.empty_like(longitudes)
+
+    for row, name in enumerate(BODY_NAMES):
+        body_id = BODIES[name]
+        for column in range(len(jds)):
+            longitudes[row, column], speeds[row, column] = _position(body_id, jds[column])
+    return jds, longitudes, speeds
+
+
+def _crossings(values):
+    """(filas, muestras) donde `values` cambia de signo sin saltar de ±180"""
+    before, after = values[..., :-1], values[..., 1:]
+    return np.nonzero((np.signbit(before) != np.signbit(after)) & (np.abs(after - before) < MAX_DAILY_JUMP))
+
+
+def _refine(f, jds, sample, fa, fb):
+    return brent(f, jds[sample], jds[sample + 1], fa, fb, tolerance=REFINE_TOLERANCE)
+
+
+def _sign_ingresses(jds, longitudes, rows, start_jd, end_jd):
+    """Cambios de signo de los cuerpos indicados -> [(jd, fila, signo_anterior, signo_nuevo, directo)]"""
+    signs = np.floor(longitudes[rows] / 30.0).astype(int)
+    results = []
+    for index, sample in zip(*np.nonzero(signs[:, :-1] != signs[:, 1:])):
+        row = rows[index]
+        old_sign, new_sign = signs[index, sample], signs[index, sample + 1]
+        direct = (new_sign - old_sign) % 12 == 1
+        cusp = 30.0 * (new_sign if direct else old_sign)
+        body_id = BODIES[BODY_NAMES[row]]
+        jd = _refine(lambda t: _wrap(_position(body_id, t)[0] - cusp), jds, sample,
+                     _wrap(longitudes[row, sample] - cusp), _wrap(longitudes[row, sample + 1] - cusp))
+        if start_jd <= jd < end_jd:
+            results.append((jd, row, old_sign % 12, new_sign % 12, direct))
+    return results
+
+
+def _ingress_events(jds, longitudes, start_jd, end_jd):
+    rows = [BODY_NAMES.index(name) for name in (LUNA[0],) + tuple(PLANETAS)]
+    events = []
+    for jd, row, old_sign, new_sign, direct in _sign_ingresses(jds, longitudes, rows, start_jd, end_jd):
+        name = BODY_NAMES[row]
+        if direct:
+            descripcion = f"{name} ingresa a 0.00° de {SIGNOS[new_sign]} (Directo)"
+        else:
+            descripcion = f"{name} deja a 29.99° de {SIGNOS[old_sign]} (Retrógrado)"
+        events.append((jd, _base_event(jd, 'Ingreso a Signo', descripcion)))
+    return events
+
+
+def _node_events(jds, longitudes, start_jd, end_jd):
+    """Ingresos de los nodos en su sentido habitual (retrógrado medio)"""
+    rows = [BODY_NAMES.index(name) for name in NODOS]
+    events = []
+    for jd, row, old_sign, new_sign, direct in _sign_ingresses(jds, longitudes, rows, start_jd, end_jd):
+        if direct:
+            continue  # oscilación del nodo verdadero hacia adelante
+        name = BODY_NAMES[row]
+        tipo = NODOS[name][0]
+        descripcion = f"{name} deja {SIGNOS[old_sign]} en 0° e ingresa a {SIGNOS[new_sign]} (Directo)"
+        events.append((jd, _base_event(jd, tipo, descripcion)))
+    return events
+
+
+def _aspect_events(jds, longitudes, start_jd, end_jd):
+    names = tuple(PLANETAS)
+    rows = np.array([BODY_NAMES.index(name) for name in names])
+    first, second = np.triu_indices(len(names), k=1)
+    targets = np.array(ASPECT_TARGETS)
+
+    # (pares, objetivos, muestras) en una sola operación
+    difference = _wrap(longitudes[rows[first]] - longitudes[rows[second]])
+    deviation = _wrap(difference[:, None, :] - targets[None, :, None])
+
+    events = []
+    for pair, target_index, sample in zip(*_crossings(deviation)):
+        name1, name2 = names[first[pair]], names[second[pair]]
+        id1, id2 = PLANETAS[name1], PLANETAS[name2]
+        target = targets[target_index]
+
+        def f(t):
+            return _wrap(_position(id1, t)[0] - _position(id2, t)[0] - target)
+
+        jd = _refine(f, jds, sample, deviation[pair, target_index, sample], deviation[pair, target_index, sample + 1])
+        if not start_jd <= jd < end_jd:
+            continue
+
+        # Orbe y movimiento al minuto publicado
+        published = jd + (_moment(jd) - jd_to_utc(jd)).total_seconds() / 86400.0
+        lon1, speed1 = _position(id1, published)
+        lon2, speed2 = _position(id2, published)
+        orb = _wrap(lon1 - lon2 - target)
+        applying = orb * (speed1 - speed2) < 0 and round(abs(orb), 2) > 0
+
+        aspect, harmony = ASPECTOS[abs(target)]
+        event = _base_event(jd, 'Aspecto', f"{name1} en {aspect} con {name2}")
+        event.update({
+            'planeta1': name1,
+            'planeta2': name2,
+            'posicion1': _format_position(lon1),
+            'posicion2': _format_position(lon2),
+            'tipo_aspecto': aspect,
+            'orbe': f"{abs(orb):.2f}°",
+            'es_aplicativo': 'Sí' if applying else 'No',
+            'harmony': harmony
+        })
+        events.append((jd, event))
+    return events
+
+
+def _station_events(jds, speeds, start_jd, end_jd):
+    rows = np.array([BODY_NAMES.index(name) for name in PLANETAS_RETROGRADOS])
+    events = []
+    selected = speeds[rows]
+    for index, sample in zip(*np.nonzero(np.signbit(selected[:, :-1]) != np.signbit(selected[:, 1:]))):
+        name = PLANETAS_RETROGRADOS[index]
+        body_id = PLANETAS[name]
+        jd = _refine(lambda t: _position(body_id, t)[1], jds, sample,
+                     selected[index, sample], selected[index, sample + 1])
+        if not start_jd <= jd < end_jd:
+            continue
+        position = _format_position(_position(body_id, jd)[0])
+        if selected[index, sample + 1] < 0:
+            events.append((jd, _base_event(jd, 'Inicio Retrogradación', f"{name} inicia retrogradación en {position}")))
+        else:
+            events.append((jd, _base_event(jd, 'Fin Retrogradación', f"{name} termina retrogradación en {position}")))
+    return events
+
+
+def _moon_horizon(jd):
+    """(elevación, azimut desde el norte) topocéntricos de la Luna"""
+    swe.set_topo(*OBSERVADOR)
+    moon = swe.calc_ut(jd, swe.MOON, swe.FLG_SWIEPH | swe.FLG_TOPOCTR)[0]
+    azimuth, altitude, _ = swe.azalt(jd, swe.ECL2HOR, OBSERVADOR, 0.0, 0.0, moon[:3])
+    return f"{altitude:.1f}°", f"{(azimuth + 180.0) % 360.0:.1f}°"
+
+
+def _eclipse(jd, new_moon):
+    """(tipo, clase) del eclipse en la lunación, o None"""
+    if new_moon:
+        flags, times = swe.sol_eclipse_when_glob(jd - 1.0)
+        kinds = ((swe.ECL_ANNULAR_TOTAL, 'Híbrido'), (swe.ECL_TOTAL, 'Total'),
+                 (swe.ECL_ANNULAR, 'Anular'), (swe.ECL_PARTIAL, 'Parcial'))
+    else:
+        flags, times = swe.lun_eclipse_when(jd - 1.0)
+        kinds = ((swe.ECL_TOTAL, 'Total'), (swe.ECL_PARTIAL, 'Parcial'))
+    if abs(times[0] - jd) > 1.0:
+        return None
+    for flag, kind in kinds:
+        if flags & flag:
+            return ('Eclipse Solar' if new_moon else 'Eclipse Lunar'), kind
+    return None  # penumbral
+
+
+def _lunation_events(jds, longitudes, start_jd, end_jd):
+    moon, sun = BODY_NAMES.index('Luna'), BODY_NAMES.index('Sol')
+    node = BODY_NAMES.index('Nodo Norte Verdadero')
+    elongation = _wrap(longitudes[moon] - longitudes[sun])
+    phases = np.stack([elongation, _wrap(elongation - 180.0)])
+
+    events = []
+    for phase, sample in zip(*_crossings(phases)):
+        offset = 180.0 * phase
+
+        def f(t):
+            return _wrap(_position(swe.MOON, t)[0] - _position(swe.SUN, t)[0] - offset)
+
+        jd = _refine(f, jds, sample, phases[phase, sample], phases[phase, sample + 1])
+        if not start_jd <= jd < end_jd:
+            continue
+
+        longitude = _position(swe.MOON, jd)[0]
+        sign, degrees = SIGNOS[int(longitude // 30)], longitude % 30.0
+        elevacion, azimut = _moon_horizon(jd)
+        details = {'signo': sign, 'grado': f"{degrees:.2f}°", 'posicion': _format_position(longitude)}
+
+        new_moon = phase == 0
+        nombre = 'Luna nueva' if new_moon else 'Luna llena'
+        event = _base_event(jd, 'Luna Nueva' if new_moon else 'Luna Llena',
+                            f"{nombre} en {sign} {degrees:.2f}°", elevacion, azimut)
+        event.update(details)
+        events.append((jd, event))
+
+        eclipse = _eclipse(jd, new_moon)
+        if eclipse:
+            tipo, kind = eclipse
+            node_longitude = _position(BODIES[BODY_NAMES[node]], jd)[0]
+            # Formato de los archivos de data/: cerca del Nodo Norte, la distancia
+            # absoluta; si no, la firmada respecto del Sur a partir de la
+            # diferencia sin normalizar (p. ej. 168.4° el 29/03/2025)
+            difference = longitude - node_longitude
+            if abs(difference) <= 90.0:
+                distance = abs(difference)
+            else:
+                distance = (-difference) % 360.0 - 180.0
+            event = _base_event(jd, tipo, f"{tipo} {kind} en {sign} {degrees:.2f}° (distancia al nodo: {distance:.1f}°)",
+                                elevacion, azimut)
+            event.update(details)
+            events.append((jd, event))
+    return events
+
+
+def calcular_eventos_anio(year):
+    """Eventos generales de un año (UTC), en orden cronológico"""
+    start_jd, end_jd = year_bounds(year)
+    jds, longitudes, speeds = sample_year(year)
+
+    timed = (_ingress_events(jds, longitudes, start_jd, end_jd)
+             + _aspect_events(jds, longitudes, start_jd, end_jd)
+             + _station_events(jds, speeds, start_jd, end_jd)
+             + _lunation_events(jds, longitudes, start_jd, end_jd)
+             + _node_events(jds, longitudes, start_jd, end_jd))
+    timed.sort(key=lambda item: item[0])
+    return [event for _, event in timed]
+
+
+def _init_worker(ephemeris_path):
+    if ephemeris_path:
+        setup.set_filepath(ephemeris_path)
+
+
+def _calcular_en_worker(year):
+    return year, calcular_eventos_anio(year)
+
+
+def _write_json(path, data):
+    """Escritura atómica (archivo temporal + os.replace)"""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(temporary, path)
+
+
+def generar_eventos(start_year, end_year, output_dir=OUTPUT_DIR, workers=None, force=False,
+                    ephemeris_path=None):
+    """
+    Genera los archivos de eventos de start_year a end_year (inclusive), un
+    año por proceso. Cada año se escribe en cuanto termina.
+
+    Los años que ya tienen archivo se saltean salvo force=True.
+
+    Yields:
+        (año, cantidad de eventos) a medida que se escribe cada año
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    pending = [
+        year for year in range(start_year, end_year + 1)
+        if force or not os.path.exists(os.path.join(output_dir, OUTPUT_PATTERN.format(year=year)))
+    ]
+    if not pending:
+        return
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(ephemeris_path,)) as executor:
+        futures = [executor.submit(_calcular_en_worker, year) for year in pending]
+        for future in as_completed(futures):
+            year, events = future.result()
+            _write_json(os.path.join(output_dir, OUTPUT_PATTERN.format(year=year)), events)
+            yield year, len(events)
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    force = '--force' in sys.argv
+    start_year = int(args[0]) if args else 2024
+    end_year = int(args[1]) if len(args) > 1 else start_year
+    output_dir = args[2] if len(args) > 2 else OUTPUT_DIR
+
+    print(f"📅 Generando eventos generales {start_year}-{end_year} -> {output_dir}")
+    total = 0
+    for year, count in generar_eventos(start_year, end_year, output_dir, force=force):
+        total += count
+        print(f"  ✅ {year}: {count} eventos")
+    if not total:
+        print("  Sin años pendientes (usar --force para regenerar)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Verificación de precisión y tiempos sobre los casos de referencia.
+
+Reemplaza la comparación de debug_natal_data_comparison.py (un nativo fijo,
+cinco longitudes de AstroSeek, en serie) por una corrida de todos los casos
+de test_cases.json y astroseek_reference_data.json en un pool de procesos.
+Para cada caso mide:
+- Error en minutos de arco por cuerpo, ángulo y cúspide contra los valores
+  de referencia, y de la Luna progresada en la fecha de referencia (la de
+  su conjunción con el Sol natal según AstroSeek). Esa conjunción tiene que
+  aparecer entre las de sweep_aspects a menos de un día de esa fecha.
+- Tiempo de cada etapa: carta natal, progresión y búsqueda de conjunciones
+  de Luna progresada del año del caso.
+
+Escribe un reporte JSON y sale con código 1 si un caso falla o si un error
+supera la tolerancia. Por defecto sólo se exigen las tolerancias de
+validaciones_automaticas de test_cases.json: Sol natal ± 0.1° y Luna
+progresada ± 0.2°. Con --tolerance se exige a todos los cuerpos, ángulos y
+cúspides. Con --compare se comparan todas las posiciones calculadas (con o
+sin referencia) contra un reporte anterior y falla si alguna se movió más
+que --drift: un cambio de rendimiento no debería mover ningún resultado.
+Así cada cambio en el camino de cálculo se valida con un solo comando.
+
+Uso:
+    python golden_accuracy.py
+    python golden_accuracy.py --compare data/golden_accuracy.json --output /tmp/nuevo.json
+    python golden_accuracy.py --workers 4 --repeat 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from reference_cases import load_reference_cases, load_validations
+
+DEFAULT_OUTPUT = 'data/golden_accuracy.json'
+
+# Variación tolerada contra un reporte anterior (--compare), en minutos de arco
+DEFAULT_DRIFT_ARCMIN = 0.05
+
+# Cuerpos natales usados como objetivos de la búsqueda de conjunciones
+CONJUNCTION_BODIES = ('Sun', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Uranus', 'Neptune', 'Pluto')
+
+PENDING_PER_WORKER = 2
+
+# Distancia máxima entre la conjunción de referencia y la encontrada, en días
+MAX_CONJUNCTION_DAYS = 1.0
+
+
+def arcmin_error(calculated, expected):
+    """Diferencia angular con signo (calculado - esperado) en minutos de arco"""
+    return round(((calculated - expected + 180.0) % 360.0 - 180.0) * 60.0, 3)
+
+
+def _init_worker(ephemeris_path):
+    if ephemeris_path:
+        from immanuel import setup
+        setup.set_filepath(ephemeris_path)
+
+
+def evaluar_caso(index, case):
+    """Calcula un caso por etapas; devuelve (index, resultado) sin propagar errores"""
+    result = {'nombre': case.nombre, 'fuente': case.source, 'tiempos_ms': {}, 'error': None}
+    try:
+        from natal_chart_proposed import calcular_carta_natal
+        from progressed_moon import ProgressedNativeContext, sweep_aspects, utc_to_jd
+
+        start = time.perf_counter()
+        carta = calcular_carta_natal(case.datos_usuario)
+        result['tiempos_ms']['carta'] = round((time.perf_counter() - start) * 1000, 3)
+
+        result['posiciones'] = {name: round(point['longitude'], 6) for name, point in carta['points'].items()}
+        result['errores_arcmin'] = {
+            name: arcmin_error(carta['points'][name]['longitude'], expected)
+            for name, expected in case.expected_points.items() if name in carta['points']
+        }
+        result['cuspides_arcmin'] = [
+            arcmin_error(carta['houses'][str(number)]['longitude'], expected)
+            for number, expected in enumerate(case.expected_cusps, start=1)
+        ]
+
+        start = time.perf_counter()
+        native = ProgressedNativeContext(case.birth_date, case.latitude, case.longitude)
+        progressed_date = case.progressed_date or datetime(case.year, 7, 1, tzinfo=timezone.utc)
+        progressed_moon = native.moon_at(utc_to_jd(progressed_date))
+        result['tiempos_ms']['progresion'] = round((time.perf_counter() - start) * 1000, 3)
+        result['luna_progresada'] = round(progressed_moon, 4)
+        if case.expected_progressed_moon is not None and case.progressed_date is not None:
+            result['luna_progresada_arcmin'] = arcmin_error(progressed_moon, case.expected_progressed_moon)
+
+        start = time.perf_counter()
+        natal_points = {name: carta['points'][name]['longitude'] for name in CONJUNCTION_BODIES
+                        if name in carta['points']}
+        start_jd = utc_to_jd(datetime(case.year, 1, 1, tzinfo=timezone.utc))
+        end_jd = utc_to_jd(datetime(case.year + 1, 1, 1, tzinfo=timezone.utc))
+        hits = sweep_aspects(native, natal_points, start_jd, end_jd, aspects=[0.0])
+        result['tiempos_ms']['conjunciones'] = round((time.perf_counter() - start) * 1000, 3)
+        result['conjunciones'] = [
+            {'punto': hit.point, 'fecha_utc': hit.crossing.exact_utc.strftime('%Y-%m-%d %H:%M')}
+            for hit in hits
+        ]
+        if case.progressed_conjunction and case.progressed_date:
+            # Días entre la conjunción de referencia y la más cercana encontrada
+            offsets = [(hit.crossing.exact_utc - progressed_date).total_seconds() / 86400.0
+                       for hit in hits if hit.point == case.progressed_conjunction]
+            result['conjuncion_referencia'] = {
+                'punto': case.progressed_conjunction,
+                'fecha_utc': progressed_date.strftime('%Y-%m-%d'),
+                'dias': round(min(offsets, key=abs), 3) if offsets else None,
+            }
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return index, result
+
+
+def ejecutar(cases, workers=None, ephemeris_path=None):
+    """Evalúa los casos en un pool de procesos; devuelve los resultados en orden de entrada"""
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(cases)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(ephemeris_path,)) as executor:
+        pending = deque()
+        for index, case in enumerate(cases):
+            pending.append(executor.submit(evaluar_caso, index, case))
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                index, result = pending.popleft().result()
+                results[index] = result
+        while pending:
+            index, result = pending.popleft().result()
+            results[index] = result
+    return results
+
+
+def errores(result):
+    """Errores de un caso como {etiqueta: minutos de arco}"""
+    values = dict(result.get('errores_arcmin', {}))
+    for number, error in enumerate(result.get('cuspides_arcmin', []), start=1):
+        values[f'casa {number}'] = error
+    if result.get('luna_progresada_arcmin') is not None:
+        values['Luna progresada'] = result['luna_progresada_arcmin']
+    return values
+
+
+def tolerancias(tolerance=None):
+    """
+    Tolerancias en minutos de arco por etiqueta; None = las del fixture
+    (sólo Sol y Luna progresada). Con `tolerance` vale para todas.
+    """
+    if tolerance is not None:
+        return lambda label: tolerance
+    fixture = load_validations()
+    limits = {'Sun': fixture.get('Sun'), 'Luna progresada': fixture.get('progressed_moon')}
+    limits = {label: degrees * 60.0 for label, degrees in limits.items() if degrees is not None}
+    return limits.get
+
+
+def fallas(result, limit_of):
+    """Mensajes de los errores fuera de tolerancia de un caso"""
+    if result['error']:
+        return [f"{result['nombre']}: {result['error']}"]
+    messages = []
+    for label, error in errores(result).items():
+        limit = limit_of(label)
+        if limit is not None and abs(error) > limit:
+            messages.append(f"{result['nombre']}: {label} {error:+.2f}' (tolerancia {limit:g}')")
+    conjunction = result.get('conjuncion_referencia')
+    if conjunction is not None:
+        if conjunction['dias'] is None:
+            messages.append(f"{result['nombre']}: sin conjunción de Luna progresada con {conjunction['punto']} "
+                            f"(referencia {conjunction['fecha_utc']})")
+        elif abs(conjunction['dias']) > MAX_CONJUNCTION_DAYS:
+            messages.append(f"{result['nombre']}: conjunción de Luna progresada con {conjunction['punto']} "
+                            f"a {conjunction['dias']:+.2f} días de {conjunction['fecha_utc']}")
+    return messages
+
+
+def posiciones(result):
+    """Longitudes calculadas de un caso (carta y Luna progresada), con o sin referencia"""
+    values = dict(result.get('posiciones', {}))
+    if result.get('luna_progresada') is not None:
+        values['Luna progresada'] = result['luna_progresada']
+    return values
+
+
+def derivas(results, previous, drift):
+    """Posiciones que se movieron más de `drift` minutos de arco respecto de un reporte anterior"""
+    before = {}
+    for result in previous['casos']:
+        before.setdefault(result['nombre'], posiciones(result))
+    messages = []
+    for result in results:
+        reference = before.get(result['nombre'])
+        if reference is None or result['error']:
+            continue
+        for label, longitude in posiciones(result).items():
+            if label in reference:
+                moved = arcmin_error(longitude, reference[label])
+                if abs(moved) > drift:
+                    messages.append(f"{result['nombre']}: {label} se movió {moved:+.3f}' respecto del reporte anterior")
+    return messages
+
+
+def resumen(results, wall):
+    ok = [result for result in results if not result['error']]
+    errors = [abs(error) for result in ok for error in result['errores_arcmin'].values()]
+    cusps = [abs(error) for result in ok for error in result['cuspides_arcmin']]
+    stages = {}
+    for stage in ('carta', 'progresion', 'conjunciones'):
+        times = [result['tiempos_ms'][stage] for result in ok if stage in result['tiempos_ms']]
+        if times:
+            stages[stage] = round(sum(times) / len(times), 3)
+    return {
+        'casos': len(results),
+        'fallidos': len(results) - len(ok),
+        'error_max_arcmin': max(errors, default=0.0),
+        'error_max_cuspides_arcmin': max(cusps, default=0.0),
+        'tiempo_medio_ms': stages,
+        'tiempo_total_s': round(wall, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precisión y tiempos sobre los casos de referencia")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--repeat', type=int, default=1, help="Repetir cada caso N veces (carga para tiempos)")
+    parser.add_argument('--tolerance', type=float,
+                        help="Error máximo en minutos de arco para todo (por defecto, las del fixture)")
+    parser.add_argument('--compare', help="Reporte anterior contra el que medir la variación de los errores")
+    parser.add_argument('--drift', type=float, default=DEFAULT_DRIFT_ARCMIN,
+                        help="Variación máxima tolerada con --compare, en minutos de arco")
+    parser.add_argument('--ephemeris-path')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    cases = load_reference_cases() * args.repeat
+    print("🎯 PRECISIÓN Y TIEMPOS: casos de referencia")
+    print("=" * 88)
+    print(f"Casos: {len(cases)} | Workers: {args.workers or os.cpu_count()}")
+    print("=" * 88)
+
+    start = time.perf_counter()
+    results = ejecutar(cases, args.workers, args.ephemeris_path)
+    wall = time.perf_counter() - start
+
+    print(f"{'Caso':<36} | {'Máx. error':>10} | {'Luna prog.':>10} | {'Carta':>8} | {'Prog.':>7} | {'Conj.':>8}")
+    print("-" * 88)
+    problems = []
+    for result in results[:len(results) // args.repeat]:
+        if result['error']:
+            print(f"{result['nombre'][:36]:<36} | ❌ {result['error']}")
+            continue
+        errors = [abs(error) for error in result['errores_arcmin'].values()]
+        max_error = f"{max(errors):>9.2f}'" if errors else f"{'-':>10}"
+        progressed = result.get('luna_progresada_arcmin')
+        progressed = f"{progressed:>+9.2f}'" if progressed is not None else f"{'-':>10}"
+        times = result['tiempos_ms']
+        print(f"{result['nombre'][:36]:<36} | {max_error} | {progressed} | {times['carta']:>6.1f}ms | "
+              f"{times['progresion']:>5.2f}ms | {times['conjunciones']:>6.2f}ms")
+    limit_of = tolerancias(args.tolerance)
+    for result in results:
+        problems.extend(fallas(result, limit_of))
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            problems.extend(derivas(results, json.load(f), args.drift))
+
+    report = {
+        'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'tolerancia_arcmin': args.tolerance,
+        'comparado_con': args.compare,
+        'resumen': resumen(results, wall),
+        'casos': results,
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    summary = report['resumen']
+    print("=" * 88)
+    print(f"Error máximo: {summary['error_max_arcmin']:.2f}' | cúspides: {summary['error_max_cuspides_arcmin']:.2f}' "
+          f"| Tiempo total: {summary['tiempo_total_s']:.2f}s")
+    print(f"📄 Reporte: {args.output}")
+
+    # Errores repetidos por --repeat se informan una sola vez
+    problems = list(dict.fromkeys(problems))
+    if problems:
+        print("❌ FUERA DE TOLERANCIA:")
+        for problem in problems:
+            print(f"  • {problem}")
+        sys.exit(1)
+    print("✅ Todos los casos dentro de tolerancia")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Matriz de cobertura de interpretaciones: qué eventos calculables tienen
+título de interpretación.
+
+diagnostico_eventos_detectables.py muestra que muchos eventos calculables
+(por ejemplo "Sol conjunción Lilith") no tienen título de interpretación.
+Aun así el front los manda al servicio de interpretación por
+app/api/interpretar-eventos.
+
+build_coverage cruza una vez el espacio de eventos con el índice de títulos
+de interpretación (TitleIndex):
+- El catálogo de eventos personales (TITULOS_EVENTOS_PERSONALES_COMPLETOS.txt).
+- Las combinaciones natales: aspectos entre puntos, puntos en signos y en
+  casas, retrógrados.
+
+Cada evento se resuelve por título exacto o alias y, si no, con
+TitleSearchIndex sobre los títulos de interpretación (confianza mínima).
+El resultado es un bitmap (un bit por evento) con el título
+emparejado, guardado en JSON junto con los hashes de los dos archivos
+fuente; load_or_build lo recalcula si cambió cualquiera.
+
+El lado del cálculo marca cada evento con 'interpretable' (mark) o descarta
+los no cubiertos (filter_events) antes de la llamada de red. Los eventos
+que no están en la matriz se consideran interpretables: la matriz sólo
+descarta lo que sabe que no tiene título. El reporte del diagnóstico sale
+del mismo artefacto (report_lines).
+
+Uso:
+    python interpretation_coverage.py "../astro_interpretador_rag_fastapi/data/Títulos Numerados tropico.md"
+
+    coverage = CoverageMatrix.load('data/cobertura_interpretaciones.json')
+    eventos = coverage.filter_events(eventos)
+"""
+
+import base64
+import json
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from natal_chart_records import SIGNOS
+from title_index import ASPECT_KEYWORDS, TitleIndex, event_title, file_digest
+from title_search import CATALOG_PATH, STOPWORDS, TitleSearchIndex, fold_title, load_catalog_titles
+
+COVERAGE_VERSION = 1
+DEFAULT_COVERAGE_PATH = 'data/cobertura_interpretaciones.json'
+
+# Confianza mínima de TitleSearchIndex para dar un evento por cubierto
+COVERAGE_MIN_CONFIDENCE = 0.9
+
+# Familias del catálogo de eventos personales (por fragmento del título)
+CATALOG_FAMILIES = (
+    (' en tránsito ', 'Tránsitos'),
+    ('Luna progresada conjunción', 'Luna progresada'),
+    ('Cambio de Señor del Año', 'Profecciones'),
+    ('Luna nueva', 'Fases lunares'),
+    ('Luna llena', 'Fases lunares'),
+    ('Eclipse', 'Eclipses'),
+    ('transitando casa', 'Tránsitos por casas'),
+)
+
+# Espacio natal: puntos con aspectos, signos y casas
+NATAL_POINTS = ('sol', 'luna', 'mercurio', 'venus', 'marte', 'júpiter', 'saturno', 'urano', 'neptuno',
+                'plutón', 'quirón', 'lilith', 'nodo norte', 'ascendente', 'mc')
+PLACED_POINTS = NATAL_POINTS[:13]
+RETROGRADE_POINTS = ('mercurio', 'venus', 'marte', 'júpiter', 'saturno', 'urano', 'neptuno', 'plutón',
+                     'quirón')
+
+
+def coverage_key(query):
+    """Clave de búsqueda en la matriz: título plegado sin palabras vacías ("conjunción a" = "conjunción")"""
+    return ' '.join(token for token in fold_title(query).split() if token not in STOPWORDS)
+
+
+def catalog_family(title):
+    for fragment, family in CATALOG_FAMILIES:
+        if fragment in title:
+            return family
+    return 'Otros'
+
+
+def event_space(catalog_titles):
+    """[(familia, consulta)] de todos los eventos calculables"""
+    space = [(catalog_family(title), title) for title in catalog_titles]
+    for first, point1 in enumerate(NATAL_POINTS):
+        for point2 in NATAL_POINTS[first + 1:]:
+            for aspect in ASPECT_KEYWORDS:
+                space.append(('Natal: aspectos', f"aspecto {point1} {aspect} a {point2}"))
+    for point in PLACED_POINTS:
+        for sign in SIGNOS:
+            space.append(('Natal: signos', f"{point} en {sign.lower()}"))
+        for house in range(1, 13):
+            space.append(('Natal: casas', f"{point} en casa {house}"))
+    for point in RETROGRADE_POINTS:
+        space.append(('Natal: retrógrados', f"{point} retrógrado"))
+    return space
+
+
+def build_coverage(title_index, catalog_titles=None, min_confidence=COVERAGE_MIN_CONFIDENCE):
+    """
+    Cruza el espacio de eventos con los títulos de interpretación.
+
+    Returns:
+        CoverageMatrix (sin hashes de origen; los agrega load_or_build)
+    """
+    if catalog_titles is None:
+        catalog_titles = load_catalog_titles()
+    search = TitleSearchIndex(sorted(title_index.titles))
+
+    families, queries, matches = [], [], []
+    for family, query in event_space(catalog_titles):
+        title = title_index.find(query.lower())
+        if title is None:
+            title = search.match(query, min_confidence)
+        families.append(family)
+        queries.append(query)
+        matches.append(title or '')
+    return CoverageMatrix(families, queries, matches)
+
+
+class CoverageMatrix:
+    """Un bit de cobertura por evento calculable, con el título emparejado."""
+
+    def __init__(self, families, queries, matches, sources=None):
+        self.families = list(families)
+        self.queries = list(queries)
+        self.matches = list(matches)
+        self.covered_bits = np.array([bool(title) for title in self.matches], dtype=bool)
+        self.sources = dict(sources or {})
+        self.positions = {coverage_key(query): position for position, query in enumerate(self.queries)}
+
+    def __len__(self):
+        return len(self.queries)
+
+    def covered(self, query):
+        """True/False si el evento está en la matriz, None si no se conoce"""
+        position = self.positions.get(coverage_key(query))
+        return None if position is None else bool(self.covered_bits[position])
+
+    def is_interpretable(self, event):
+        """Los eventos desconocidos cuentan como interpretables"""
+        return self.covered(event_title(event)) is not False
+
+    def mark(self, events):
+        """Agrega 'interpretable' a cada evento (in place) y devuelve la lista"""
+        for event in events:
+            event['interpretable'] = self.is_interpretable(event)
+        return events
+
+    def filter_events(self, events):
+        """Sólo los eventos con interpretación (para mandar al servicio)"""
+        return [event for event in events if self.is_interpretable(event)]
+
+    def summary(self):
+        """{familia: (total, cubiertos)} en orden de aparición"""
+        totals = defaultdict(lambda: [0, 0])
+        for family, covered in zip(self.families, self.covered_bits):
+            totals[family][0] += 1
+            totals[family][1] += int(covered)
+        return {family: tuple(counts) for family, counts in totals.items()}
+
+    def uncovered(self, family=None):
+        return [query for query, fam, covered in zip(self.queries, self.families, self.covered_bits)
+                if not covered and (family is None or fam == family)]
+
+    def report_lines(self):
+        """Sección de cobertura para el reporte del diagnóstico"""
+        lines = ["🧩 COBERTURA DE INTERPRETACIONES", "-" * 40]
+        summary = self.summary()
+        for family, (total, covered) in summary.items():
+            lines.append(f"{family}: {covered}/{total} cubiertos ({covered / total:.0%})")
+        total = len(self)
+        lines.append(f"Total: {int(self.covered_bits.sum())}/{total} eventos calculables con interpretación")
+        lines.append("")
+        for family in summary:
+            missing = self.uncovered(family)
+            if missing:
+                lines.append(f"\n### SIN INTERPRETACIÓN: {family.upper()} ({len(missing)})")
+                lines.extend(f"  • {query}" for query in missing)
+        return lines
+
+    def to_dict(self):
+        names = list(dict.fromkeys(self.families))
+        return {
+            'version': COVERAGE_VERSION,
+            'sources': self.sources,
+            'families': names,
+            'family': [names.index(family) for family in self.families],
+            'queries': self.queries,
+            'matches': self.matches,
+            'bitmap': base64.b64encode(np.packbits(self.covered_bits).tobytes()).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != COVERAGE_VERSION:
+            raise ValueError("Versión de matriz de cobertura no soportada")
+        families = [data['families'][index] for index in data['family']]
+        matrix = cls(families, data['queries'], data['matches'], data.get('sources'))
+        bits = np.unpackbits(np.frombuffer(base64.b64decode(data['bitmap']), dtype=np.uint8))
+        matrix.covered_bits = bits[:len(matrix)].astype(bool)
+        return matrix
+
+    def save(self, path):
+        """Escritura atómica (archivo temporal + os.replace)"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def load_or_build(cls, titles_path, path=DEFAULT_COVERAGE_PATH, catalog_path=CATALOG_PATH, index=None):
+        """
+        Matriz guardada si sus archivos de origen no cambiaron (SHA-256 del
+        markdown de títulos y del catálogo); si no, la recalcula y la guarda.
+        """
+        sources = {'titles': file_digest(titles_path), 'catalog': file_digest(catalog_path)}
+        if os.path.isfile(path):
+            try:
+                matrix = cls.load(path)
+                if matrix.sources == sources:
+                    return matrix
+            except (ValueError, KeyError):
+                pass
+
+        index = index or TitleIndex.load(titles_path)
+        matrix = build_coverage(index, load_catalog_titles(catalog_path))
+        matrix.sources = sources
+        matrix.save(path)
+        return matrix
+
+
+def main():
+    titles_file = sys.argv[1] if len(sys.argv) > 1 else "../astro_interpretador_rag_fastapi/data/Títulos Numerados tropico.md"
+    output = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_COVERAGE_PATH
+
+    if not os.path.exists(titles_file):
+        print(f"❌ Error: No se encontró el archivo {titles_file}")
+        sys.exit(1)
+
+    print(f"📄 Títulos de interpretación: {titles_file}")
+    matrix = CoverageMatrix.load_or_build(titles_file, output)
+    covered = int(matrix.covered_bits.sum())
+    print(f"✅ Matriz de cobertura: {covered}/{len(matrix)} eventos con interpretación → {output}")
+    for family, (total, family_covered) in matrix.summary().items():
+        print(f"  {family:<22} {family_covered:>5}/{total:<5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Capa de tiempo por lotes: datetime64 / segundos Unix <-> día juliano (UT y TT).
+
+Los motores por lotes (Luna progresada, tránsitos, ingresos) convertían
+cada muestra por separado: astimezone + date.to_jd o swe.julday sobre un
+datetime de Python. Acá todas las conversiones son operaciones de array:
+- datetime64 (cualquier resolución) y segundos Unix -> JD UT.
+- JD UT -> datetime64 y segundos Unix.
+- UT <-> TT con ΔT de Swiss Ephemeris (swe.deltat).
+
+Precisión: un JD float64 cerca de 2.46e6 resuelve ~40 µs, así que la ida y
+vuelta con un solo float es exacta al milisegundo. Para ida y vuelta exacta
+al nanosegundo está la forma en dos partes (jd1 = día entero + 0.5 de la
+época, jd2 = fracción), como los pares JD de ERFA/SOFA: la parte entera se
+calcula con enteros y la fracción no pierde bits.
+
+ΔT se evalúa una vez por día de la grilla que cubre las muestras y se
+interpola (varía ~1 s por año: el error de interpolar es de nanosegundos);
+si las muestras son menos que los días que abarcan, se evalúa en cada una.
+
+Uso:
+    dias = np.arange('2025-01-01', '2026-01-01', dtype='datetime64[D]')
+    jds = datetime64_to_jd(dias)
+    jd1, jd2 = datetime64_to_jd2(instantes)         # ida y vuelta exacta
+    instantes = jd2_to_datetime64(jd1, jd2, 'ns')
+    jds_tt = ut_to_tt(jds)
+"""
+
+from datetime import datetime
+
+import numpy as np
+import swisseph as swe
+
+# Época Unix expresada en días julianos (UT)
+UNIX_EPOCH_JD = 2440587.5
+
+SECONDS_PER_DAY = 86400.0
+
+# Paso de la grilla de ΔT, en días
+DELTA_T_GRID_DAYS = 1.0
+
+# Iteraciones de TT -> UT (ΔT cambia ~1e-8 días por día: converge en 2)
+TT_ITERATIONS = 3
+
+
+def _ticks_per_day(unit):
+    return int(np.timedelta64(1, 'D') // np.timedelta64(1, unit))
+
+
+def _as_datetime64(values):
+    """datetime64 con resolución de a lo sumo un día (meses y años pasan a días)"""
+    values = np.asarray(values)
+    if values.dtype.kind != 'M':
+        values = values.astype('datetime64[us]')
+    unit, _ = np.datetime_data(values.dtype)
+    if unit in ('Y', 'M', 'W', 'generic'):
+        values = values.astype('datetime64[D]')
+    return values
+
+
+def datetime64_to_jd2(values):
+    """
+    datetime64 (UTC) -> (jd1, jd2) en dos partes: jd1 es medianoche UTC en
+    JD (entero + 0.5, exacto) y jd2 la fracción del día en [0, 1). NaT -> NaN.
+    """
+    values = _as_datetime64(values)
+    unit, _ = np.datetime_data(values.dtype)
+    per_day = _ticks_per_day(unit)
+    ticks = values.view(np.int64)
+    days, remainder = np.divmod(ticks, per_day)
+    jd1 = days + UNIX_EPOCH_JD
+    jd2 = remainder / per_day
+    missing = np.isnat(values)
+    if missing.any():
+        jd1 = np.where(missing, np.nan, jd1)
+        jd2 = np.where(missing, np.nan, jd2)
+    return jd1, jd2
+
+
+def datetime64_to_jd(values):
+    """datetime64 (UTC) -> JD UT en un solo float64"""
+    jd1, jd2 = datetime64_to_jd2(values)
+    return jd1 + jd2
+
+
+def jd2_to_datetime64(jd1, jd2=0.0, unit='us'):
+    """
+    (jd1, jd2) -> datetime64[unit], redondeado a la unidad. Inversa exacta
+    de datetime64_to_jd2 para cualquier resolución hasta nanosegundos.
+    """
+    jd1 = np.asarray(jd1, dtype=np.float64)
+    jd2 = np.asarray(jd2, dtype=np.float64)
+    missing = np.isnan(jd1) | np.isnan(jd2)
+    jd1 = np.where(missing, UNIX_EPOCH_JD, jd1)
+    jd2 = np.where(missing, 0.0, jd2)
+
+    per_day = _ticks_per_day(unit)
+    offset = jd1 - UNIX_EPOCH_JD
+    days = np.floor(offset)
+    fraction = (offset - days) + jd2
+    whole = np.floor(fraction)
+    ticks = (days + whole).astype(np.int64) * per_day + np.rint((fraction - whole) * per_day).astype(np.int64)
+    result = ticks.astype(f'datetime64[{unit}]')
+    if missing.any():
+        result = np.where(missing, np.datetime64('NaT', unit), result)
+    return result
+
+
+def jd_to_datetime64(jd, unit='us'):
+    """JD UT (float64) -> datetime64[unit] (redondeado; exacto al milisegundo)"""
+    return jd2_to_datetime64(jd, 0.0, unit)
+
+
+def epoch_to_jd(seconds):
+    """Segundos Unix (UTC) -> JD UT"""
+    seconds = np.asarray(seconds)
+    if seconds.dtype.kind in 'iu':
+        days, remainder = np.divmod(seconds.astype(np.int64), int(SECONDS_PER_DAY))
+        return (days + UNIX_EPOCH_JD) + remainder / SECONDS_PER_DAY
+    return seconds.astype(np.float64) / SECONDS_PER_DAY + UNIX_EPOCH_JD
+
+
+def jd_to_epoch(jd):
+    """JD UT -> segundos Unix (float64)"""
+    return (np.asarray(jd, dtype=np.float64) - UNIX_EPOCH_JD) * SECONDS_PER_DAY
+
+
+def to_jd(times, zone=None):
+    """
+    Cualquier lote de fechas -> JD UT (float64):
+    - floats: ya son JD, se devuelven tal cual.
+    - enteros: segundos Unix (UTC).
+    - datetime64: UTC, u hora local de `zone` (timezone_table) si se indica.
+    - datetime con zona horaria (secuencia u objeto): vía timestamp.
+    """
+    values = np.asarray(times)
+    if values.dtype.kind == 'f':
+        return values.astype(np.float64)
+    if values.dtype.kind in 'iu':
+        return epoch_to_jd(values)
+    if values.dtype.kind == 'M':
+        if zone is not None:
+            from timezone_table import get_zone
+            values = get_zone(str(zone)).to_utc(values).utc
+        return datetime64_to_jd(values)
+    seconds = np.fromiter((moment.timestamp() for moment in values.ravel()),
+                          dtype=np.float64, count=values.size).reshape(values.shape)
+    return epoch_to_jd(seconds)
+
+
+def year_bounds(year):
+    """JD UT del 1 de enero de `year` y del año siguiente, a 0h UTC"""
+    start, end = datetime64_to_jd(np.array([f'{year}-01-01', f'{year + 1}-01-01'], dtype='datetime64[D]'))
+    return float(start), float(end)
+
+
+def delta_t(jd_ut):
+    """ΔT = TT - UT en días para un array de JD UT (swe.deltat en una grilla diaria + interpolación)"""
+    jd_ut = np.asarray(jd_ut, dtype=np.float64)
+    finite = jd_ut[np.isfinite(jd_ut)]
+    if finite.size == 0:
+        return np.full(jd_ut.shape, np.nan)
+    first = np.floor(finite.min())
+    last = np.ceil(finite.max())
+    points = int((last - first) / DELTA_T_GRID_DAYS) + 1
+    if points >= finite.size:
+        return np.fromiter((swe.deltat(jd) if np.isfinite(jd) else np.nan for jd in jd_ut.ravel().tolist()),
+                           dtype=np.float64, count=jd_ut.size).reshape(jd_ut.shape)
+    grid = first + np.arange(points) * DELTA_T_GRID_DAYS
+    values = np.fromiter((swe.deltat(jd) for jd in grid.tolist()), dtype=np.float64, count=points)
+    return np.interp(jd_ut, grid, values)
+
+
+def ut_to_tt(jd_ut):
+    """JD UT -> JD TT"""
+    jd_ut = np.asarray(jd_ut, dtype=np.float64)
+    return jd_ut + delta_t(jd_ut)
+
+
+def tt_to_ut(jd_tt):
+    """JD TT -> JD UT (iteración de punto fijo sobre ΔT)"""
+    jd_tt = np.asarray(jd_tt, dtype=np.float64)
+    jd_ut = jd_tt - delta_t(jd_tt)
+    for _ in range(TT_ITERATIONS - 1):
+        jd_ut = jd_tt - delta_t(jd_ut)
+    return jd_ut
+
+
+def main():
+    """Ida y vuelta de un año de muestras por minuto y comparación con swe.julday"""
+    import time
+
+    print("🕰️  CAPA DE TIEMPO POR LOTES")
+    print("=" * 60)
+    minutes = np.arange('2025-01-01T00:00', '2026-01-01T00:00', dtype='datetime64[m]').astype('datetime64[us]')
+    minutes = minutes + np.random.default_rng(0).integers(0, 60_000_000, minutes.size).astype('timedelta64[us]')
+
+    start = time.perf_counter()
+    jd1, jd2 = datetime64_to_jd2(minutes)
+    back = jd2_to_datetime64(jd1, jd2, 'us')
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{minutes.size} instantes (µs) → JD en dos partes → datetime64: {elapsed:.1f} ms, "
+          f"exactos: {bool((back == minutes).all())}")
+
+    jds = datetime64_to_jd(minutes)
+    milliseconds = minutes.astype('datetime64[ms]')
+    back = jd_to_datetime64(datetime64_to_jd(milliseconds), 'ms')
+    print(f"Instantes (ms) → JD float64 → datetime64[ms]: exactos: {bool((back == milliseconds).all())}")
+
+    sample = minutes[::1000].astype(datetime)
+    reference = np.array([swe.julday(moment.year, moment.month, moment.day,
+                                     moment.hour + moment.minute / 60 + (moment.second + moment.microsecond / 1e6) / 3600)
+                          for moment in sample])
+    print(f"Diferencia con swe.julday: {np.abs(jds[::1000] - reference).max() * SECONDS_PER_DAY * 1e6:.1f} µs")
+
+    start = time.perf_counter()
+    tt = ut_to_tt(jds)
+    ut = tt_to_ut(tt)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"UT → TT → UT: {elapsed:.1f} ms, ΔT {np.mean(tt - jds) * SECONDS_PER_DAY:.2f} s, "
+          f"error máximo {np.abs(ut - jds).max() * SECONDS_PER_DAY * 1e6:.3f} µs")
+
+
+if __name__ == "__main__":
+    main()
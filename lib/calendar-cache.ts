@@ -79,6 +79,39 @@ export async function getCalendarCache(userId: string, year: number) {
   }
 }
 
+/**
+ * Obtiene los eventos precalculados por personal_calendar_precompute.py
+ * (Luna progresada y tránsitos a la carta natal) para un usuario y año.
+ * No es el calendario completo: sirve para no hacer esperar la primera vista.
+ */
+export async function getPrecomputedEvents(userId: string, year: number) {
+  try {
+    const precomputed = await prisma.precomputedEventsCache.findUnique({
+      where: {
+        userId_year: {
+          userId,
+          year,
+        },
+      },
+    });
+
+    if (!precomputed || precomputed.expiresAt < new Date()) {
+      return null;
+    }
+
+    console.log(`📦 Eventos precalculados: usuario ${userId}, año ${year}`);
+
+    return {
+      events: JSON.parse(precomputed.events),
+      calculatedAt: precomputed.calculatedAt,
+      expiresAt: precomputed.expiresAt,
+    };
+  } catch (error) {
+    console.error('Error obteniendo eventos precalculados:', error);
+    return null;
+  }
+}
+
 /**
  * Guarda el cache del calendario personal para un usuario y año específico
  */
@@ -139,6 +172,12 @@ export async function invalidateCalendarCache(userId: string, year?: number) {
           },
         },
       });
+      await prisma.precomputedEventsCache.deleteMany({
+        where: {
+          userId,
+          year,
+        },
+      });
       console.log(`🗑️ Cache invalidado: usuario ${userId}, año ${year}`);
     } else {
       // Invalidar todos los años del usuario
@@ -147,6 +186,11 @@ export async function invalidateCalendarCache(userId: string, year?: number) {
           userId,
         },
       });
+      await prisma.precomputedEventsCache.deleteMany({
+        where: {
+          userId,
+        },
+      });
       console.log(`🗑️ Cache invalidado: usuario ${userId}, todos los años`);
     }
     
@@ -169,9 +213,16 @@ export async function cleanExpiredCache() {
         },
       },
     });
+    const precomputed = await prisma.precomputedEventsCache.deleteMany({
+      where: {
+        expiresAt: {
+          lt: new Date(),
+        },
+      },
+    });
     
-    console.log(`🧹 Caches expirados eliminados: ${result.count}`);
-    return result.count;
+    console.log(`🧹 Caches expirados eliminados: ${result.count} (+${precomputed.count} precalculados)`);
+    return result.count + precomputed.count;
   } catch (error) {
     console.error('Error limpiando caches expirados:', error);
     return 0;
@@ -38,6 +38,8 @@ interface PersonalCalendarResponse {
   progressed_moon_count: number;
   profections_count: number;
   from_cache?: boolean;
+  // Sólo Luna progresada y tránsitos (precálculo nocturno); el calendario completo se calcula en segundo plano
+  precomputed?: boolean;
   calculated_at?: Date;
   expires_at?: Date;
 }
@@ -79,7 +81,9 @@ export async function fetchPersonalCalendar(
     const data: PersonalCalendarResponse = await response.json();
 
     // Log de resultado
-    if (data.from_cache) {
+    if (data.precomputed) {
+      console.log(`📦 Calendario PRECALCULADO (${data.events.length} eventos, completo en segundo plano)`);
+    } else if (data.from_cache) {
       console.log(`⚡ Calendario cargado desde CACHE (${data.events.length} eventos)`);
     } else {
       console.log(`🔄 Calendario CALCULADO (${data.events.length} eventos en ${data.calculation_time.toFixed(2)}s)`);
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Cálculo de cartas natales en lote con un pool de procesos.
+
+Reparte un iterable de `datos_usuario` (mismo formato que calcular_carta_natal)
+entre varios procesos. Cada worker importa el módulo de cálculo y configura
+Immanuel y los archivos de efemérides una sola vez al arrancar.
+
+- Los resultados se devuelven en el mismo orden en que se enviaron, a medida
+  que van estando listos (no hace falta esperar a todo el lote).
+- Un error en una carta se informa en su resultado y no aborta el lote.
+- La cantidad de cartas en vuelo está acotada, así se puede recorrer toda la
+  base de usuarios sin cargarla entera en memoria.
+
+Uso:
+    for item in calcular_cartas_natales(usuarios, workers=8):
+        if item.error:
+            print(f"❌ {item.index}: {item.error}")
+        else:
+            guardar(item.result)
+"""
+
+import importlib
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# Módulo que provee calcular_carta_natal en los workers
+DEFAULT_MODULE = 'natal_chart_proposed'
+
+# Cartas en vuelo por worker (acota memoria y mantiene el pool ocupado)
+PENDING_PER_WORKER = 4
+
+# Estado por proceso, inicializado una sola vez por worker
+_worker_calcular = None
+
+
+@dataclass
+class BatchResult:
+    """Resultado de una carta del lote."""
+    index: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def _init_worker(module_name, ephemeris_path):
+    """Inicializa Immanuel y el módulo de cálculo una vez por proceso"""
+    global _worker_calcular
+
+    if ephemeris_path:
+        from immanuel import setup
+        setup.set_filepath(ephemeris_path)
+
+    module = importlib.import_module(module_name)
+    _worker_calcular = module.calcular_carta_natal
+
+
+def _calcular_en_worker(index, datos_usuario, draconica):
+    """Calcula una carta capturando el error para no abortar el lote"""
+    try:
+        return BatchResult(index, result=_worker_calcular(datos_usuario, draconica=draconica))
+    except Exception as e:
+        return BatchResult(index, error=f"{type(e).__name__}: {e}")
+
+
+def calcular_cartas_natales(datos_usuarios, draconica=False, workers=None,
+                            module_name=DEFAULT_MODULE, ephemeris_path=None):
+    """
+    Calcula cartas natales en paralelo.
+
+    Args:
+        datos_usuarios: iterable de dicts con el formato de calcular_carta_natal
+        draconica: calcular cartas dracónicas
+        workers: cantidad de procesos (por defecto, uno por CPU)
+        module_name: módulo que provee calcular_carta_natal
+        ephemeris_path: ruta de archivos de efemérides (opcional)
+
+    Yields:
+        BatchResult en el mismo orden de entrada
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * PENDING_PER_WORKER
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(module_name, ephemeris_path)
+    ) as executor:
+        pending = deque()
+        for index, datos_usuario in enumerate(datos_usuarios):
+            pending.append(executor.submit(_calcular_en_worker, index, datos_usuario, draconica))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def calcular_cartas_natales_serial(datos_usuarios, draconica=False, module_name=DEFAULT_MODULE):
+    """Versión en serie con la misma interfaz (referencia para benchmarks)"""
+    _init_worker(module_name, None)
+    for index, datos_usuario in enumerate(datos_usuarios):
+        yield _calcular_en_worker(index, datos_usuario, draconica)
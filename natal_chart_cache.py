@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Cache de cartas natales direccionado por contenido.
+
+calcular_carta_natal es una función pura de (hora_local, lat, lon, draconica)
+y de la configuración de Immanuel (objetos y orbes). Este cache guarda el
+resultado bajo un hash normalizado de esas entradas más la huella de la
+configuración, en dos niveles:
+
+1. LRU en memoria del proceso, con tamaño máximo. Guarda el JSON compacto:
+   decodificarlo es más barato que copiar el dict anidado y cada llamador
+   recibe su propia copia.
+2. SQLite en disco, con el mismo JSON comprimido (zlib).
+
+Si cambia la lista de objetos o los orbes del perfil, cambia la huella y
+las entradas anteriores dejan de coincidir (purge_stale las elimina del
+disco). Las estadísticas de aciertos y fallos se llevan por nivel.
+
+Uso:
+    cache = NatalChartCache(calcular_carta_natal, profile=NATAL_PROFILE,
+                            db_path='data/cartas/natal_cache.sqlite')
+    carta = cache.get(datos_usuario, draconica=False)
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+
+DEFAULT_MAX_ENTRIES = 2048
+
+# Versión del formato de resultado: subirla invalida todo el cache
+RESULT_VERSION = 1
+
+# Campos del resultado que sólo repiten datos de la solicitud (no forman parte de la clave)
+_ECHO_FIELDS = ('fecha_hora_natal', 'hora_local')
+
+
+def settings_fingerprint(profile=None, extra=None):
+    """
+    Huella de la configuración de cálculo: objetos, aspectos/orbes y demás
+    valores del perfil, más la versión del formato de resultado.
+    """
+    values = dict(profile.values) if profile is not None else {}
+    if extra:
+        values.update(extra)
+    payload = json.dumps({'version': RESULT_VERSION, 'settings': values},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def default_profile(calcular):
+    """
+    Perfil que aplica `calcular` cuando no se le pasa uno: el NATAL_PROFILE
+    de su módulo (natal_chart_proposed, natal_chart_corrected).
+    """
+    module = sys.modules.get(getattr(calcular, '__module__', None))
+    profile = getattr(module, 'NATAL_PROFILE', None)
+    if profile is None:
+        raise ValueError(f"{getattr(calcular, '__name__', calcular)!r} no define NATAL_PROFILE: "
+                         "pasar profile explícito para que la huella refleje la configuración")
+    return profile
+
+
+def chart_key(datos_usuario, draconica, fingerprint):
+    """Clave normalizada: el mismo instante y lugar siempre produce la misma clave"""
+    hora_local = datetime.fromisoformat(datos_usuario['hora_local']).isoformat()
+    payload = '|'.join((
+        hora_local,
+        f"{float(datos_usuario['lat']):.6f}",
+        f"{float(datos_usuario['lon']):.6f}",
+        '1' if draconica else '0',
+        fingerprint,
+    ))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class NatalChartCache:
+    """Cache de dos niveles (LRU en memoria + SQLite) para calcular_carta_natal."""
+
+    def __init__(self, calcular, profile=None, max_entries=DEFAULT_MAX_ENTRIES,
+                 db_path=None, fingerprint_extra=None):
+        self.calcular = calcular
+        self.profile = profile
+        self.max_entries = max_entries
+        # Sin perfil explícito la huella usa el perfil por defecto de calcular,
+        # así un cambio de objetos u orbes invalida también ese camino
+        self.fingerprint = settings_fingerprint(profile or default_profile(calcular), fingerprint_extra)
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS natal_charts ("
+                " key TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL,"
+                " payload BLOB NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS natal_charts_fingerprint ON natal_charts (fingerprint)")
+            self._db.commit()
+
+    def get(self, datos_usuario, draconica=False):
+        """Devuelve la carta desde el cache o la calcula y la guarda"""
+        key = chart_key(datos_usuario, draconica, self.fingerprint)
+
+        encoded = self._memory_get(key)
+        if encoded is not None:
+            self.stats['memory_hits'] += 1
+            return self._for_request(encoded, datos_usuario)
+
+        encoded = self._disk_get(key)
+        if encoded is not None:
+            self.stats['disk_hits'] += 1
+            self._memory_put(key, encoded)
+            return self._for_request(encoded, datos_usuario)
+
+        self.stats['misses'] += 1
+        if self.profile is not None:
+            chart = self.calcular(datos_usuario, draconica=draconica, profile=self.profile)
+        else:
+            chart = self.calcular(datos_usuario, draconica=draconica)
+
+        # Se guarda sin los campos que sólo repiten la solicitud
+        stored = {k: v for k, v in chart.items() if k not in _ECHO_FIELDS and k != 'location'}
+        encoded = json.dumps(stored, ensure_ascii=False, separators=(',', ':'))
+        self._memory_put(key, encoded)
+        self._disk_put(key, encoded)
+        return chart
+
+    def hit_rate(self):
+        total = sum(self.stats.values())
+        return (self.stats['memory_hits'] + self.stats['disk_hits']) / total if total else 0.0
+
+    def purge_stale(self):
+        """Elimina del disco las cartas calculadas con otra configuración"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM natal_charts WHERE fingerprint != ?", (self.fingerprint,))
+            self._db.commit()
+        return cursor.rowcount
+
+    def clear(self):
+        """Vacía ambos niveles"""
+        with self._lock:
+            self._lru.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM natal_charts")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _for_request(self, encoded, datos_usuario):
+        """Resultado decodificado con los datos que repiten la solicitud (lugar, zona, fechas)"""
+        result = json.loads(encoded)
+        result['location'] = {
+            'latitude': datos_usuario['lat'],
+            'longitude': datos_usuario['lon'],
+            'name': datos_usuario.get('lugar', 'Unknown'),
+            'timezone': datos_usuario['zona_horaria']
+        }
+        result['fecha_hora_natal'] = datos_usuario.get('fecha_hora_natal', '')
+        result['hora_local'] = datos_usuario['hora_local']
+        return result
+
+    def _memory_get(self, key):
+        with self._lock:
+            encoded = self._lru.get(key)
+            if encoded is not None:
+                self._lru.move_to_end(key)
+            return encoded
+
+    def _memory_put(self, key, encoded):
+        with self._lock:
+            self._lru[key] = encoded
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM natal_charts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def _disk_put(self, key, encoded):
+        if self._db is None:
+            return
+        payload = zlib.compress(encoded.encode('utf-8'))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO natal_charts (key, fingerprint, payload, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, self.fingerprint, payload, time.time()))
+            self._db.commit()
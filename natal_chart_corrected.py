@@ -15,31 +15,39 @@ from datetime import datetime
 from typing import Dict, Any
 from zoneinfo import ZoneInfo
 import immanuel.charts as charts
+from immanuel import setup
 from immanuel.const import chart
-from immanuel.setup import settings
+from chart_profiles import ChartProfile, install, use_profile
 
-# ✅ CONFIGURACIÓN CORRECTA DE IMMANUEL
-settings.objects = [
-    # Planetas
-    chart.SUN, chart.MOON, chart.MERCURY, chart.VENUS, chart.MARS,
-    chart.JUPITER, chart.SATURN, chart.URANUS, chart.NEPTUNE, chart.PLUTO,
-    # Ángulos
-    chart.ASC, chart.MC,
-    # Puntos especiales
-    chart.TRUE_NORTH_NODE, chart.LILITH, chart.CHIRON,
-    chart.PART_OF_FORTUNE, chart.VERTEX
-]
+# Perfiles por llamada sobre Immanuel
+install(setup)
 
-# Configurar aspectos con orbes ajustados
-settings.aspects = {
-    0: 8,     # Conjunción con orbe de 8°
-    60: 6,    # Sextil con orbe de 6°
-    90: 8,    # Cuadratura con orbe de 8°
-    120: 8,   # Trígono con orbe de 8°
-    180: 8    # Oposición con orbe de 8°
-}
+# ✅ CONFIGURACIÓN CORRECTA DE IMMANUEL
+# Se aplica por llamada (contextvars) en lugar de modificar settings global,
+# así un mismo proceso puede calcular en paralelo cartas con otra configuración.
+NATAL_PROFILE = ChartProfile(
+    'natal',
+    objects=[
+        # Planetas
+        chart.SUN, chart.MOON, chart.MERCURY, chart.VENUS, chart.MARS,
+        chart.JUPITER, chart.SATURN, chart.URANUS, chart.NEPTUNE, chart.PLUTO,
+        # Ángulos
+        chart.ASC, chart.MC,
+        # Puntos especiales
+        chart.TRUE_NORTH_NODE, chart.LILITH, chart.CHIRON,
+        chart.PART_OF_FORTUNE, chart.VERTEX
+    ],
+    # Configurar aspectos con orbes ajustados
+    aspects={
+        0: 8,     # Conjunción con orbe de 8°
+        60: 6,    # Sextil con orbe de 6°
+        90: 8,    # Cuadratura con orbe de 8°
+        120: 8,   # Trígono con orbe de 8°
+        180: 8    # Oposición con orbe de 8°
+    }
+)
 
-def calcular_carta_natal(datos_usuario: Dict[str, Any], draconica=False) -> Dict[str, Any]:
+def calcular_carta_natal(datos_usuario: Dict[str, Any], draconica=False, profile=None) -> Dict[str, Any]:
     """
     IMPLEMENTACIÓN CORREGIDA - COMPATIBLE
     
@@ -51,6 +59,7 @@ def calcular_carta_natal(datos_usuario: Dict[str, Any], draconica=False) -> Dict
     5. ✅ Manejo de errores mejorado
     6. ✅ Compatibilidad con cartas dracónicas
     7. ✅ API compatible con immanuel versión actual
+    8. ✅ Configuración por llamada (profile, por defecto NATAL_PROFILE)
     """
     try:
         # Usar coordenadas directamente
@@ -67,17 +76,19 @@ def calcular_carta_natal(datos_usuario: Dict[str, Any], draconica=False) -> Dict
             longitude=longitude
         )
         
-        # ✅ CORRECCIÓN 3: Calcular carta natal o dracónica según corresponda
-        if draconica:
-            chart_obj = charts.DraconicChart(native)
-        else:
-            chart_obj = charts.Natal(native)
+        # ✅ CORRECCIÓN 3: Calcular carta natal o dracónica según corresponda,
+        # con el perfil de configuración aplicado sólo a esta llamada
+        with use_profile(profile or NATAL_PROFILE):
+            if draconica:
+                chart_obj = charts.DraconicChart(native)
+            else:
+                chart_obj = charts.Natal(native)
             
-        # ✅ CORRECCIÓN 4: Usar API compatible (objects y houses directamente)
-        raw_data = {
-            'objects': chart_obj.objects,
-            'houses': chart_obj.houses
-        }
+            # ✅ CORRECCIÓN 4: Usar API compatible (objects y houses directamente)
+            raw_data = {
+                'objects': chart_obj.objects,
+                'houses': chart_obj.houses
+            }
         
         # ✅ CORRECCIÓN 5: Estructura de datos robusta
         result = {
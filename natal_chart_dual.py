@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Carta tropical, dracónica y cruzada con una sola pasada de efemérides.
+
+La carta dracónica es la tropical rotada: todas las longitudes (planetas,
+puntos, ángulos y cúspides) se desplazan para que el Nodo Norte natal quede
+en 0° Aries. Calcularla con charts.DraconicChart vuelve a correr todas las
+efemérides; el front-end además pide la tropical, la dracónica y la cruzada
+(app/api/cartas/cruzada) del mismo nativo.
+
+calcular_cartas_dual calcula la carta tropical una vez y deriva:
+1. La dracónica por rotación (los aspectos internos no cambian). El
+   origen dracónico se mueve con el nodo: la velocidad de cada punto
+   dracónico es la tropical menos la del Nodo Norte.
+2. Los aspectos cruzados tropical vs dracónica (aspect_matrix).
+3. Las cúspides cruzadas: en qué casa tropical cae cada punto dracónico y
+   en qué casa dracónica cae cada punto tropical.
+
+Uso:
+    cartas = calcular_cartas_dual(datos_usuario)
+    cartas['tropical'], cartas['draconica'], cartas['cruzada']
+"""
+
+import numpy as np
+
+from aspect_matrix import DEFAULT_ORBS, find_cross_aspects
+from natal_chart_proposed import NATAL_PROFILE, calcular_registros_carta_natal, datos_solicitud
+
+# Punto que define el 0° Aries dracónico
+NORTH_NODE = 'True North Node'
+
+
+def house_positions(longitudes, cusps):
+    """
+    Casa (1-12) en la que cae cada longitud, dadas las 12 cúspides en orden.
+    Vectorizado: las longitudes y cúspides se miden desde la cúspide 1.
+    """
+    cusps = np.asarray(cusps, dtype=float)
+    relative_cusps = (cusps - cusps[0]) % 360.0
+    relative = (np.asarray(longitudes, dtype=float) - cusps[0]) % 360.0
+    return np.searchsorted(relative_cusps, relative, side='right')
+
+
+def _profile_orbs(profile):
+    """Orbes de aspecto del perfil (dict ángulo -> orbe o lista de ángulos) o los por defecto"""
+    aspects = profile.values.get('aspects')
+    return DEFAULT_ORBS if aspects is None else aspects
+
+
+def cruzar_cartas(tropical, draconica, orbs=DEFAULT_ORBS):
+    """
+    Aspectos y casas cruzadas entre dos ChartRecords (tropical y dracónica).
+    point1 es siempre el punto tropical y point2 el dracónico.
+    """
+    names = [record.name for record in tropical.points]
+    tropical_longitudes = np.array([record.longitude for record in tropical.points])
+    draconic_longitudes = np.array([record.longitude for record in draconica.points])
+    tropical_speeds = np.array([record.speed for record in tropical.points])
+    draconic_speeds = np.array([record.speed for record in draconica.points])
+
+    table = find_cross_aspects(tropical_longitudes, draconic_longitudes, tropical_speeds, draconic_speeds,
+                               orbs=orbs)
+    aspects = table.to_list(names)
+    for aspect in aspects:
+        del aspect['chart']
+
+    tropical_cusps = [record.longitude for record in sorted(tropical.houses, key=lambda r: r.number)]
+    draconic_cusps = [record.longitude for record in sorted(draconica.houses, key=lambda r: r.number)]
+    return {
+        'aspects': aspects,
+        'houses': {
+            'draconica_en_tropical': dict(zip(names, house_positions(draconic_longitudes, tropical_cusps).tolist())),
+            'tropical_en_draconica': dict(zip(names, house_positions(tropical_longitudes, draconic_cusps).tolist()))
+        }
+    }
+
+
+def calcular_cartas_dual(datos_usuario: dict, profile=None) -> dict:
+    """
+    Carta tropical, dracónica y cruzada del mismo nativo con una sola pasada
+    de efemérides.
+
+    Returns:
+        {
+            'tropical': resultado de calcular_carta_natal,
+            'draconica': resultado de calcular_carta_natal(draconica=True),
+            'cruzada': {'aspects': [...], 'houses': {...}},
+            'node_longitude': longitud tropical del Nodo Norte
+        }
+    """
+    try:
+        profile = profile or NATAL_PROFILE
+        tropical = calcular_registros_carta_natal(datos_usuario, profile=profile)
+
+        node = tropical.point(NORTH_NODE)
+        if node is None:
+            raise ValueError(f"El perfil '{profile.name}' no incluye el {NORTH_NODE}")
+        draconica = tropical.rotated(node.longitude, node.speed)
+
+        return {
+            'tropical': tropical.to_dict(datos_solicitud(datos_usuario)),
+            'draconica': draconica.to_dict(datos_solicitud(datos_usuario)),
+            'cruzada': cruzar_cartas(tropical, draconica, _profile_orbs(profile)),
+            'node_longitude': node.longitude
+        }
+
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        print(f"Error detallado:\n{error_details}")
+        raise ValueError(f"Error calculando cartas tropical/dracónica: {str(e)}")
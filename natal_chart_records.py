@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Capa de extracción para el resultado de calcular_carta_natal.
+
+Los bucles de objetos, casas y aspectos hacían entre dos y cuatro hasattr
+por campo y reconstruían la lista de signos y el mapeo de aspectos en cada
+vuelta. Aquí:
+
+1. Una función por tipo (point_record, house_record, aspect_record) lee
+   cada campo con getattr y su valor por defecto, sin hasattr repetidos.
+2. Los datos se vuelcan en registros con __slots__ (PointRecord,
+   HouseRecord, AspectRecord).
+3. ChartRecords genera el dict de siempre (to_dict), JSON compacto
+   (to_json, usa orjson si está instalado) o un binario compacto (to_bytes).
+
+La ganancia está en los registros y en las salidas compactas. El dict de
+siempre (calcular_carta_natal) queda a la par de los bucles originales: la
+mayor parte del tiempo es leer los campos formateados de los aspectos de
+Immanuel, que los dos caminos tienen que leer igual
+(benchmark_natal_chart_serialization.py).
+"""
+
+import json
+import struct
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Constantes que antes se recreaban dentro de los bucles
+SIGNOS = ('Aries', 'Tauro', 'Géminis', 'Cáncer', 'Leo', 'Virgo',
+          'Libra', 'Escorpio', 'Sagitario', 'Capricornio', 'Acuario', 'Piscis')
+
+ASPECTOS_ES = {
+    'Conjunction': 'Conjunción',
+    'Sextile': 'Sextil',
+    'Square': 'Cuadratura',
+    'Trine': 'Trígono',
+    'Opposition': 'Oposición'
+}
+
+ASPECT_ORDER = {
+    'Conjunción': 1,
+    'Oposición': 2,
+    'Cuadratura': 3,
+    'Trígono': 4,
+    'Sextil': 5
+}
+
+# Nombres de signo tal como los devuelve Immanuel (obj.sign.name)
+SIGN_NAMES = ('Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+              'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces')
+
+ANGLE_OPPOSITES = {'Asc': 'Dsc', 'MC': 'Ic'}
+
+# Códigos del formato binario
+_ASPECT_CODES = {name: code for code, name in enumerate(ASPECT_ORDER)}
+_ASPECT_NAMES = {code: name for name, code in _ASPECT_CODES.items()}
+BINARY_MAGIC = b'CNB1'
+
+
+# ---------------------------------------------------------------------------
+# Registros
+# ---------------------------------------------------------------------------
+
+class PointRecord:
+    __slots__ = ('name', 'longitude', 'latitude', 'distance', 'sign', 'degrees', 'retrograde', 'speed')
+
+    def __init__(self, name, longitude, latitude, distance, sign, degrees, retrograde, speed=0.0):
+        self.name = name
+        self.longitude = longitude
+        self.latitude = latitude
+        self.distance = distance
+        self.sign = sign
+        self.degrees = degrees
+        self.retrograde = retrograde
+        # Velocidad en °/día (no forma parte del dict de salida; la usan los motores de aspectos)
+        self.speed = speed
+
+    def rotated(self, offset, speed_offset=0.0):
+        """
+        Copia con la longitud desplazada `offset` grados (signo y grados
+        recalculados). Si el origen se mueve (el Nodo Norte en la dracónica),
+        `speed_offset` es su velocidad y se descuenta de la del punto.
+        """
+        longitude = (self.longitude - offset) % 360
+        return PointRecord(self.name, longitude, self.latitude, self.distance,
+                           SIGN_NAMES[int(longitude // 30)], longitude % 30, self.retrograde,
+                           self.speed - speed_offset)
+
+    def to_dict(self):
+        return {
+            'longitude': self.longitude,
+            'latitude': self.latitude,
+            'distance': self.distance,
+            'sign': self.sign,
+            'degrees': self.degrees,
+            'retrograde': self.retrograde
+        }
+
+
+class HouseRecord:
+    __slots__ = ('number', 'longitude', 'sign', 'degrees')
+
+    def __init__(self, number, longitude, sign, degrees):
+        self.number = number
+        self.longitude = longitude
+        self.sign = sign
+        self.degrees = degrees
+
+    def to_dict(self):
+        return {'longitude': self.longitude, 'sign': self.sign, 'degrees': self.degrees}
+
+    def rotated(self, offset):
+        """Copia con la cúspide desplazada `offset` grados"""
+        longitude = (self.longitude - offset) % 360
+        return HouseRecord(self.number, longitude, SIGN_NAMES[int(longitude // 30)], longitude % 30)
+
+
+class AspectRecord:
+    __slots__ = ('point1', 'point2', 'aspect', 'difference', 'movement', 'condition')
+
+    def __init__(self, point1, point2, difference, movement, condition, aspect):
+        self.point1 = point1
+        self.point2 = point2
+        self.aspect = aspect
+        # Sub-dicts con las claves de la salida (raw/formatted..., applicative..., associate...)
+        self.difference = difference
+        self.movement = movement
+        self.condition = condition
+
+    def to_dict(self):
+        return {
+            'point1': self.point1,
+            'point2': self.point2,
+            'aspect': self.aspect,
+            'difference': self.difference.copy(),
+            'movement': self.movement.copy(),
+            'condition': self.condition.copy()
+        }
+
+
+# ---------------------------------------------------------------------------
+# Extracción
+# ---------------------------------------------------------------------------
+
+def _raw(value):
+    """Valor numérico de un campo de Immanuel (`.raw` si lo tiene)"""
+    return getattr(value, 'raw', value)
+
+
+def point_record(obj):
+    """PointRecord de un objeto de Immanuel (el Vertex, p. ej., no tiene latitud)"""
+    return PointRecord(
+        obj.name,
+        _raw(obj.longitude),
+        _raw(getattr(obj, 'latitude', 0.0)),
+        _raw(getattr(obj, 'distance', 0.0)),
+        obj.sign.name,
+        _raw(obj.sign_longitude),
+        getattr(getattr(obj, 'movement', None), 'retrograde', False),
+        getattr(obj, 'speed', 0.0)
+    )
+
+
+def house_record(house):
+    """HouseRecord de una cúspide de Immanuel"""
+    return HouseRecord(house.number, _raw(house.longitude), house.sign.name, _raw(house.sign_longitude))
+
+
+def aspect_record(aspect, asp_type):
+    """AspectRecord de un aspecto de Immanuel con el nombre del aspecto ya traducido"""
+    difference, movement, condition = aspect.difference, aspect.movement, aspect.condition
+    return AspectRecord(
+        aspect._active_name,
+        aspect._passive_name,
+        {
+            'raw': _raw(difference),
+            'formatted': getattr(difference, 'formatted', None),
+            'direction': getattr(difference, 'direction', None),
+            'degrees': getattr(difference, 'degrees', None),
+            'minutes': getattr(difference, 'minutes', None),
+            'seconds': getattr(difference, 'seconds', None)
+        },
+        {
+            'applicative': getattr(movement, 'applicative', False),
+            'exact': getattr(movement, 'exact', False),
+            'separative': getattr(movement, 'separative', False),
+            'formatted': getattr(movement, 'formatted', None)
+        },
+        {
+            'associate': getattr(condition, 'associate', False),
+            'dissociate': getattr(condition, 'dissociate', False),
+            'formatted': getattr(condition, 'formatted', None)
+        },
+        asp_type
+    )
+
+
+def extract_points(objects):
+    """Registros de puntos y de los ángulos (Asc/MC) desde los objetos de Immanuel"""
+    points = []
+    angles = []
+    for obj in objects.values():
+        record = point_record(obj)
+        points.append(record)
+        if record.name in ANGLE_OPPOSITES:
+            angles.append(record)
+    return points, angles
+
+
+def extract_houses(houses):
+    """Registros de cúspides de casas"""
+    return [house_record(house) for house in houses.values()]
+
+
+def extract_aspects(aspects):
+    """Registros de aspectos, sin duplicados y ordenados por importancia"""
+    records = []
+    seen = set()
+    for aspects_dict in aspects.values():
+        for aspect in aspects_dict.values():
+            active, passive, aspect_type = aspect._active_name, aspect._passive_name, aspect.type
+            aspect_key = (active, passive, aspect_type) if active <= passive else (passive, active, aspect_type)
+            if aspect_key in seen:
+                continue
+            seen.add(aspect_key)
+
+            asp_type = ASPECTOS_ES.get(aspect_type)
+            if asp_type is None:
+                continue
+            records.append(aspect_record(aspect, asp_type))
+
+    records.sort(key=lambda record: (ASPECT_ORDER[record.aspect], record.point1, record.point2))
+    return records
+
+
+class ChartRecords:
+    """Resultado extraído de una carta, con varios formatos de salida."""
+    __slots__ = ('points', 'angles', 'houses', 'aspects')
+
+    def __init__(self, points, angles, houses, aspects):
+        self.points = points
+        self.angles = angles
+        self.houses = houses
+        self.aspects = aspects
+
+    @classmethod
+    def from_raw(cls, raw_data):
+        """Extrae desde el dict de Immanuel ('objects', 'houses', 'aspects')"""
+        points, angles = extract_points(raw_data.get('objects', {}))
+        return cls(
+            points,
+            angles,
+            extract_houses(raw_data.get('houses', {})),
+            extract_aspects(raw_data.get('aspects', {})),
+        )
+
+    def point(self, name):
+        """Registro de un punto por nombre (None si la carta no lo tiene)"""
+        for record in self.points:
+            if record.name == name:
+                return record
+        return None
+
+    def rotated(self, offset, speed_offset=0.0):
+        """
+        Carta con todas las longitudes desplazadas `offset` grados (p. ej. la
+        dracónica: offset = longitud del Nodo Norte, speed_offset = su
+        velocidad). Los aspectos no cambian con una rotación y se comparten.
+        """
+        points = [record.rotated(offset, speed_offset) for record in self.points]
+        angles = [record for record in points if record.name in ANGLE_OPPOSITES]
+        houses = [record.rotated(offset) for record in self.houses]
+        return ChartRecords(points, angles, houses, self.aspects)
+
+    def to_dict(self, extra=None):
+        """
+        Dict con la forma de siempre de calcular_carta_natal (points, houses,
+        angles, aspects); `extra` agrega los campos de la solicitud (location...).
+        """
+        result = {
+            'points': {record.name: record.to_dict() for record in self.points},
+            'houses': {str(record.number): record.to_dict() for record in self.houses},
+        }
+
+        angles = {}
+        for record in self.angles:
+            angles[record.name] = {
+                'longitude': record.longitude,
+                'sign': record.sign,
+                'degrees': record.degrees
+            }
+            # Agregar puntos opuestos (DSC y IC)
+            opposite_longitude = (record.longitude + 180) % 360
+            angles[ANGLE_OPPOSITES[record.name]] = {
+                'longitude': opposite_longitude,
+                'sign': SIGNOS[int(opposite_longitude / 30)],
+                'degrees': opposite_longitude % 30
+            }
+        result['angles'] = angles
+        result['aspects'] = [record.to_dict() for record in self.aspects]
+        if extra:
+            result.update(extra)
+        return result
+
+    def to_json(self, extra=None):
+        """JSON compacto (bytes UTF-8); usa orjson si está disponible"""
+        data = self.to_dict(extra)
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def to_bytes(self):
+        """
+        Binario compacto (struct-of-records). Guarda longitudes, signos,
+        retrogradación, cúspides y aspectos (tipo, diferencia, movimiento y
+        condición codificados); omite los textos formateados, que se
+        derivan de esos valores.
+        """
+        names = {}
+        for record in self.points:
+            names.setdefault(record.name, len(names))
+        for record in self.aspects:
+            names.setdefault(record.point1, len(names))
+            names.setdefault(record.point2, len(names))
+        signs = {}
+        for record in self.points:
+            signs.setdefault(record.sign, len(signs))
+        for record in self.houses:
+            signs.setdefault(record.sign, len(signs))
+
+        chunks = [BINARY_MAGIC, struct.pack('<HHHHH', len(names), len(signs),
+                                            len(self.points), len(self.houses), len(self.aspects))]
+        for table in (names, signs):
+            for text in table:
+                encoded = text.encode('utf-8')
+                chunks.append(struct.pack('<B', len(encoded)) + encoded)
+        for record in self.points:
+            chunks.append(struct.pack('<HHddddB', names[record.name], signs[record.sign],
+                                      record.longitude, record.latitude or 0.0,
+                                      record.distance or 0.0, record.degrees, bool(record.retrograde)))
+        for record in self.houses:
+            chunks.append(struct.pack('<BHdd', record.number, signs[record.sign],
+                                      record.longitude, record.degrees))
+        for record in self.aspects:
+            movement, condition = record.movement, record.condition
+            flags = (movement['applicative'] | movement['exact'] << 1 | movement['separative'] << 2
+                     | condition['associate'] << 3 | condition['dissociate'] << 4)
+            chunks.append(struct.pack('<HHBdB', names[record.point1], names[record.point2],
+                                      _ASPECT_CODES[record.aspect], record.difference['raw'], flags))
+        return b''.join(chunks)
+
+
+def decode_bytes(blob):
+    """Decodifica el binario de ChartRecords.to_bytes a un dict liviano"""
+    if blob[:4] != BINARY_MAGIC:
+        raise ValueError("Binario de carta natal inválido")
+    offset = 4
+    name_count, sign_count, point_count, house_count, aspect_count = struct.unpack_from('<HHHHH', blob, offset)
+    offset += struct.calcsize('<HHHHH')
+
+    tables = []
+    for count in (name_count, sign_count):
+        table = []
+        for _ in range(count):
+            length = blob[offset]
+            table.append(blob[offset + 1:offset + 1 + length].decode('utf-8'))
+            offset += 1 + length
+        tables.append(table)
+    names, signs = tables
+
+    result = {'points': {}, 'houses': {}, 'aspects': []}
+    for _ in range(point_count):
+        name, sign, longitude, latitude, distance, degrees, retrograde = struct.unpack_from('<HHddddB', blob, offset)
+        offset += struct.calcsize('<HHddddB')
+        result['points'][names[name]] = {
+            'longitude': longitude, 'latitude': latitude, 'distance': distance,
+            'sign': signs[sign], 'degrees': degrees, 'retrograde': bool(retrograde)
+        }
+    for _ in range(house_count):
+        number, sign, longitude, degrees = struct.unpack_from('<BHdd', blob, offset)
+        offset += struct.calcsize('<BHdd')
+        result['houses'][str(number)] = {'longitude': longitude, 'sign': signs[sign], 'degrees': degrees}
+    for _ in range(aspect_count):
+        point1, point2, aspect, difference, flags = struct.unpack_from('<HHBdB', blob, offset)
+        offset += struct.calcsize('<HHBdB')
+        result['aspects'].append({
+            'point1': names[point1], 'point2': names[point2], 'aspect': _ASPECT_NAMES[aspect],
+            'difference': difference,
+            'applicative': bool(flags & 1), 'exact': bool(flags & 2), 'separative': bool(flags & 4),
+            'associate': bool(flags & 8), 'dissociate': bool(flags & 16)
+        })
+    return result
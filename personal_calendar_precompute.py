@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Precálculo nocturno de los calendarios personales.
+
+El calendario personal se calcula en forma síncrona la primera vez que un
+usuario abre un año (o después de limpiar su cache desde
+app/api/admin/users/[id]/calendar-cache): varios segundos de espera. Este
+worker recorre todos los usuarios con datos de nacimiento y deja calculado
+el año pedido (por defecto el siguiente) en la tabla PrecomputedEventsCache
+(userId, year, events como JSON, calculatedAt, expiresAt con el mismo TTL
+dinámico de lib/calendar-cache.ts).
+
+No escribe en PersonalCalendarCache: esa tabla guarda el calendario completo
+del microservicio (profecciones, fases lunares, 'Tránsito Casa Estado'...),
+que la ruta de calendario-personal devuelve y cuenta tal cual. Acá sólo se
+calculan la Luna progresada y los tránsitos a la carta natal; la ruta los
+sirve en la primera vista (getPrecomputedEvents en lib/calendar-cache.ts)
+mientras pide el calendario completo al microservicio en segundo plano.
+
+- Los usuarios se reparten en shards por hash del id; cada corrida puede
+  procesar todos los shards o sólo algunos (varias máquinas).
+- Dentro de un shard los usuarios se calculan en un pool de procesos.
+- Checkpoint en SQLite: cada fila escrita queda registrada con la huella de
+  sus entradas (datos natales, año, versión del cálculo). Una corrida
+  interrumpida retoma donde quedó, y los usuarios cuya huella no cambió se
+  saltean, salvo que su fila ya no exista en la base (cache limpiado o
+  vencido).
+- Eventos: Luna progresada (ProgressedMoonTimeline, una vez por nativo y
+  recortada por año) y tránsitos a la carta natal (transit_engine).
+- Con --coverage cada evento lleva 'interpretable' según la matriz de
+  interpretation_coverage, para no pedir interpretaciones que no existen.
+
+Uso:
+    python personal_calendar_precompute.py --users usuarios.json --year 2026
+    python personal_calendar_precompute.py --database-url $DATABASE_URL --shards 8 --only-shards 0,1
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from ephemeris_profiling import stage
+
+# Versión del cálculo: cambiarla invalida todas las huellas
+CALCULATION_VERSION = 2
+
+DEFAULT_SHARDS = 16
+DEFAULT_CHECKPOINT = 'data/calendario_personal_checkpoint.sqlite'
+DEFAULT_OUTPUT_DIR = 'data/calendario_personal'
+DEFAULT_TIMELINE_DIR = 'data/luna_progresada'
+
+# Hora por defecto si el usuario no conoce su hora de nacimiento
+DEFAULT_BIRTH_TIME = (12, 0)
+
+# Usuarios en vuelo por worker (acota memoria y mantiene el pool ocupado)
+PENDING_PER_WORKER = 4
+
+USERS_QUERY = (
+    'SELECT id, "birthDate", "birthHour", "birthMinute", "knowsBirthTime", '
+    '"birthLat", "birthLon", timezone, "birthCity" FROM "User" '
+    'WHERE "birthDate" IS NOT NULL AND "birthLat" IS NOT NULL AND "birthLon" IS NOT NULL '
+    'ORDER BY id'
+)
+
+UPSERT_QUERY = (
+    'INSERT INTO "PrecomputedEventsCache" '
+    '(id, "userId", year, events, "calculatedAt", "expiresAt", "updatedAt") '
+    'VALUES (%s, %s, %s, %s, %s, %s, %s) '
+    'ON CONFLICT ("userId", year) DO UPDATE SET events = EXCLUDED.events, '
+    '"calculatedAt" = EXCLUDED."calculatedAt", "expiresAt" = EXCLUDED."expiresAt", '
+    '"updatedAt" = EXCLUDED."updatedAt"'
+)
+
+# Estado por proceso, inicializado una sola vez por worker
+_worker_state = {}
+
+
+def dynamic_ttl(year, now=None):
+    """TTL de lib/calendar-cache.ts (calculateDynamicTTL)"""
+    now = now or datetime.now(timezone.utc)
+    if year > now.year:
+        end_of_year = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
+        return max(timedelta(days=1), min(end_of_year - now, timedelta(days=365)))
+    return timedelta(days=30)
+
+
+def user_to_datos(user):
+    """
+    datos_usuario (formato de calcular_carta_natal) desde una fila de User,
+    o None si faltan datos de nacimiento.
+    """
+    if not user.get('birthDate') or user.get('birthLat') is None or user.get('birthLon') is None:
+        return None
+
+    birth_date = user['birthDate']
+    if isinstance(birth_date, str):
+        birth_date = datetime.fromisoformat(birth_date.replace('Z', '+00:00'))
+    hour, minute = DEFAULT_BIRTH_TIME
+    if user.get('knowsBirthTime', True) and user.get('birthHour') is not None:
+        hour, minute = user['birthHour'], user.get('birthMinute') or 0
+
+    return {
+        'hora_local': f"{birth_date.strftime('%Y-%m-%d')}T{hour:02d}:{minute:02d}:00",
+        'lat': float(user['birthLat']),
+        'lon': float(user['birthLon']),
+        'zona_horaria': user.get('timezone') or 'UTC',
+        'lugar': user.get('birthCity') or ''
+    }
+
+
+def inputs_fingerprint(datos_usuario, year, coverage=None):
+    """Huella SHA-256 de todo lo que determina el calendario de un año"""
+    key = {'datos': datos_usuario, 'year': year, 'version': CALCULATION_VERSION}
+    if coverage:
+        # Las fuentes de la matriz de cobertura cambian las marcas 'interpretable'
+        key['coverage'] = coverage
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def shard_of(user_id, shards):
+    return int(hashlib.sha1(user_id.encode('utf-8')).hexdigest(), 16) % shards
+
+
+def load_users_json(path):
+    """Usuarios exportados como lista JSON de filas de User"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_users_postgres(database_url):
+    """Usuarios con datos de nacimiento desde la base (requiere psycopg2)"""
+    import psycopg2
+    import psycopg2.extras
+
+    with psycopg2.connect(database_url) as connection:
+        with connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute(USERS_QUERY)
+            return [dict(row) for row in cursor]
+
+
+def calcular_calendario(datos_usuario, year, timeline_dir=None, user_id=None):
+    """
+    Eventos del calendario personal de un año: Luna progresada y tránsitos
+    a la carta natal, ordenados por fecha.
+    """
+    from natal_chart_proposed import calcular_carta_natal
+    from progressed_moon import ProgressedNativeContext
+    from progressed_moon_timeline import ProgressedMoonTimeline, load_or_build_timeline
+    from transit_engine import PLANET_NAMES, calcular_transitos
+
+    with stage('carta'):
+        carta = calcular_carta_natal(datos_usuario)
+    birth_date = datetime.fromisoformat(datos_usuario['hora_local']).replace(
+        tzinfo=ZoneInfo(datos_usuario['zona_horaria']))
+
+    # Planetas natales (sin ángulos) y cúspides para la Luna progresada
+    planets = {name: carta['points'][name]['longitude'] for name in PLANET_NAMES.values()
+               if name in carta['points'] and name not in ('Asc', 'MC')}
+    cusps = [carta['houses'][str(number)]['longitude'] for number in range(1, 13)]
+
+    with stage('luna_progresada'):
+        context = ProgressedNativeContext(birth_date, datos_usuario['lat'], datos_usuario['lon'])
+        if timeline_dir and user_id:
+            timeline = load_or_build_timeline(context, os.path.join(timeline_dir, f'{user_id}.bin'), planets, cusps)
+        else:
+            timeline = ProgressedMoonTimeline.build(context, planets, cusps)
+        progressed_events = timeline.year(year)
+
+    with stage('transitos'):
+        transit_events = calcular_transitos(carta['points'], year)
+
+    events = progressed_events + transit_events
+    events.sort(key=lambda event: (event['fecha_utc'], event['hora_utc']))
+    return events
+
+
+def _init_worker(ephemeris_path, timeline_dir, coverage_path=None):
+    if ephemeris_path:
+        from immanuel import setup
+        setup.set_filepath(ephemeris_path)
+    if timeline_dir:
+        os.makedirs(timeline_dir, exist_ok=True)
+    _worker_state['timeline_dir'] = timeline_dir
+    if coverage_path:
+        from interpretation_coverage import CoverageMatrix
+        _worker_state['coverage'] = CoverageMatrix.load(coverage_path)
+
+
+def _calcular_en_worker(user_id, datos_usuario, year):
+    """Calcula un usuario capturando el error para no abortar el shard"""
+    try:
+        events = calcular_calendario(datos_usuario, year, _worker_state.get('timeline_dir'), user_id)
+        if 'coverage' in _worker_state:
+            _worker_state['coverage'].mark(events)
+        return user_id, events, None
+    except Exception as e:
+        return user_id, None, f"{type(e).__name__}: {e}"
+
+
+class Checkpoint:
+    """Registro en SQLite de las filas ya escritas y de la huella de sus entradas."""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS calendar_precompute ("
+            " user_id TEXT NOT NULL,"
+            " year INTEGER NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " calculated_at REAL NOT NULL,"
+            " PRIMARY KEY (user_id, year))"
+        )
+        self._db.commit()
+
+    def fingerprints(self, year):
+        rows = self._db.execute(
+            "SELECT user_id, fingerprint FROM calendar_precompute WHERE year = ?", (year,))
+        return dict(rows.fetchall())
+
+    def mark(self, user_id, year, fingerprint):
+        self._db.execute(
+            "INSERT OR REPLACE INTO calendar_precompute VALUES (?, ?, ?, ?)",
+            (user_id, year, fingerprint, time.time()))
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+class JsonlSink:
+    """
+    Filas de PrecomputedEventsCache en un archivo JSONL por shard (para
+    importar). Las filas se agregan al final; al abrir el año y al cerrar se
+    compactan los archivos para dejar una sola fila por (userId, year), la
+    última escrita.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self._touched = set()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _path(self, year, shard):
+        return os.path.join(self.output_dir, f"calendario_personal_{year}_shard{shard:03d}.jsonl")
+
+    @staticmethod
+    def _compact(path):
+        """Deja la última fila de cada usuario (escritura atómica); devuelve los userId"""
+        rows = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # línea cortada por una corrida interrumpida
+                rows.pop(row['userId'], None)
+                rows[row['userId']] = line if line.endswith('\n') else line + '\n'
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.writelines(rows.values())
+        os.replace(temporary, path)
+        return set(rows)
+
+    def existing(self, year):
+        """Usuarios con fila para el año en los archivos (compactados)"""
+        users = set()
+        prefix = f"calendario_personal_{year}_shard"
+        for name in sorted(os.listdir(self.output_dir)):
+            if name.startswith(prefix) and name.endswith('.jsonl'):
+                users |= self._compact(os.path.join(self.output_dir, name))
+        return users
+
+    def write(self, row, shard):
+        path = self._path(row['year'], shard)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self._touched.add(path)
+
+    def close(self):
+        for path in sorted(self._touched):
+            self._compact(path)
+        self._touched.clear()
+
+
+class PostgresSink:
+    """Upsert directo en la tabla PrecomputedEventsCache (requiere psycopg2)."""
+
+    def __init__(self, database_url):
+        import psycopg2
+        self._connection = psycopg2.connect(database_url)
+
+    def existing(self, year):
+        """Usuarios con fila vigente para el año (las limpiadas o vencidas se recalculan)"""
+        with self._connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT "userId" FROM "PrecomputedEventsCache" WHERE year = %s AND "expiresAt" > now()', (year,))
+            return {row[0] for row in cursor}
+
+    def write(self, row, shard):
+        now = datetime.now(timezone.utc)
+        with self._connection.cursor() as cursor:
+            cursor.execute(UPSERT_QUERY, (
+                f"c{uuid.uuid4().hex[:24]}", row['userId'], row['year'], row['events'],
+                row['calculatedAt'], row['expiresAt'], now))
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+
+def cache_row(user_id, year, events, now=None):
+    """Fila con la forma de PrecomputedEventsCache (events como string JSON)"""
+    now = now or datetime.now(timezone.utc)
+    return {
+        'userId': user_id,
+        'year': year,
+        'events': json.dumps(events, ensure_ascii=False),
+        'calculatedAt': now.isoformat(),
+        'expiresAt': (now + dynamic_ttl(year, now)).isoformat()
+    }
+
+
+def precalcular(users, year, sink, checkpoint, shards=DEFAULT_SHARDS, only_shards=None, workers=None,
+                timeline_dir=DEFAULT_TIMELINE_DIR, ephemeris_path=None, coverage_path=None):
+    """
+    Precalcula el año para todos los usuarios, shard por shard.
+
+    Yields:
+        (shard, user_id, estado) con estado 'ok', 'skip' o el mensaje de error
+    """
+    fingerprints = checkpoint.fingerprints(year)
+    existing = sink.existing(year)
+    coverage_sources = None
+    if coverage_path:
+        with open(coverage_path, encoding='utf-8') as f:
+            coverage_sources = json.load(f).get('sources')
+
+    by_shard = {}
+    for user in users:
+        datos_usuario = user_to_datos(user)
+        if datos_usuario is None:
+            continue
+        shard = shard_of(user['id'], shards)
+        if only_shards is None or shard in only_shards:
+            by_shard.setdefault(shard, []).append((user['id'], datos_usuario))
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * PENDING_PER_WORKER
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(ephemeris_path, timeline_dir, coverage_path)) as executor:
+        for shard in sorted(by_shard):
+            pending = deque()
+            user_fingerprints = {}
+
+            def finish(future):
+                user_id, events, error = future.result()
+                if error:
+                    return shard, user_id, error
+                sink.write(cache_row(user_id, year, events), shard)
+                checkpoint.mark(user_id, year, user_fingerprints[user_id])
+                return shard, user_id, 'ok'
+
+            for user_id, datos_usuario in by_shard[shard]:
+                fingerprint = inputs_fingerprint(datos_usuario, year, coverage_sources)
+                unchanged = fingerprints.get(user_id) == fingerprint
+                if unchanged and (existing is None or user_id in existing):
+                    yield shard, user_id, 'skip'
+                    continue
+
+                user_fingerprints[user_id] = fingerprint
+                pending.append(executor.submit(_calcular_en_worker, user_id, datos_usuario, year))
+                if len(pending) >= max_pending:
+                    yield finish(pending.popleft())
+
+            while pending:
+                yield finish(pending.popleft())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precálculo nocturno de calendarios personales")
+    parser.add_argument('--year', type=int, default=datetime.now(timezone.utc).year + 1)
+    parser.add_argument('--users', help="JSON exportado con las filas de User")
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'))
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help="JSONL por shard si no se escribe en la base")
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--timeline-dir', default=DEFAULT_TIMELINE_DIR)
+    parser.add_argument('--shards', type=int, default=DEFAULT_SHARDS)
+    parser.add_argument('--only-shards', help="Lista de shards separados por coma")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--coverage', help="Matriz de cobertura (interpretation_coverage) para marcar eventos")
+    args = parser.parse_args()
+
+    if args.users:
+        users = load_users_json(args.users)
+        sink = JsonlSink(args.output_dir)
+    elif args.database_url:
+        users = load_users_postgres(args.database_url)
+        sink = PostgresSink(args.database_url)
+    else:
+        parser.error("Indicar --users o --database-url (o DATABASE_URL)")
+
+    only_shards = None
+    if args.only_shards:
+        only_shards = {int(shard) for shard in args.only_shards.split(',')}
+
+    print(f"📅 Precálculo de calendarios personales {args.year}: {len(users)} usuarios, {args.shards} shards")
+    checkpoint = Checkpoint(args.checkpoint)
+    counts = {'ok': 0, 'skip': 0, 'error': 0}
+    start = time.perf_counter()
+    try:
+        for shard, user_id, status in precalcular(users, args.year, sink, checkpoint, args.shards,
+                                                  only_shards, args.workers, args.timeline_dir,
+                                                  coverage_path=args.coverage):
+            if status in counts:
+                counts[status] += 1
+            else:
+                counts['error'] += 1
+                print(f"  ❌ shard {shard} usuario {user_id}: {status}")
+    finally:
+        sink.close()
+        checkpoint.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Calculados: {counts['ok']} | Sin cambios: {counts['skip']} | Errores: {counts['error']} "
+          f"| {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Motor de búsqueda de aspectos de Luna progresada.
+
+Reemplaza el barrido día a día de find_conjunction_simple por un solver que:
+1. Muestrea la diferencia angular con signo (Luna progresada - punto natal)
+   en una grilla gruesa y detecta los cambios de signo.
+2. Refina cada cruce con el método de Brent hasta una tolerancia en tiempo.
+3. Calcula además los instantes de entrada y salida del orbe.
+
+La función de posición se recibe como parámetro (jd -> longitud), así el
+mismo solver sirve para cualquier método de progresión. Para el método
+ARMC 1 Naibod se usa ProgressedNativeContext, que precalcula una sola vez
+los datos natales de cada nativo.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import swisseph as swe
+from immanuel.const import chart, calc
+from immanuel.tools import ephemeris, date
+
+from julian_time import UNIX_EPOCH_JD, to_jd
+
+# Paso de la grilla gruesa: la Luna progresada avanza ~1° por mes, así que
+# entre dos muestras separadas 60 días recorre ~2°, muy lejos de los 180°
+# que harían ambiguo el cambio de signo.
+DEFAULT_GRID_STEP_DAYS = 60.0
+
+# Tolerancia por defecto del refinamiento: 1 minuto
+DEFAULT_TIME_TOLERANCE_DAYS = 1.0 / 1440.0
+
+# Tope de iteraciones del refinamiento (Brent converge en muchas menos)
+MAX_ITERATIONS = 60
+
+# Aspectos por defecto del barrido (ángulo -> nombre usado en los eventos)
+ASPECT_NAMES = {
+    0.0: 'Conjunción',
+    60.0: 'Sextil',
+    90.0: 'Cuadratura',
+    120.0: 'Trígono',
+    180.0: 'Oposición'
+}
+
+
+@dataclass
+class Crossing:
+    """Cruce exacto de la Luna progresada sobre una longitud objetivo."""
+    target: float
+    exact_jd: float
+    exact_utc: datetime
+    longitude: float
+    orb_entry_utc: datetime | None
+    orb_exit_utc: datetime | None
+    evaluations: int
+
+
+@dataclass
+class AspectHit:
+    """Aspecto exacto de la Luna progresada a un punto natal."""
+    point: str
+    point_longitude: float
+    aspect: float
+    aspect_name: str
+    crossing: Crossing
+
+
+def signed_difference(longitude, target):
+    """Diferencia angular con signo en el rango [-180, 180)"""
+    return (longitude - target + 180.0) % 360.0 - 180.0
+
+
+def jd_to_utc(jd):
+    """Convierte un día juliano (UT) a datetime UTC"""
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(days=jd - UNIX_EPOCH_JD)
+
+
+def utc_to_jd(moment):
+    """Convierte un datetime con zona horaria a día juliano (UT)"""
+    return moment.timestamp() / 86400.0 + UNIX_EPOCH_JD
+
+
+class ProgressedNativeContext:
+    """
+    Datos natales precalculados para la Luna progresada (ARMC 1 Naibod).
+
+    La fecha juliana natal, el ARMC natal y la conversión a UTC de la fecha
+    de nacimiento no cambian para un nativo: se calculan una vez al crear
+    el contexto y cada consulta sólo evalúa la parte progresada.
+    """
+
+    def __init__(self, birth_date, latitude, longitude, house_system=chart.PLACIDUS):
+        if birth_date.tzinfo is None:
+            raise ValueError("La fecha de nacimiento debe incluir zona horaria")
+
+        self.birth_date = birth_date
+        self.latitude = latitude
+        self.longitude = longitude
+        self.house_system = house_system
+
+        # Convertir fecha natal a UTC y a fecha juliana (una sola vez)
+        self.birth_date_utc = birth_date.astimezone(ZoneInfo("UTC"))
+        self.natal_jd = date.to_jd(self.birth_date_utc)
+
+        # ARMC natal (una sola vez)
+        self.natal_armc = ephemeris.angle(
+            index=chart.ARMC,
+            jd=self.natal_jd,
+            lat=latitude,
+            lon=longitude,
+            house_system=house_system
+        )['lon']
+
+    @classmethod
+    def from_birth_data(cls, birth_data):
+        """Crea el contexto desde un dict con 'date', 'latitude' y 'longitude' (formato BIRTH_DATA)"""
+        return cls(
+            birth_date=birth_data['date'],
+            latitude=birth_data['latitude'],
+            longitude=birth_data['longitude'],
+            house_system=birth_data.get('house_system', chart.PLACIDUS)
+        )
+
+    def moon_at(self, jd):
+        """Longitud de la Luna progresada para la fecha juliana (UT) indicada"""
+        # Años transcurridos y fecha juliana progresada
+        years_passed = (jd - self.natal_jd) / calc.YEAR_DAYS
+        progressed_jd = self.natal_jd + years_passed
+
+        # ARMC progresado usando método Naibod
+        progressed_armc_lon = swe.degnorm(self.natal_armc + years_passed * calc.MEAN_MOTIONS[chart.SUN])
+
+        progressed_objects = ephemeris.armc_objects(
+            object_list=[chart.MOON],
+            jd=progressed_jd,
+            armc=progressed_armc_lon,
+            lat=self.latitude,
+            lon=self.longitude,
+            obliquity=ephemeris.obliquity(progressed_jd),
+            house_system=self.house_system
+        )
+
+        return progressed_objects[chart.MOON]['lon']
+
+    def moon_at_many(self, jds):
+        """Longitudes de la Luna progresada para una secuencia de fechas julianas"""
+        return self.moon_at_array(jds).tolist()
+
+    def progressed_jd_array(self, jds):
+        """Años transcurridos y fechas julianas progresadas (operaciones de array)"""
+        jds = np.asarray(jds, dtype=np.float64)
+        years_passed = (jds - self.natal_jd) / calc.YEAR_DAYS
+        return years_passed, self.natal_jd + years_passed
+
+    def progressed_armc_array(self, jds):
+        """ARMC progresado por Naibod: natal_armc + años * movimiento medio del Sol"""
+        years_passed, _ = self.progressed_jd_array(jds)
+        return np.mod(self.natal_armc + years_passed * calc.MEAN_MOTIONS[chart.SUN], 360.0)
+
+    def moon_at_array(self, jds):
+        """
+        Versión vectorizada de moon_at: recibe un array de fechas julianas (UT)
+        y devuelve un array de longitudes.
+
+        Para la Luna, armc_objects sólo consulta swisseph en la fecha progresada
+        (el ARMC y la oblicuidad afectan a ángulos y casas, no a los planetas),
+        así que el lote se resuelve con llamadas directas a swe.calc_ut sin
+        construir los dicts intermedios de immanuel. Las fechas progresadas
+        repetidas se calculan una sola vez.
+        """
+        _, progressed_jds = self.progressed_jd_array(jds)
+        unique_jds, inverse = np.unique(progressed_jds, return_inverse=True)
+        longitudes = np.fromiter(
+            (swe.calc_ut(jd, swe.MOON)[0][0] for jd in unique_jds.tolist()),
+            dtype=np.float64,
+            count=unique_jds.size
+        )
+        return longitudes[inverse].reshape(progressed_jds.shape)
+
+
+def to_jd_array(times, zone=None):
+    """
+    Convierte fechas a un array de días julianos (UT) con julian_time.to_jd.
+    Acepta arrays de floats (ya en JD), enteros (segundos Unix), numpy
+    datetime64 (interpretado como UTC, o como hora local de `zone` si se
+    indica) o secuencias de datetime con zona horaria.
+    """
+    return to_jd(times, zone)
+
+
+def brent(f, a, b, fa, fb, tolerance=DEFAULT_TIME_TOLERANCE_DAYS):
+    """
+    Raíz de f en [a, b] por el método de Brent.
+    Requiere fa y fb de signo opuesto (ya evaluados en la grilla).
+    """
+    if fa == 0.0:
+        return a
+    if fb == 0.0:
+        return b
+    if fa * fb > 0:
+        raise ValueError("El intervalo no encierra una raíz")
+
+    c, fc = a, fa
+    d = e = b - a
+
+    for _ in range(MAX_ITERATIONS):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol = 2.0 * 2.2e-16 * abs(b) + 0.5 * tolerance
+        m = 0.5 * (c - b)
+        if abs(m) <= tol or fb == 0.0:
+            return b
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Interpolación (secante o cuadrática inversa)
+            s = fb / fa
+            if a == c:
+                p = 2.0 * m * s
+                q = 1.0 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2.0 * m * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            # Bisección
+            d = e = m
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, m)
+        fb = f(b)
+
+    return b
+
+
+def _solve_offset(diff_at, offset, exact_jd, rate, tolerance):
+    """
+    Instante en que la diferencia con signo vale `offset` cerca del cruce
+    exacto (entrada o salida del orbe). La velocidad medida en la grilla
+    da una estimación inicial, así el intervalo casi siempre encierra la
+    raíz con sólo dos evaluaciones.
+    """
+    f = lambda t: diff_at(t) - offset
+    guess = exact_jd + offset / rate
+    margin = max(abs(offset / rate) * 0.25, 1.0)
+    lo, hi = guess - margin, guess + margin
+    f_lo, f_hi = f(lo), f(hi)
+    for _ in range(8):
+        if f_lo * f_hi <= 0:
+            return brent(f, lo, hi, f_lo, f_hi, tolerance)
+        margin *= 2.0
+        lo, hi = guess - margin, guess + margin
+        f_lo, f_hi = f(lo), f(hi)
+    return None
+
+
+def _refine(diff_at, t0, t1, d0, d1, orb, tolerance):
+    """Cruce exacto dentro de [t0, t1] y, si hay orbe, su entrada y salida (datetimes UTC)"""
+    exact_jd = brent(diff_at, t0, t1, d0, d1, tolerance)
+
+    entry = exit_ = None
+    if orb is not None:
+        rate = (d1 - d0) / (t1 - t0)
+        # Entrada: el lado en que la diferencia vale -orb (o +orb si retrógrada)
+        entry_jd = _solve_offset(diff_at, -math.copysign(orb, rate), exact_jd, rate, tolerance)
+        exit_jd = _solve_offset(diff_at, math.copysign(orb, rate), exact_jd, rate, tolerance)
+        entry = jd_to_utc(entry_jd) if entry_jd is not None else None
+        exit_ = jd_to_utc(exit_jd) if exit_jd is not None else None
+
+    return exact_jd, entry, exit_
+
+
+def find_crossings(position_at, target, start_jd, end_jd, orb=None,
+                   step=DEFAULT_GRID_STEP_DAYS, tolerance=DEFAULT_TIME_TOLERANCE_DAYS):
+    """
+    Encuentra todos los cruces exactos de position_at(jd) sobre `target`
+    entre start_jd y end_jd.
+
+    Args:
+        position_at: función jd -> longitud eclíptica (grados)
+        target: longitud objetivo (punto natal + ángulo de aspecto)
+        start_jd, end_jd: intervalo de búsqueda (días julianos UT)
+        orb: si se indica, calcula también entrada y salida del orbe
+        step: paso de la grilla gruesa en días
+        tolerance: precisión temporal del refinamiento en días
+
+    Returns:
+        Lista de Crossing ordenada por fecha
+    """
+    evaluations = 0
+
+    def diff_at(jd):
+        nonlocal evaluations
+        evaluations += 1
+        return signed_difference(position_at(jd), target)
+
+    # Grilla gruesa (incluye siempre el extremo final)
+    count = max(1, math.ceil((end_jd - start_jd) / step))
+    grid = [start_jd + (end_jd - start_jd) * i / count for i in range(count + 1)]
+    values = [diff_at(jd) for jd in grid]
+
+    crossings = []
+    for i in range(count):
+        t0, t1 = grid[i], grid[i + 1]
+        d0, d1 = values[i], values[i + 1]
+
+        # Un salto de ±180° es el corte de la diferencia, no un cruce real
+        if d0 * d1 > 0 or abs(d1 - d0) >= 180.0:
+            continue
+        # Un cero exacto en la grilla se asigna sólo al intervalo que empieza en él
+        if d1 == 0.0 and i + 1 < count:
+            continue
+
+        before = evaluations
+        exact_jd, entry, exit_ = _refine(diff_at, t0, t1, d0, d1, orb, tolerance)
+
+        crossings.append(Crossing(
+            target=target % 360.0,
+            exact_jd=exact_jd,
+            exact_utc=jd_to_utc(exact_jd),
+            longitude=(target + diff_at(exact_jd)) % 360.0,
+            orb_entry_utc=entry,
+            orb_exit_utc=exit_,
+            evaluations=count + 1 + (evaluations - before),
+        ))
+
+    return crossings
+
+
+def aspect_targets(natal_points, aspects=ASPECT_NAMES):
+    """
+    Expande los puntos natales a longitudes objetivo por aspecto.
+    `aspects` puede ser una lista de ángulos o un dict ángulo -> orbe/nombre
+    (como settings.aspects). Los aspectos distintos de 0° y 180° generan dos
+    objetivos (punto ± ángulo).
+
+    Returns:
+        Lista de (longitud_objetivo, nombre_punto, longitud_punto, ángulo)
+    """
+    targets = []
+    for point, point_lon in natal_points.items():
+        for angle in aspects:
+            angle = float(angle)
+            offsets = {angle % 360.0, -angle % 360.0}
+            for offset in sorted(offsets):
+                targets.append(((point_lon + offset) % 360.0, point, point_lon, angle))
+    return targets
+
+
+def sweep_aspects(context, natal_points, start_jd, end_jd, aspects=ASPECT_NAMES, orb=None,
+                  step=DEFAULT_GRID_STEP_DAYS, tolerance=DEFAULT_TIME_TOLERANCE_DAYS):
+    """
+    Barrido de una sola pasada: todos los aspectos de la Luna progresada a
+    todos los puntos natales en el período.
+
+    1. Calcula una vez la trayectoria (grilla gruesa, moon_at_array) y la
+       desenrolla a longitudes continuas.
+    2. Cada intervalo de la grilla cubre un arco [min, max]; los objetivos
+       ordenados (más sus vueltas de 360°) que caen dentro se obtienen con
+       searchsorted, sin recorrer objetivo por objetivo.
+    3. Sólo los intervalos con impacto se refinan con Brent.
+
+    El costo crece con la longitud del período más la cantidad de impactos,
+    no con objetivos × período.
+
+    Args:
+        context: ProgressedNativeContext del nativo
+        natal_points: dict nombre -> longitud natal
+        aspects: ángulos a buscar (lista o dict como settings.aspects)
+        orb: si se indica, calcula entrada y salida del orbe
+
+    Returns:
+        Lista de AspectHit ordenada por fecha exacta
+    """
+    targets = aspect_targets(natal_points, aspects)
+    if not targets:
+        return []
+
+    # Trayectoria única sobre la grilla gruesa
+    count = max(1, math.ceil((end_jd - start_jd) / step))
+    grid = np.linspace(start_jd, end_jd, count + 1)
+    track = np.unwrap(context.moon_at_array(grid), period=360.0)
+
+    # Objetivos ordenados, replicados en cada vuelta cubierta por la trayectoria
+    target_lons = np.array([target[0] for target in targets])
+    order = np.argsort(target_lons)
+    sorted_lons = target_lons[order]
+    first_turn = math.floor(track.min() / 360.0)
+    last_turn = math.floor(track.max() / 360.0)
+    turns = np.arange(first_turn, last_turn + 1)
+    expanded = (sorted_lons[None, :] + 360.0 * turns[:, None]).ravel()
+    expanded_index = np.tile(order, turns.size)
+
+    # Solapamiento intervalo de la grilla ↔ objetivos (searchsorted)
+    lo = np.minimum(track[:-1], track[1:])
+    hi = np.maximum(track[:-1], track[1:])
+    left = np.searchsorted(expanded, lo, side='left')
+    right = np.searchsorted(expanded, hi, side='right')
+    hit_counts = right - left
+    hit_intervals = np.repeat(np.arange(count), hit_counts)
+    hit_offsets = np.arange(hit_counts.sum()) - np.repeat(np.cumsum(hit_counts) - hit_counts, hit_counts)
+    hit_positions = np.repeat(left, hit_counts) + hit_offsets
+
+    hits = []
+    seen = set()
+    for interval, position in zip(hit_intervals.tolist(), hit_positions.tolist()):
+        target_lon, point, point_lon, angle = targets[expanded_index[position]]
+        unwrapped_target = expanded[position]
+
+        # Un objetivo exactamente sobre un nodo de la grilla cae en dos intervalos
+        key = (point, angle, target_lon, round(unwrapped_target, 9))
+        if key in seen:
+            continue
+        seen.add(key)
+
+        t0, t1 = grid[interval], grid[interval + 1]
+        d0, d1 = track[interval] - unwrapped_target, track[interval + 1] - unwrapped_target
+        evaluations = 0
+
+        def diff_at(jd, target=target_lon):
+            nonlocal evaluations
+            evaluations += 1
+            return signed_difference(context.moon_at(jd), target)
+
+        exact_jd, entry, exit_ = _refine(diff_at, t0, t1, d0, d1, orb, tolerance)
+        hits.append(AspectHit(
+            point=point,
+            point_longitude=point_lon,
+            aspect=angle,
+            aspect_name=ASPECT_NAMES.get(angle, f"{angle:g}°"),
+            crossing=Crossing(
+                target=target_lon,
+                exact_jd=exact_jd,
+                exact_utc=jd_to_utc(exact_jd),
+                longitude=(target_lon + diff_at(exact_jd)) % 360.0,
+                orb_entry_utc=entry,
+                orb_exit_utc=exit_,
+                evaluations=evaluations,
+            )
+        ))
+
+    hits.sort(key=lambda hit: hit.crossing.exact_jd)
+    return hits
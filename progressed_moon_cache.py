@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Cache de Chebyshev de la trayectoria de Luna progresada de un nativo.
+
+La Luna progresada avanza ~13° por año sobre una curva suave. Este módulo
+ajusta polinomios de Chebyshev por tramos (un tramo por año) a la longitud
+de ProgressedNativeContext.moon_at_array sobre toda la vida del nativo y
+guarda los coeficientes en un blob binario compacto.
+
+- Las consultas se resuelven con una evaluación de Clenshaw (microsegundos).
+- Cada tramo se verifica contra el cálculo directo en una grilla densa; si
+  el error máximo supera la tolerancia se sube el grado del ajuste.
+- El blob lleva la huella del nativo (JD natal, ARMC, lat/lon, sistema de
+  casas): al cargarlo con otro contexto se rechaza.
+
+Así el servicio de calendario personal calcula una vez por nativo y no
+vuelve a hacerlo cada vez que vence el TTL de PersonalCalendarCache.
+"""
+
+import hashlib
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+from numpy.polynomial import chebyshev
+from immanuel.const import calc
+
+# Formato del blob: cabecera fija + coeficientes float64 + error por tramo
+BLOB_MAGIC = b'PMCH'
+BLOB_VERSION = 1
+HEADER_FORMAT = '<4sHH32sdddI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+DEFAULT_YEARS = 100
+DEFAULT_SEGMENT_DAYS = calc.YEAR_DAYS
+DEFAULT_DEGREE = 8
+MAX_DEGREE = 24
+
+# Tolerancia por defecto: 1e-6° (~0.004 segundos de arco)
+DEFAULT_TOLERANCE_DEGREES = 1e-6
+
+# Puntos de verificación por tramo (además de los nodos de ajuste)
+CHECK_POINTS_PER_SEGMENT = 64
+
+
+def native_fingerprint(context):
+    """Huella SHA-256 de los datos natales que determinan la trayectoria"""
+    key = f"{context.natal_jd:.10f}|{context.natal_armc:.10f}|{context.latitude:.6f}|" \
+          f"{context.longitude:.6f}|{context.house_system}"
+    return hashlib.sha256(key.encode('utf-8')).digest()
+
+
+class ProgressedMoonChebyshev:
+    """Trayectoria de Luna progresada como polinomios de Chebyshev por tramos."""
+
+    def __init__(self, fingerprint, start_jd, segment_days, coefficients, errors):
+        self.fingerprint = fingerprint
+        self.start_jd = start_jd
+        self.segment_days = segment_days
+        self.coefficients = np.ascontiguousarray(coefficients, dtype=np.float64)
+        self.errors = np.ascontiguousarray(errors, dtype=np.float64)
+        self.end_jd = start_jd + segment_days * len(self.coefficients)
+        # Copia en listas para la evaluación escalar sin overhead de NumPy
+        self._coefficient_rows = self.coefficients.tolist()
+
+    @property
+    def degree(self):
+        return self.coefficients.shape[1] - 1
+
+    @property
+    def error_bound(self):
+        """Error máximo medido contra el cálculo directo (grados)"""
+        return float(self.errors.max()) if self.errors.size else 0.0
+
+    @classmethod
+    def build(cls, context, years=DEFAULT_YEARS, start_jd=None, segment_days=DEFAULT_SEGMENT_DAYS,
+              degree=DEFAULT_DEGREE, tolerance=DEFAULT_TOLERANCE_DEGREES):
+        """
+        Ajusta la trayectoria del nativo desde start_jd (por defecto el
+        nacimiento) durante `years` tramos. Sube el grado hasta que todos
+        los tramos quedan dentro de la tolerancia.
+        """
+        if start_jd is None:
+            start_jd = context.natal_jd
+
+        segments = int(round(years * calc.YEAR_DAYS / segment_days))
+        edges = start_jd + segment_days * np.arange(segments)
+
+        while True:
+            # Nodos de Chebyshev de primera especie en [-1, 1]
+            nodes = np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+            jds = edges[:, None] + (nodes[None, :] + 1.0) * 0.5 * segment_days
+            values = np.unwrap(context.moon_at_array(jds), period=360.0, axis=1)
+            coefficients = chebyshev.chebfit(nodes, values.T, degree).T
+
+            # Verificación contra el cálculo directo en una grilla densa
+            check = np.linspace(-1.0, 1.0, CHECK_POINTS_PER_SEGMENT)
+            check_jds = edges[:, None] + (check[None, :] + 1.0) * 0.5 * segment_days
+            direct = context.moon_at_array(check_jds)
+            approx = np.stack([chebyshev.chebval(check, row) for row in coefficients])
+            errors = np.abs((approx - direct + 180.0) % 360.0 - 180.0).max(axis=1)
+
+            if errors.max() <= tolerance or degree >= MAX_DEGREE:
+                break
+            degree += 2
+
+        if errors.max() > tolerance:
+            raise ValueError(
+                f"No se alcanzó la tolerancia {tolerance}° (error {errors.max():.3g}° con grado {degree})")
+
+        return cls(native_fingerprint(context), float(start_jd), float(segment_days), coefficients, errors)
+
+    def longitude(self, jd):
+        """Longitud de la Luna progresada en la fecha juliana indicada (escalar)"""
+        offset = jd - self.start_jd
+        index = int(offset // self.segment_days)
+        if index < 0 or index >= len(self._coefficient_rows):
+            raise ValueError(f"Fecha juliana {jd} fuera del rango del cache")
+
+        # Evaluación de Clenshaw
+        x = 2.0 * (offset - index * self.segment_days) / self.segment_days - 1.0
+        coefficients = self._coefficient_rows[index]
+        b1 = b2 = 0.0
+        for c in reversed(coefficients[1:]):
+            b1, b2 = 2.0 * x * b1 - b2 + c, b1
+        return (x * b1 - b2 + coefficients[0]) % 360.0
+
+    def longitudes(self, jds):
+        """Versión vectorizada de longitude para un array de fechas julianas"""
+        jds = np.asarray(jds, dtype=np.float64)
+        offset = jds - self.start_jd
+        index = np.floor(offset / self.segment_days).astype(np.int64)
+        if index.size and (index.min() < 0 or index.max() >= len(self.coefficients)):
+            raise ValueError("Hay fechas julianas fuera del rango del cache")
+
+        x = 2.0 * (offset - index * self.segment_days) / self.segment_days - 1.0
+        coefficients = self.coefficients[index]
+        b1 = np.zeros_like(x)
+        b2 = np.zeros_like(x)
+        for k in range(self.degree, 0, -1):
+            b1, b2 = 2.0 * x * b1 - b2 + coefficients[..., k], b1
+        return np.mod(x * b1 - b2 + coefficients[..., 0], 360.0)
+
+    def matches(self, context):
+        """Indica si el cache corresponde a los datos natales del contexto"""
+        return self.fingerprint == native_fingerprint(context)
+
+    def satisfies(self, context, years=DEFAULT_YEARS, start_jd=None, segment_days=DEFAULT_SEGMENT_DAYS,
+                  degree=DEFAULT_DEGREE, tolerance=DEFAULT_TOLERANCE_DEGREES):
+        """
+        Indica si el cache guardado sirve para las opciones de build pedidas:
+        mismo inicio, tramos y cantidad de tramos, grado y error no peores.
+        """
+        if start_jd is None:
+            start_jd = context.natal_jd
+        segments = int(round(years * calc.YEAR_DAYS / segment_days))
+        return (self.start_jd == float(start_jd) and self.segment_days == float(segment_days)
+                and len(self.coefficients) == segments and self.degree >= degree
+                and self.error_bound <= tolerance)
+
+    def to_bytes(self):
+        """Serializa a un blob binario compacto"""
+        segments, width = self.coefficients.shape
+        header = struct.pack(
+            HEADER_FORMAT, BLOB_MAGIC, BLOB_VERSION, width - 1, self.fingerprint,
+            self.start_jd, self.segment_days, self.error_bound, segments
+        )
+        return header + self.coefficients.tobytes() + self.errors.tobytes()
+
+    @classmethod
+    def from_bytes(cls, blob):
+        """Reconstruye el cache desde un blob generado por to_bytes"""
+        magic, version, degree, fingerprint, start_jd, segment_days, _, segments = \
+            struct.unpack_from(HEADER_FORMAT, blob)
+        if magic != BLOB_MAGIC or version != BLOB_VERSION:
+            raise ValueError("Blob de cache de Luna progresada inválido")
+
+        width = degree + 1
+        coefficients = np.frombuffer(blob, dtype='<f8', count=segments * width, offset=HEADER_SIZE)
+        errors = np.frombuffer(blob, dtype='<f8', count=segments,
+                               offset=HEADER_SIZE + coefficients.nbytes)
+        return cls(fingerprint, start_jd, segment_days, coefficients.reshape(segments, width), errors)
+
+    def save(self, path):
+        """Escritura atómica (archivo temporal + os.replace)"""
+        temporary = f'{path}.tmp'
+        Path(temporary).write_bytes(self.to_bytes())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path, context=None):
+        """Carga un cache; si se pasa el contexto, verifica que sea del mismo nativo"""
+        cache = cls.from_bytes(Path(path).read_bytes())
+        if context is not None and not cache.matches(context):
+            raise ValueError("El cache no corresponde a los datos natales del contexto")
+        return cache
+
+
+def load_or_build(context, path, **build_options):
+    """Carga el cache del nativo si existe y coincide; si no, lo construye y lo guarda"""
+    path = Path(path)
+    if path.is_file():
+        try:
+            cache = ProgressedMoonChebyshev.load(path, context)
+            if cache.satisfies(context, **build_options):
+                return cache
+        except (ValueError, struct.error):
+            pass
+
+    cache = ProgressedMoonChebyshev.build(context, **build_options)
+    cache.save(path)
+    return cache
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Línea de tiempo de toda la vida de la Luna progresada de un nativo.
+
+PersonalCalendarCache se guarda por (usuario, año) con un TTL de 30 días,
+así que cada año nuevo y cada vencimiento vuelven a correr el cálculo de
+Luna progresada. Pero esos eventos dependen sólo de los datos natales: no
+cambian nunca.
+
+ProgressedMoonTimeline calcula en una pasada (sweep_aspects sobre toda la
+vida) todos los eventos de la Luna progresada:
+- Aspectos exactos a los puntos natales.
+- Ingresos a signo.
+- Ingresos a las casas natales.
+
+Los guarda como columnas ordenadas por fecha en un blob binario. Cualquier
+año se responde recortando el rango con searchsorted, sin efemérides. El
+blob lleva una huella de los datos natales y de la configuración del
+cálculo; si cambia cualquiera de los dos, load_or_build lo recalcula.
+
+Uso:
+    context = ProgressedNativeContext.from_birth_data(birth_data)
+    timeline = load_or_build_timeline(context, 'cache/luna_progresada_123.bin',
+                                      natal_points, house_cusps)
+    eventos = timeline.year(2025)
+"""
+
+import hashlib
+import json
+import os
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from natal_chart_records import SIGNOS
+from progressed_moon import (ASPECT_NAMES, DEFAULT_GRID_STEP_DAYS, DEFAULT_TIME_TOLERANCE_DAYS,
+                             jd_to_utc, sweep_aspects, utc_to_jd)
+from progressed_moon_cache import DEFAULT_YEARS, native_fingerprint
+from transit_engine import PLANET_NAMES
+
+# Formato del blob: cabecera fija + nombres (JSON) + columnas
+BLOB_MAGIC = b'PMTL'
+BLOB_VERSION = 1
+HEADER_FORMAT = '<4sH32sddII'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Tipos de evento de la línea de tiempo
+KIND_ASPECT = 0
+KIND_SIGN = 1
+KIND_HOUSE = 2
+
+COLUMNS = (
+    ('jd', '<f8'),
+    ('kind', '<i1'),
+    ('point', '<i2'),       # índice en names (aspectos) o -1
+    ('angle', '<f8'),       # ángulo del aspecto (0 en ingresos)
+    ('house', '<i1'),       # casa natal (ingresos a casa) o 0
+    ('longitude', '<f8'),   # longitud de la Luna progresada en el evento
+)
+
+HARMONY = {
+    'Conjunción': 'Neutro',
+    'Sextil': 'Armónico',
+    'Cuadratura': 'Tensión',
+    'Trígono': 'Armónico',
+    'Oposición': 'Tensión'
+}
+
+# Nombres de Immanuel -> nombres de los títulos
+NOMBRES_ES = {name: nombre for nombre, name in PLANET_NAMES.items()}
+
+
+def timeline_fingerprint(context, natal_points, house_cusps=None, aspects=ASPECT_NAMES,
+                         years=DEFAULT_YEARS, start_jd=None, step=DEFAULT_GRID_STEP_DAYS,
+                         tolerance=DEFAULT_TIME_TOLERANCE_DAYS):
+    """Huella SHA-256 de los datos natales y de la configuración del cálculo"""
+    settings = {
+        'points': {name: round(float(longitude), 8) for name, longitude in sorted(natal_points.items())},
+        'cusps': [round(float(cusp), 8) for cusp in (house_cusps or [])],
+        'aspects': sorted(float(angle) for angle in aspects),
+        'years': years,
+        'start_jd': None if start_jd is None else round(float(start_jd), 8),
+        'step': step,
+        'tolerance': tolerance,
+        'version': BLOB_VERSION,
+    }
+    digest = hashlib.sha256(native_fingerprint(context))
+    digest.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+    return digest.digest()
+
+
+def _format_position(longitude):
+    longitude %= 360.0
+    degrees = longitude % 30.0
+    return f"{int(degrees)}°{int((degrees % 1) * 60):02d}' {SIGNOS[int(longitude // 30)]}"
+
+
+class ProgressedMoonTimeline:
+    """Eventos de toda la vida de la Luna progresada, en columnas ordenadas por fecha."""
+
+    def __init__(self, fingerprint, start_jd, end_jd, names, columns, natal_points=None):
+        self.fingerprint = fingerprint
+        self.start_jd = start_jd
+        self.end_jd = end_jd
+        self.names = list(names)
+        self.columns = columns
+        # Longitudes natales para posicion2 (el blob no las guarda)
+        self.natal_points = dict(natal_points or {})
+
+    def __len__(self):
+        return len(self.columns['jd'])
+
+    @classmethod
+    def build(cls, context, natal_points, house_cusps=None, aspects=ASPECT_NAMES, years=DEFAULT_YEARS,
+              start_jd=None, step=DEFAULT_GRID_STEP_DAYS, tolerance=DEFAULT_TIME_TOLERANCE_DAYS):
+        """
+        Calcula todos los eventos desde start_jd (por defecto el nacimiento)
+        durante `years` años.
+
+        Args:
+            context: ProgressedNativeContext del nativo
+            natal_points: dict nombre (Immanuel) -> longitud natal
+            house_cusps: las 12 cúspides natales en orden (opcional)
+            aspects: ángulos de aspecto a buscar
+        """
+        fingerprint = timeline_fingerprint(context, natal_points, house_cusps, aspects, years, start_jd,
+                                           step, tolerance)
+        begin = context.natal_jd if start_jd is None else start_jd
+        end = begin + years * 365.25
+        names = list(natal_points)
+
+        # Aspectos a los puntos natales y cruces de cúspides de signo y de casa
+        cusps = {('signo', index): 30.0 * index for index in range(12)}
+        for number, cusp in enumerate(house_cusps or [], start=1):
+            cusps[('casa', number)] = cusp
+        aspect_hits = sweep_aspects(context, natal_points, begin, end, aspects=aspects, step=step,
+                                    tolerance=tolerance)
+        cusp_hits = sweep_aspects(context, cusps, begin, end, aspects=[0.0], step=step, tolerance=tolerance)
+
+        rows = []
+        for hit in aspect_hits:
+            rows.append((hit.crossing.exact_jd, KIND_ASPECT, names.index(hit.point), hit.aspect, 0,
+                         hit.crossing.longitude))
+        for hit in cusp_hits:
+            kind, value = hit.point
+            if kind == 'signo':
+                rows.append((hit.crossing.exact_jd, KIND_SIGN, -1, 0.0, 0, hit.crossing.target))
+            else:
+                rows.append((hit.crossing.exact_jd, KIND_HOUSE, -1, 0.0, value, hit.crossing.target))
+        rows.sort()
+
+        columns = {
+            name: np.array([row[index] for row in rows], dtype=dtype)
+            for index, (name, dtype) in enumerate(COLUMNS)
+        }
+        return cls(fingerprint, float(begin), float(end), names, columns, natal_points)
+
+    def slice(self, start_jd, end_jd):
+        """Índices de los eventos en [start_jd, end_jd)"""
+        jds = self.columns['jd']
+        first, last = np.searchsorted(jds, [start_jd, end_jd], side='left')
+        return range(int(first), int(last))
+
+    def events(self, start, end):
+        """
+        Eventos entre dos datetimes UTC (o JD), con el formato del calendario
+        personal (tipo_evento 'Luna Progresada').
+        """
+        start_jd = start if isinstance(start, (int, float)) else utc_to_jd(start)
+        end_jd = end if isinstance(end, (int, float)) else utc_to_jd(end)
+        return [self._event(index) for index in self.slice(start_jd, end_jd)]
+
+    def year(self, year):
+        """Eventos del año calendario (UTC)"""
+        return self.events(datetime(year, 1, 1, tzinfo=timezone.utc),
+                           datetime(year + 1, 1, 1, tzinfo=timezone.utc))
+
+    def _event(self, index):
+        jd = float(self.columns['jd'][index])
+        kind = int(self.columns['kind'][index])
+        longitude = float(self.columns['longitude'][index])
+        moment = jd_to_utc(jd)
+        sign = SIGNOS[int(longitude % 360.0 // 30)]
+
+        event = {
+            'fecha_utc': moment.strftime('%Y-%m-%d'),
+            'hora_utc': moment.strftime('%H:%M'),
+            'tipo_evento': 'Luna Progresada',
+        }
+        if kind == KIND_ASPECT:
+            point = self.names[int(self.columns['point'][index])]
+            nombre = NOMBRES_ES.get(point, point)
+            aspect = ASPECT_NAMES[float(self.columns['angle'][index])]
+            event.update({
+                'descripcion': f"Luna progresada {aspect.lower()} {nombre} natal",
+                'planeta1': 'Luna progresada',
+                'planeta2': nombre,
+                'posicion1': _format_position(longitude),
+                'posicion2': _format_position(self.natal_points[point]) if point in self.natal_points else '',
+                'tipo_aspecto': aspect,
+                'orbe': '0.00°',
+                'es_aplicativo': 'No',
+                'harmony': HARMONY[aspect],
+            })
+        elif kind == KIND_SIGN:
+            event['descripcion'] = f"Luna progresada ingresa a {sign}"
+        else:
+            house = int(self.columns['house'][index])
+            event['descripcion'] = f"Luna progresada en {sign} transitando casa {house}"
+        event.update({'elevacion': '', 'azimut': '', 'metadata': {'jd': jd, 'signo': sign}})
+        if kind == KIND_HOUSE:
+            event['metadata']['casa'] = int(self.columns['house'][index])
+        return event
+
+    def matches(self, fingerprint):
+        return self.fingerprint == fingerprint
+
+    def to_bytes(self):
+        """Serializa a un blob binario compacto"""
+        names = json.dumps(self.names).encode('utf-8')
+        header = struct.pack(HEADER_FORMAT, BLOB_MAGIC, BLOB_VERSION, self.fingerprint,
+                             self.start_jd, self.end_jd, len(self), len(names))
+        return header + names + b''.join(self.columns[name].astype(dtype).tobytes() for name, dtype in COLUMNS)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        """Reconstruye la línea de tiempo desde un blob generado por to_bytes"""
+        magic, version, fingerprint, start_jd, end_jd, count, names_size = \
+            struct.unpack_from(HEADER_FORMAT, blob)
+        if magic != BLOB_MAGIC or version != BLOB_VERSION:
+            raise ValueError("Blob de línea de tiempo de Luna progresada inválido")
+
+        names = json.loads(blob[HEADER_SIZE:HEADER_SIZE + names_size].decode('utf-8'))
+        offset = HEADER_SIZE + names_size
+        columns = {}
+        for name, dtype in COLUMNS:
+            columns[name] = np.frombuffer(blob, dtype=dtype, count=count, offset=offset)
+            offset += columns[name].nbytes
+        return cls(fingerprint, start_jd, end_jd, names, columns)
+
+    def save(self, path):
+        """Escritura atómica (archivo temporal + os.replace)"""
+        temporary = f'{path}.tmp'
+        Path(temporary).write_bytes(self.to_bytes())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path, natal_points=None):
+        timeline = cls.from_bytes(Path(path).read_bytes())
+        timeline.natal_points = dict(natal_points or {})
+        return timeline
+
+
+def load_or_build_timeline(context, path, natal_points, house_cusps=None, **build_options):
+    """
+    Carga la línea de tiempo del nativo si existe y su huella coincide con
+    los datos natales y la configuración; si no, la calcula y la guarda.
+    """
+    path = Path(path)
+    fingerprint = timeline_fingerprint(context, natal_points, house_cusps, **build_options)
+
+    if path.is_file():
+        try:
+            timeline = ProgressedMoonTimeline.load(path, natal_points)
+            if timeline.matches(fingerprint):
+                return timeline
+        except (ValueError, struct.error):
+            pass
+
+    timeline = ProgressedMoonTimeline.build(context, natal_points, house_cusps, **build_options)
+    timeline.save(path)
+    return timeline
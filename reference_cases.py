@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Casos de referencia para benchmarks y verificaciones de precisión.
+
+Lee los dos fixtures del repo y los deja en la forma que usan los cálculos:
+- test_cases.json (anexo A.3): caso principal y casos adicionales con
+  datos de nacimiento y año.
+- astroseek_reference_data.json (anexo C): posiciones natales, ángulos,
+  cúspides y Luna progresada 2025 según AstroSeek para el caso principal.
+
+La Luna progresada de AstroSeek es la de su conjunción exacta con el Sol
+natal (25/10/2025); fecha_calculo es el día en que se tomó el dato, no la
+fecha de la posición.
+
+Cada caso trae datos_usuario (formato de calcular_carta_natal), la fecha de
+nacimiento con zona horaria y, si hay, las longitudes esperadas con nombres
+de Immanuel.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+BASE_DIR = Path(__file__).resolve().parent
+CASES_PATH = BASE_DIR / 'test_cases.json'
+ASTROSEEK_PATH = BASE_DIR / 'astroseek_reference_data.json'
+
+# Nombres de astroseek_reference_data.json (sin tildes) -> nombres de Immanuel
+ASTROSEEK_NAMES = {
+    'Sol': 'Sun',
+    'Luna': 'Moon',
+    'Mercurio': 'Mercury',
+    'Venus': 'Venus',
+    'Marte': 'Mars',
+    'Jupiter': 'Jupiter',
+    'Saturno': 'Saturn',
+    'Urano': 'Uranus',
+    'Neptuno': 'Neptune',
+    'Pluton': 'Pluto',
+}
+
+
+@dataclass
+class ReferenceCase:
+    """Un nativo de los fixtures con sus valores esperados."""
+    nombre: str
+    datos_usuario: dict
+    birth_date: datetime
+    latitude: float
+    longitude: float
+    year: int
+    # Longitudes esperadas: nombre de Immanuel -> grados
+    expected_points: dict = field(default_factory=dict)
+    # Cúspides esperadas (casa 1..12), vacío si no hay referencia
+    expected_cusps: list = field(default_factory=list)
+    # Luna progresada esperada y fecha (UTC) a la que corresponde
+    expected_progressed_moon: float | None = None
+    progressed_date: datetime | None = None
+    # Punto natal con el que la Luna progresada está en conjunción en esa fecha
+    progressed_conjunction: str | None = None
+    source: str = 'test_cases.json'
+
+    @property
+    def key(self):
+        return (self.birth_date.isoformat(), round(self.latitude, 4), round(self.longitude, 4))
+
+
+def _case_from_input(nombre, datos):
+    location = datos['location']
+    birth_date = datetime.fromisoformat(f"{datos['birth_date']}T{datos['birth_time']}").replace(
+        tzinfo=ZoneInfo(location['timezone']))
+    datos_usuario = {
+        'hora_local': birth_date.replace(tzinfo=None).isoformat(),
+        'lat': location['latitude'],
+        'lon': location['longitude'],
+        'zona_horaria': location['timezone'],
+        'lugar': location.get('name', ''),
+    }
+    return ReferenceCase(nombre, datos_usuario, birth_date, location['latitude'], location['longitude'],
+                         datos.get('year', 2025))
+
+
+def load_test_cases(path=CASES_PATH):
+    """Caso principal y casos adicionales de test_cases.json"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)['anexo_a3_casos_de_prueba']
+
+    principal = data['caso_principal']
+    case = _case_from_input(principal['nombre'], principal['datos_entrada'])
+    expected = principal.get('resultados_esperados', {})
+    if 'sol_natal' in expected:
+        case.expected_points['Sun'] = expected['sol_natal']['longitud_absoluta']
+    if 'luna_progresada' in expected:
+        # Sin fecha propia: es el valor de AstroSeek y toma su fecha (load_reference_cases)
+        case.expected_progressed_moon = expected['luna_progresada']['longitud_absoluta']
+
+    cases = [case]
+    for extra in data.get('casos_adicionales', []):
+        cases.append(_case_from_input(extra['nombre'], extra['datos_entrada']))
+    return cases
+
+
+def load_validations(path=CASES_PATH):
+    """
+    Tolerancias de validaciones_automaticas de test_cases.json, en grados:
+    {'Sun': 0.1, 'progressed_moon': 0.2}
+    """
+    with open(path, encoding='utf-8') as f:
+        validations = json.load(f)['anexo_a3_casos_de_prueba'].get('validaciones_automaticas', {})
+    tolerances = {}
+    if 'precision_sol_natal' in validations:
+        tolerances['Sun'] = validations['precision_sol_natal']['tolerancia']
+    if 'precision_luna_progresada' in validations:
+        tolerances['progressed_moon'] = validations['precision_luna_progresada']['tolerancia']
+    return tolerances
+
+
+def load_astroseek_reference(path=ASTROSEEK_PATH):
+    """Caso de referencia de AstroSeek con planetas, ángulos, cúspides y Luna progresada"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)['anexo_c_datos_referencia_astroseek']
+
+    person = data['persona_referencia']
+    coordinates = person['coordenadas']
+    birth_date = datetime.strptime(f"{person['fecha_nacimiento']} {person['hora_nacimiento']}", '%d/%m/%Y %H:%M')
+    progressed = data['luna_progresada_2025']
+    case = _case_from_input(person['nombre'], {
+        'birth_date': birth_date.strftime('%Y-%m-%d'),
+        'birth_time': birth_date.strftime('%H:%M'),
+        'location': {
+            'latitude': coordinates['latitud'],
+            'longitude': coordinates['longitud'],
+            'name': person['lugar_nacimiento'],
+            'timezone': coordinates['zona_horaria'],
+        },
+        'year': int(progressed['fecha_calculo'][:4]),
+    })
+    case.source = 'astroseek_reference_data.json'
+
+    for nombre, values in data['posiciones_planetarias_natales']['planetas'].items():
+        case.expected_points[ASTROSEEK_NAMES[nombre]] = values['longitud_absoluta']
+    angles = data['angulos_principales']
+    case.expected_points['Asc'] = angles['Ascendente']['longitud_absoluta']
+    case.expected_points['MC'] = angles['Medio_Cielo']['longitud_absoluta']
+    cusps = data['casas_astrologicas']['cuspides']
+    case.expected_cusps = [cusps[f'Casa_{number}']['longitud'] for number in range(1, 13)]
+    conjunction = progressed['aspectos_natales']['conjuncion_sol_natal']
+    case.expected_progressed_moon = progressed['posicion']['longitud_absoluta']
+    case.progressed_date = datetime.fromisoformat(conjunction['fecha']).replace(tzinfo=timezone.utc)
+    case.progressed_conjunction = 'Sun'
+    return case
+
+
+def load_reference_cases(cases_path=CASES_PATH, astroseek_path=ASTROSEEK_PATH):
+    """
+    Todos los casos de los dos fixtures, sin duplicar nativos: si un caso de
+    test_cases.json es el nativo de AstroSeek, sus valores esperados se
+    completan con los de AstroSeek.
+    """
+    cases = load_test_cases(cases_path)
+    reference = load_astroseek_reference(astroseek_path)
+    for case in cases:
+        if case.key == reference.key:
+            case.expected_points = {**reference.expected_points, **case.expected_points}
+            case.expected_cusps = reference.expected_cusps
+            if case.expected_progressed_moon is None:
+                case.expected_progressed_moon = reference.expected_progressed_moon
+            if case.progressed_date is None:
+                case.progressed_date = reference.progressed_date
+                case.progressed_conjunction = reference.progressed_conjunction
+            case.source = f'{case.source} + {reference.source}'
+            return cases
+    return cases + [reference]
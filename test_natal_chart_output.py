@@ -8,27 +8,30 @@ from zoneinfo import ZoneInfo
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'astro-calendar-personal-fastapi', 'src', 'calculators')))
 
 # Importar settings de Immanuel antes de importar natal_chart
+from immanuel import setup
 from immanuel.setup import settings
 from immanuel.const import chart
+from chart_profiles import ChartProfile, install, use_profile
 
-# Guardar la configuración original de settings.objects
-original_immanuel_settings_objects = list(settings.objects)
+install(setup)
 
-# Modificar settings.objects para el test, excluyendo los elementos problemáticos
-# Esto se hace ANTES de importar natal_chart para que use esta configuración
-settings.objects = [
-    # Planetas
-    chart.SUN, chart.MOON, chart.MERCURY, chart.VENUS, chart.MARS,
-    chart.JUPITER, chart.SATURN, chart.URANUS, chart.NEPTUNE, chart.PLUTO,
-    # Ángulos
-    chart.ASC, chart.MC,
-    # Puntos especiales (excluyendo los que causan AttributeError)
-    chart.TRUE_NORTH_NODE, chart.TRUE_SOUTH_NODE, chart.LILITH, chart.CHIRON,
-    # chart.PART_OF_FORTUNE, # Excluido temporalmente para el test
-    # chart.VERTEX # Excluido temporalmente para el test
-]
+# Perfil del test, excluyendo los elementos problemáticos.
+# Se aplica sólo durante la llamada, sin modificar ni restaurar settings global.
+TEST_PROFILE = ChartProfile(
+    'test',
+    objects=[
+        # Planetas
+        chart.SUN, chart.MOON, chart.MERCURY, chart.VENUS, chart.MARS,
+        chart.JUPITER, chart.SATURN, chart.URANUS, chart.NEPTUNE, chart.PLUTO,
+        # Ángulos
+        chart.ASC, chart.MC,
+        # Puntos especiales (excluyendo los que causan AttributeError)
+        chart.TRUE_NORTH_NODE, chart.TRUE_SOUTH_NODE, chart.LILITH, chart.CHIRON,
+        # chart.PART_OF_FORTUNE, # Excluido temporalmente para el test
+        # chart.VERTEX # Excluido temporalmente para el test
+    ]
+)
 
-# Ahora importar natal_chart, que usará la configuración modificada de settings.objects
 from natal_chart import calcular_carta_natal
 
 def run_test():
@@ -43,16 +46,17 @@ def run_test():
     }
 
     try:
-        natal_data = calcular_carta_natal(datos_usuario)
-        print("\n--- Datos de Carta Natal Generados ---")
-        print(json.dumps(natal_data, indent=2, ensure_ascii=False))
+        with use_profile(TEST_PROFILE):
+            natal_data = calcular_carta_natal(datos_usuario)
+            print("\n--- Datos de Carta Natal Generados ---")
+            print(json.dumps(natal_data, indent=2, ensure_ascii=False))
 
-        # Verificar la configuración de aspects en settings de Immanuel
-        print("\n--- Configuración de Immanuel (settings.aspects) ---")
-        if hasattr(settings, 'aspects') and settings.aspects:
-            print(settings.aspects)
-        else:
-            print("settings.aspects NO está configurado o está vacío.")
+            # Verificar la configuración de aspects en settings de Immanuel
+            print("\n--- Configuración de Immanuel (settings.aspects) ---")
+            if hasattr(settings, 'aspects') and settings.aspects:
+                print(settings.aspects)
+            else:
+                print("settings.aspects NO está configurado o está vacío.")
             
         # Verificar la posición del Sol natal
         if 'points' in natal_data and 'Sun' in natal_data['points']:
@@ -76,9 +80,6 @@ def run_test():
         print(f"\nError al ejecutar el test: {e}")
         import traceback
         traceback.print_exc()
-    finally:
-        # Restaurar la configuración original de settings.objects después del test
-        settings.objects = original_immanuel_settings_objects
 
 if __name__ == "__main__":
     run_test()
@@ -17,18 +17,23 @@ sys.path.append('/Users/apple/astro-calendar-personal-fastapi/src')
 try:
     import immanuel.charts as charts
     from immanuel.const import chart, calc
-    from immanuel.tools import ephemeris, date, forecast
+    from immanuel.tools import ephemeris, forecast
     from immanuel.setup import settings
     import swisseph as swe
+    from chart_profiles import ChartProfile
+    from progressed_moon import ProgressedNativeContext, find_crossings, signed_difference, sweep_aspects, to_jd_array, utc_to_jd
 except ImportError as e:
     print(f"Error importando Immanuel: {e}")
     print("Asegúrate de que Immanuel esté instalado y el path sea correcto")
     sys.exit(1)
 
-# Configuración de Immanuel
-settings.aspects = [calc.CONJUNCTION]
-settings.default_orb = 2.0
-settings.exact_orb = 0.001
+# Configuración de Immanuel (perfil propio, sin modificar settings global)
+PROGRESSED_PROFILE = ChartProfile(
+    'luna_progresada',
+    aspects=[calc.CONJUNCTION],
+    default_orb=2.0,
+    exact_orb=0.001
+)
 
 # Datos natales de la persona de prueba
 BIRTH_DATA = {
@@ -38,6 +43,9 @@ BIRTH_DATA = {
     'timezone': ZoneInfo("America/Argentina/Buenos_Aires")
 }
 
+# Contexto natal precalculado (JD natal, ARMC natal): se construye una sola vez
+NATIVE = ProgressedNativeContext.from_birth_data(BIRTH_DATA)
+
 # Posiciones natales (convertidas a grados absolutos 0-360)
 NATAL_POSITIONS = {
     'Sun': 275.27,      # Capricorn 5°16' = 270° + 5.27°
@@ -87,47 +95,8 @@ def calculate_progressed_moon_position(current_date):
     (mismo método que el algoritmo actual)
     """
     try:
-        # Convertir fechas a UTC para cálculos
-        birth_date_utc = BIRTH_DATA['date'].astimezone(ZoneInfo("UTC"))
-        current_date_utc = current_date.astimezone(ZoneInfo("UTC"))
-        
-        # Convertir a fechas julianas
-        birth_jd = date.to_jd(birth_date_utc)
-        current_jd = date.to_jd(current_date_utc)
-        
-        # Calcular años transcurridos
-        years_passed = (current_jd - birth_jd) / calc.YEAR_DAYS
-        
-        # Fecha juliana progresada
-        progressed_jd = birth_jd + years_passed
-        
-        # Obtener ARMC natal
-        natal_armc = ephemeris.angle(
-            index=chart.ARMC,
-            jd=birth_jd,
-            lat=BIRTH_DATA['latitude'],
-            lon=BIRTH_DATA['longitude'],
-            house_system=chart.PLACIDUS
-        )['lon']
-        
-        # ARMC progresado usando método Naibod
-        progressed_armc_lon = swe.degnorm(natal_armc + years_passed * calc.MEAN_MOTIONS[chart.SUN])
-        
-        # Oblicuidad para la fecha progresada
-        obliquity = ephemeris.obliquity(progressed_jd)
-        
-        # Posición de la Luna progresada
-        progressed_objects = ephemeris.armc_objects(
-            object_list=[chart.MOON],
-            jd=progressed_jd,
-            armc=progressed_armc_lon,
-            lat=BIRTH_DATA['latitude'],
-            lon=BIRTH_DATA['longitude'],
-            obliquity=obliquity,
-            house_system=chart.PLACIDUS
-        )
-        
-        return progressed_objects[chart.MOON]['lon']
+        # Fecha juliana (UT) directamente desde el timestamp, sin astimezone
+        return calculate_progressed_moon_position_jd(utc_to_jd(current_date))
         
     except Exception as e:
         print(f"Error calculando Luna progresada: {e}")
@@ -137,6 +106,20 @@ def calculate_progressed_moon_position(current_date):
         natal_moon_pos = NATAL_POSITIONS['Moon']
         return (natal_moon_pos + moon_advancement) % 360
 
+def calculate_progressed_moon_position_jd(current_jd):
+    """
+    Igual que calculate_progressed_moon_position pero recibe directamente
+    la fecha juliana (UT). Es la función de posición que usa el solver.
+    """
+    return NATIVE.moon_at(current_jd)
+
+def calculate_progressed_moon_positions(dates):
+    """
+    Versión vectorizada: recibe un array de datetimes, datetime64 o fechas
+    julianas y devuelve un array NumPy de longitudes de Luna progresada.
+    """
+    return NATIVE.moon_at_array(to_jd_array(dates))
+
 def find_conjunction_simple(planet_name, target_year):
     """
     Algoritmo simplificado para encontrar conjunción de Luna progresada.
@@ -168,7 +151,7 @@ def find_conjunction_simple(planet_name, target_year):
             diff = 360 - diff
         
         # Si está dentro del orbe y es mejor que el anterior
-        if diff <= settings.default_orb and diff < min_orb:
+        if diff <= PROGRESSED_PROFILE.default_orb and diff < min_orb:
             min_orb = diff
             best_date = current
             
@@ -188,39 +171,107 @@ def find_conjunction_simple(planet_name, target_year):
         print(f"     Orbe: {min_orb:.2f}°")
         return (best_date, min_orb, final_prog_pos)
     else:
-        print(f"  ❌ No se encontró conjunción dentro del orbe de {settings.default_orb}°")
+        print(f"  ❌ No se encontró conjunción dentro del orbe de {PROGRESSED_PROFILE.default_orb}°")
         return None
 
+def find_conjunction_exact(planet_name, target_year):
+    """
+    Conjunción de Luna progresada por búsqueda de raíces.
+    Muestrea la diferencia angular en una grilla gruesa y refina cada cruce
+    con Brent: ~20 evaluaciones en lugar de 365, con hora exacta (UTC) y
+    fechas de entrada/salida del orbe.
+    """
+    natal_pos = NATAL_POSITIONS[planet_name]
+    
+    # Fechas límite del año
+    start_date = datetime(target_year, 1, 1, tzinfo=BIRTH_DATA['timezone'])
+    end_date = datetime(target_year, 12, 31, 23, 59, tzinfo=BIRTH_DATA['timezone'])
+    
+    print(f"\nBuscando conjunción Luna progresada ♂ {planet_name}...")
+    print(f"Posición natal de {planet_name}: {degrees_to_sign_format(natal_pos)}")
+    
+    crossings = find_crossings(
+        calculate_progressed_moon_position_jd,
+        natal_pos,
+        utc_to_jd(start_date),
+        utc_to_jd(end_date),
+        orb=PROGRESSED_PROFILE.default_orb
+    )
+    
+    if not crossings:
+        print(f"  ❌ No se encontró conjunción exacta en {target_year}")
+        return None
+    
+    crossing = crossings[0]
+    local_date = crossing.exact_utc.astimezone(BIRTH_DATA['timezone'])
+    print(f"  ✅ CONJUNCIÓN ENCONTRADA:")
+    print(f"     Exacta (UTC): {crossing.exact_utc.strftime('%Y-%m-%d %H:%M')}")
+    print(f"     Fecha local: {local_date.strftime('%Y-%m-%d %H:%M')}")
+    if crossing.orb_entry_utc and crossing.orb_exit_utc:
+        print(f"     Orbe de {PROGRESSED_PROFILE.default_orb}°: {crossing.orb_entry_utc.strftime('%Y-%m-%d')} → {crossing.orb_exit_utc.strftime('%Y-%m-%d')}")
+    print(f"     Luna progresada: {degrees_to_sign_format(crossing.longitude)}")
+    print(f"     Evaluaciones: {crossing.evaluations}")
+    return (local_date, abs(signed_difference(crossing.longitude, natal_pos)), crossing.longitude)
+
+def find_aspects_sweep(target_year):
+    """
+    Aspectos de Luna progresada (PROGRESSED_PROFILE.aspects) a todos los planetas natales
+    en una sola pasada: la trayectoria se calcula una vez para todo el año.
+    """
+    # No buscar aspectos de Luna progresada con la Luna natal
+    natal_points = {name: lon for name, lon in NATAL_POSITIONS.items() if name != 'Moon'}
+    
+    start_date = datetime(target_year, 1, 1, tzinfo=BIRTH_DATA['timezone'])
+    end_date = datetime(target_year, 12, 31, 23, 59, tzinfo=BIRTH_DATA['timezone'])
+    
+    hits = sweep_aspects(
+        NATIVE,
+        natal_points,
+        utc_to_jd(start_date),
+        utc_to_jd(end_date),
+        aspects=PROGRESSED_PROFILE.aspects
+    )
+    
+    return [
+        (hit.point, (hit.crossing.exact_utc.astimezone(BIRTH_DATA['timezone']),
+                     abs(signed_difference(hit.crossing.longitude, hit.crossing.target)),
+                     hit.crossing.longitude))
+        for hit in hits
+    ]
+
 def main():
     """Función principal del script"""
     print("🌙 SCRIPT DE PRUEBA: Algoritmo Simplificado de Luna Progresada")
     print("=" * 60)
     print(f"Datos natales: {BIRTH_DATA['date'].strftime('%d/%m/%Y %H:%M')} - Buenos Aires")
-    print(f"Orbe máximo: {settings.default_orb}°")
+    print(f"Orbe máximo: {PROGRESSED_PROFILE.default_orb}°")
     print("=" * 60)
     
-    # Pedir año al usuario
-    while True:
+    # Año por argumento (uso no interactivo); si no se pasa, pedirlo al usuario
+    target_year = None
+    if len(sys.argv) > 1:
+        try:
+            target_year = int(sys.argv[1])
+        except ValueError:
+            target_year = 0
+        if not 1900 <= target_year <= 2100:
+            print(f"❌ Año inválido: {sys.argv[1]!r}")
+            print(f"Uso: python {os.path.basename(sys.argv[0])} [AÑO entre 1900 y 2100]")
+            sys.exit(2)
+    while target_year is None:
         try:
             year_input = input("\n¿Para qué año buscar conjunciones? (ej: 2025): ")
             target_year = int(year_input)
-            if 1900 <= target_year <= 2100:
-                break
-            else:
+            if not 1900 <= target_year <= 2100:
+                target_year = None
                 print("Por favor ingresa un año entre 1900 y 2100")
         except ValueError:
             print("Por favor ingresa un año válido")
     
     print(f"\n🔍 Buscando conjunciones de Luna progresada para el año {target_year}...")
     
-    # Buscar conjunciones con cada planeta
-    conjunctions_found = []
-    
-    for planet_name in NATAL_POSITIONS.keys():
-        if planet_name != 'Moon':  # No buscar conjunción de Luna progresada consigo misma
-            result = find_conjunction_simple(planet_name, target_year)
-            if result:
-                conjunctions_found.append((planet_name, result))
+    # Buscar conjunciones con todos los planetas en una sola pasada
+    conjunctions_found = find_aspects_sweep(target_year)
     
     # Mostrar resumen
     print("\n" + "=" * 60)
@@ -233,7 +284,7 @@ def main():
         
         for planet_name, (conj_date, orb, prog_pos) in conjunctions_found:
             print(f"🌙 Luna progresada ♂ {planet_name}")
-            print(f"   Fecha: {conj_date.strftime('%d/%m/%Y')}")
+            print(f"   Fecha: {conj_date.strftime('%d/%m/%Y %H:%M')}")
             print(f"   Orbe: {orb:.2f}°")
             print(f"   Posición: {degrees_to_sign_format(prog_pos)}")
             print()
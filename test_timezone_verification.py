@@ -4,9 +4,13 @@ Script para verificar exactamente cómo se manejan las zonas horarias
 en el algoritmo de Luna progresada.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
+import numpy as np
+
+from timezone_table import get_zone
+
 # Configuración igual al script principal
 BIRTH_DATA = {
     'date': datetime(1964, 12, 26, 21, 12, tzinfo=ZoneInfo("America/Argentina/Buenos_Aires")),
@@ -102,12 +106,56 @@ def verify_astroseek_comparison():
     same_day_utc = algorithm_utc.date() == astroseek_utc.date()
     print(f"   Mismo día en UTC: {same_day_utc}")
 
+def verify_offset_table():
+    """Compara la tabla compilada (conversión vectorizada) con ZoneInfo muestra por muestra"""
+    
+    print("\n" + "=" * 50)
+    print("🗂️  TABLA HISTÓRICA DE OFFSETS (VECTORIZADA)")
+    print("=" * 50)
+    
+    zone_name = str(BIRTH_DATA['timezone'])
+    zone = get_zone(zone_name)
+    print(f"📚 {zone}")
+    
+    # Nacimiento de 1964: offset histórico de Buenos Aires
+    birth_local = np.datetime64(BIRTH_DATA['date'].replace(tzinfo=None), 's')
+    conversion = zone.to_utc([birth_local])
+    expected = BIRTH_DATA['date'].astimezone(timezone.utc).replace(tzinfo=None)
+    print(f"\n👶 Nacimiento {birth_local} → {conversion.utc[0]} UTC "
+          f"(offset {conversion.offsets[0] / 3600:+.0f} h, ZoneInfo: {expected})")
+    
+    # Un año de muestras horarias en una sola operación
+    target_year = 2024
+    hours = np.arange(f'{target_year}-01-01T00', f'{target_year + 1}-01-01T00', dtype='datetime64[h]')
+    conversion = zone.to_utc(hours)
+    reference = np.array([
+        np.datetime64(moment.replace(tzinfo=BIRTH_DATA['timezone']).astimezone(timezone.utc).replace(tzinfo=None), 's')
+        for moment in hours.astype(datetime)
+    ])
+    mismatches = int((conversion.utc != reference).sum())
+    print(f"\n⏱️  {len(hours)} horas de {target_year} convertidas en un solo searchsorted")
+    print(f"   Diferencias con ZoneInfo: {mismatches}")
+    print(f"   Ambiguas: {int(conversion.ambiguous.sum())} | Inexistentes: {int(conversion.nonexistent.sum())}")
+    print(f"   Ida y vuelta exacta: {bool((zone.to_local(conversion.utc) == hours).all())}")
+    
+    # Cambios de hora históricos de Argentina: horas repetidas y salteadas
+    history = np.arange('1960-01-01T00', '2010-01-01T00', dtype='datetime64[h]')
+    conversion = zone.to_utc(history)
+    print(f"\n🔁 1960-2009: {int(conversion.ambiguous.sum())} horas ambiguas, "
+          f"{int(conversion.nonexistent.sum())} inexistentes")
+    for label, mask in (("Ambigua", conversion.ambiguous), ("Inexistente", conversion.nonexistent)):
+        if mask.any():
+            print(f"   {label} (primera): {history[mask][0]}")
+    
+    return mismatches == 0
+
 if __name__ == "__main__":
     print("🌙 VERIFICACIÓN DE ZONAS HORARIAS - ALGORITMO LUNA PROGRESADA")
     print("=" * 70)
     
     best_date = test_timezone_handling()
     verify_astroseek_comparison()
+    table_ok = verify_offset_table()
     
     print("\n" + "=" * 70)
     print("📋 CONCLUSIÓN:")
@@ -116,3 +164,4 @@ if __name__ == "__main__":
     print("✅ Los cálculos internos se hacen en UTC (estándar astronómico)")
     print("✅ Las diferencias con AstroSeek son normales (1 día de diferencia)")
     print("✅ La zona horaria se maneja correctamente")
+    print(f"{'✅' if table_ok else '❌'} La tabla de offsets coincide con ZoneInfo")
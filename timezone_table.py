@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Tabla histórica de husos horarios y conversión vectorizada hora local <-> UTC.
+
+Los scripts de Luna progresada y de verificación crean objetos ZoneInfo y
+llaman a astimezone muestra por muestra. Este módulo compila una vez la
+historia de transiciones de cada zona en dos arrays ordenados:
+- transitions: instantes UTC (segundos Unix) en que cambia el offset.
+- offsets: offset en segundos vigente antes de la primera transición y
+  después de cada una (len(transitions) + 1).
+
+Con eso, convertir un array de horas es un searchsorted:
+- UTC -> local: offset = offsets[searchsorted(transitions, utc, 'right')].
+- local -> UTC: se prueban los dos offsets candidatos alrededor de la hora
+  local y se marcan explícitamente las horas ambiguas (repetidas al atrasar
+  el reloj) y las inexistentes (salteadas al adelantarlo). Para resolverlas
+  se usa fold con la misma semántica que datetime/zoneinfo (PEP 495).
+
+Las transiciones salen del archivo TZif de la base de zonas del sistema
+(zoneinfo.TZPATH o el paquete tzdata). Después de la última transición
+explícita rige la regla POSIX del pie del archivo; si tiene horario de
+verano, sus transiciones hasta END_YEAR se obtienen de ZoneInfo (muestreo
+diario y bisección al segundo). Las zonas compiladas quedan en cache.
+
+Uso:
+    from timezone_table import get_zone
+
+    zone = get_zone('America/Argentina/Buenos_Aires')
+    horas = np.arange('2024-01-01T00', '2025-01-01T00', dtype='datetime64[h]')
+    conversion = zone.to_utc(horas)         # LocalConversion
+    conversion.utc, conversion.ambiguous, conversion.nonexistent
+    zone.to_local(conversion.utc)           # vuelta a hora local
+"""
+
+import struct
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+from zoneinfo import TZPATH, ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+# Año hasta el que se expanden las reglas de horario de verano del pie TZif
+END_YEAR = 2100
+
+SECONDS_PER_DAY = 86400
+
+_HEADER = struct.Struct('>4sc15x6l')
+
+
+@dataclass
+class LocalConversion:
+    """Resultado de convertir horas locales a UTC."""
+    # Instantes UTC (datetime64 con la resolución de la entrada, como mínimo segundos)
+    utc: np.ndarray
+    # Offset aplicado a cada muestra, en segundos
+    offsets: np.ndarray
+    # Hora local repetida (dos instantes UTC posibles; se eligió según fold)
+    ambiguous: np.ndarray
+    # Hora local salteada por un cambio de hora (no existe; se corrió según fold)
+    nonexistent: np.ndarray
+
+    @property
+    def valid(self):
+        """Máscara de las muestras sin ambigüedad"""
+        return ~(self.ambiguous | self.nonexistent)
+
+
+def _tzif_bytes(key):
+    """Archivo TZif de una zona (TZPATH del sistema o paquete tzdata)"""
+    if not key or key.startswith('/') or '..' in key.split('/'):
+        raise ZoneInfoNotFoundError(f"Zona inválida: {key!r}")
+    for directory in TZPATH:
+        path = Path(directory) / key
+        if path.is_file():
+            return path.read_bytes()
+    try:
+        package = resources.files('tzdata').joinpath('zoneinfo', *key.split('/'))
+        return package.read_bytes()
+    except (ModuleNotFoundError, FileNotFoundError, NotADirectoryError) as e:
+        raise ZoneInfoNotFoundError(f"No se encontró la zona {key!r}") from e
+
+
+def _read_block(data, offset, time_size):
+    """Transiciones y offsets de un bloque de datos TZif (v1: 4 bytes, v2+: 8 bytes)"""
+    magic, version, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = _HEADER.unpack_from(data, offset)
+    if magic != b'TZif':
+        raise ValueError("Archivo TZif inválido")
+    offset += _HEADER.size
+    times = np.frombuffer(data, dtype='>i8' if time_size == 8 else '>i4', count=timecnt, offset=offset)
+    offset += timecnt * time_size
+    indices = np.frombuffer(data, dtype=np.uint8, count=timecnt, offset=offset)
+    offset += timecnt
+    utoffs = np.array([struct.unpack_from('>l', data, offset + 6 * index)[0] for index in range(typecnt)],
+                      dtype=np.int64)
+    offset += 6 * typecnt + charcnt + leapcnt * (time_size + 4) + isstdcnt + isutcnt
+    return version, times.astype(np.int64), utoffs[indices], utoffs[0], offset
+
+
+def parse_tzif(data):
+    """
+    (transitions, offsets, footer) de un archivo TZif. Se descartan las
+    transiciones que no cambian el offset (sólo abreviatura o isdst).
+    """
+    version, times, after, initial, end = _read_block(data, 0, 4)
+    footer = ''
+    if version >= b'2':
+        _, times, after, initial, end = _read_block(data, end, 8)
+        footer = data[end:].decode('ascii').strip()
+
+    offsets = np.concatenate(([initial], after))
+    changed = offsets[1:] != offsets[:-1]
+    return times[changed], np.concatenate(([initial], after[changed])), footer
+
+
+def _rule_transitions(zone, start, end):
+    """Transiciones de ZoneInfo en [start, end) (segundos Unix): muestreo diario y bisección"""
+    def offset_at(seconds):
+        return int(datetime.fromtimestamp(seconds, zone).utcoffset().total_seconds())
+
+    transitions, offsets = [], []
+    previous, previous_offset = start, offset_at(start)
+    for current in range(start + SECONDS_PER_DAY, end + SECONDS_PER_DAY, SECONDS_PER_DAY):
+        current_offset = offset_at(current)
+        if current_offset == previous_offset:
+            previous = current
+            continue
+        low, high = previous, current
+        while high - low > 1:
+            middle = (low + high) // 2
+            if offset_at(middle) == previous_offset:
+                low = middle
+            else:
+                high = middle
+        transitions.append(high)
+        offsets.append(current_offset)
+        previous, previous_offset = current, current_offset
+    return transitions, offsets
+
+
+class ZoneTable:
+    """Historia de offsets de una zona como arrays ordenados."""
+
+    def __init__(self, key, transitions, offsets):
+        self.key = key
+        self.transitions = np.asarray(transitions, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        if self.offsets.size != self.transitions.size + 1:
+            raise ValueError("offsets debe tener una entrada más que transitions")
+        # Transición expresada en hora local previa (orden de búsqueda para local -> UTC)
+        self._local_before = self.transitions + self.offsets[:-1]
+
+    def __repr__(self):
+        return f"ZoneTable({self.key!r}, {self.transitions.size} transiciones)"
+
+    @classmethod
+    def compile(cls, key, end_year=END_YEAR):
+        """Compila la zona desde su archivo TZif (más la regla del pie hasta end_year)"""
+        transitions, offsets, footer = parse_tzif(_tzif_bytes(key))
+        # Pie POSIX con regla de horario de verano ("STD3DST,M10.1.0,M3.3.0")
+        if ',' in footer:
+            start = int(transitions[-1]) if transitions.size else 0
+            end = int(datetime(end_year + 1, 1, 1, tzinfo=timezone.utc).timestamp())
+            extra, extra_offsets = _rule_transitions(ZoneInfo(key), start + 1, end)
+            if extra:
+                transitions = np.concatenate((transitions, extra))
+                offsets = np.concatenate((offsets, extra_offsets))
+        return cls(key, transitions, offsets)
+
+    def utcoffset(self, utc_seconds):
+        """Offset en segundos vigente en instantes UTC (segundos Unix)"""
+        return self.offsets[np.searchsorted(self.transitions, utc_seconds, side='right')]
+
+    def to_local(self, utc):
+        """
+        Instantes UTC (datetime64 o segundos Unix) a hora local naive.
+        Devuelve datetime64 con la resolución de la entrada (como mínimo
+        segundos).
+        """
+        utc = _as_datetime64(utc)
+        seconds = utc.astype('datetime64[s]').astype(np.int64)
+        return utc + self.utcoffset(seconds).astype('timedelta64[s]')
+
+    def to_utc(self, local, fold=0, errors='flag'):
+        """
+        Horas locales naive (datetime64 o segundos) a UTC.
+
+        Las ambiguas toman el offset previo al cambio con fold=0 y el
+        posterior con fold=1; las inexistentes se corren con el offset previo
+        (fold=0) o el posterior (fold=1), igual que zoneinfo. Con
+        errors='raise' se lanza ValueError si alguna es ambigua o inexistente.
+        """
+        local = _as_datetime64(local)
+        seconds = local.astype('datetime64[s]').astype(np.int64)
+
+        # Offsets candidatos: el vigente según la hora local y el siguiente
+        count = np.searchsorted(self._local_before, seconds, side='right')
+        last = self.offsets.size - 1
+        current = self.offsets[count]
+        following = self.offsets[np.minimum(count + 1, last)]
+        previous = self.offsets[np.maximum(count - 1, 0)]
+        current_valid = np.searchsorted(self.transitions, seconds - current, side='right') == count
+        following_valid = (count < last) & (
+            np.searchsorted(self.transitions, seconds - following, side='right') == count + 1)
+
+        ambiguous = current_valid & following_valid
+        nonexistent = ~(current_valid | following_valid)
+        if errors == 'raise' and (ambiguous.any() or nonexistent.any()):
+            raise ValueError(f"{int(ambiguous.sum())} horas ambiguas y {int(nonexistent.sum())} "
+                             f"inexistentes en {self.key}")
+
+        if fold:
+            offsets = np.where(following_valid, following, current)
+        else:
+            offsets = np.where(current_valid, current, np.where(following_valid, following, previous))
+        return LocalConversion(local - offsets.astype('timedelta64[s]'), offsets, ambiguous, nonexistent)
+
+
+def _as_datetime64(values):
+    """datetime64 tal cual; números como segundos Unix; datetimes naive vía numpy"""
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        return values
+    if values.dtype.kind in 'iuf':
+        return values.astype(np.int64).astype('datetime64[s]')
+    return values.astype('datetime64[us]')
+
+
+@lru_cache(maxsize=None)
+def get_zone(key):
+    """ZoneTable compilada de una zona (en cache por proceso)"""
+    return ZoneTable.compile(key)
+
+
+def local_to_utc(local, key, fold=0, errors='flag'):
+    return get_zone(key).to_utc(local, fold=fold, errors=errors)
+
+
+def utc_to_local(utc, key):
+    return get_zone(key).to_local(utc)
+
+
+def main():
+    key = sys.argv[1] if len(sys.argv) > 1 else 'America/Argentina/Buenos_Aires'
+    zone = get_zone(key)
+    print(f"🕐 {zone}")
+    for transition, offset in zip(zone.transitions, zone.offsets[1:]):
+        moment = datetime.fromtimestamp(int(transition), timezone.utc)
+        print(f"  {moment:%Y-%m-%d %H:%M:%S} UTC → {offset / 3600:+.2f} h")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Índice compilado y persistente de los títulos objetivo del interpretador.
+
+load_target_titles_from_file (diagnostico_eventos_detectables.py, copia del
+cargador de producción) corre hasta cinco regex por línea y varios re.sub
+de normalización en cada arranque, y la búsqueda es pertenencia exacta a un
+set: un título generado que difiere apenas ("conjunción a lilith" vs
+"conjunción lilith", "casa dos" vs "casa 2") no coincide.
+
+TitleIndex:
+1. Parsea el markdown de títulos una sola vez con las mismas reglas del
+   cargador (mismo conjunto de títulos) y regex precompiladas.
+2. Precalcula una tabla de alias: cada título se reduce a una clave
+   canónica (sin la preposición "a" ni "en" alrededor del aspecto, números
+   de casa en dígitos, sin "otra opcion"); cualquier variante con la misma
+   clave resuelve al título objetivo.
+3. Persiste títulos y alias en un JSON junto al markdown. Se invalida por
+   mtime y tamaño del archivo; si cambió el mtime pero no el contenido
+   (hash SHA-256) se reutiliza.
+
+La búsqueda es un get de dict (exacto) y, si falla, la clave canónica y
+otro get: microsegundos por evento.
+
+Uso:
+    index = TitleIndex.load('../astro_interpretador_rag_fastapi/data/Títulos Numerados tropico.md')
+    index.find("aspecto sol conjunción a lilith")   # -> "aspecto sol conjunción lilith"
+    index.match_events(eventos)                      # título o None por evento
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.index.json'
+
+ASPECT_KEYWORDS = ("conjunción", "oposición", "cuadratura", "trígono", "sextil")
+
+# Números de casa escritos en palabras -> dígitos
+NUMBER_WORDS = {
+    'uno': '1', 'dos': '2', 'tres': '3', 'cuatro': '4', 'cinco': '5', 'seis': '6',
+    'siete': '7', 'ocho': '8', 'nueve': '9', 'diez': '10', 'once': '11', 'doce': '12',
+}
+
+# Sufijos de notas del editor que no forman parte del título
+NOTE_SUFFIXES = (' otra opcion', ' otra opción')
+
+# Regex del cargador de producción, compiladas una vez
+_HEADER = re.compile(r"^#{2,4}\s*\d+(?:\.\d+)*\s+(.*)")
+_RETROGRADE_HEADER = re.compile(r"^## \d+\.\d+\s+([A-ZÁÉÍÓÚÜÑ]+\s+RETRÓGRADO).*")
+_RETROGRADE_LINE = re.compile(r"^[A-Z\s]+ RETRÓGRADO")
+_DEGREES = re.compile(r'\s*\(\d+°.*?\)')
+_COLON = re.compile(r':.*')
+_ASPECT = re.compile(r"aspecto\s+([a-záéíóúüñ]+)\s+(.*?)\s+a\s+([a-záéíóúüñ]+)")
+
+
+def normalize_title(title):
+    """Normalización del cargador: sin grados ni ':' en adelante, minúsculas, espacios simples"""
+    if '(' in title:
+        title = _DEGREES.sub('', title)
+    if ':' in title:
+        title = _COLON.sub('', title)
+    title = ' '.join(title.lower().split())
+    return title.replace(" en casa dos", " en casa 2")
+
+
+def _is_relevant(title):
+    return (title.startswith("aspecto ") or " en " in title or title.endswith(" retrógrado")
+            or " en el ascendente" in title)
+
+
+def parse_titles(lines):
+    """
+    Títulos objetivo desde las líneas del markdown, con las mismas reglas que
+    load_target_titles_from_file (devuelve el mismo conjunto).
+    """
+    titles = set()
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        match = _HEADER.match(line)
+        if match:
+            raw = match.group(1).strip()
+        else:
+            match = _RETROGRADE_HEADER.match(line)
+            if match:
+                raw = match.group(1).strip()
+            elif _RETROGRADE_LINE.match(line):
+                raw = line
+            else:
+                continue
+
+        title = normalize_title(raw)
+        if not _is_relevant(title):
+            continue
+
+        aspect = _ASPECT.match(title) if title.startswith("aspecto ") else None
+        if aspect:
+            planet1, aspect_part, planet2 = aspect.groups()
+            found = [keyword for keyword in ASPECT_KEYWORDS if keyword in aspect_part.split()]
+            if found:
+                titles.update(f"aspecto {planet1} {keyword} a {planet2}" for keyword in found)
+                continue
+        titles.add(title)
+    return titles
+
+
+def canonical_key(title):
+    """
+    Clave canónica para alias: normaliza, pasa los números de casa a dígitos,
+    saca las notas del editor y, en los aspectos, la preposición "en" antes
+    del aspecto y "a"/"con" después.
+    """
+    title = normalize_title(title)
+    for suffix in NOTE_SUFFIXES:
+        if title.endswith(suffix):
+            title = title[:-len(suffix)]
+    words = [NUMBER_WORDS.get(word, word) for word in title.split()]
+
+    if words and words[0] == 'aspecto':
+        kept = []
+        for position, word in enumerate(words):
+            following = words[position + 1] if position + 1 < len(words) else None
+            previous = kept[-1] if kept else None
+            if word == 'en' and following in ASPECT_KEYWORDS:
+                continue
+            if word in ('a', 'con') and previous in ASPECT_KEYWORDS:
+                continue
+            kept.append(word)
+        words = kept
+    return ' '.join(words)
+
+
+def build_aliases(titles):
+    """
+    Tabla clave canónica -> título objetivo. Si dos títulos comparten clave
+    gana el primero en orden alfabético (el resto queda en conflicts).
+    """
+    aliases = {}
+    conflicts = {}
+    for title in sorted(titles):
+        key = canonical_key(title)
+        if key in aliases and aliases[key] != title:
+            conflicts.setdefault(key, [aliases[key]]).append(title)
+            continue
+        aliases[key] = title
+    return aliases, conflicts
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def event_query(event):
+    """
+    Título de consulta de un evento del calendario: los aspectos se arman
+    como "aspecto {planeta1} {aspecto} {planeta2}", el resto usa la descripción.
+    """
+    if event.get('planeta1') and event.get('planeta2') and event.get('tipo_aspecto'):
+        return f"aspecto {event['planeta1']} {event['tipo_aspecto']} {event['planeta2']}".lower()
+    return event.get('descripcion', '').lower()
+
+
+def event_title(event):
+    """
+    Título de catálogo de un evento para buscar su interpretación: el de
+    metadata.titulo_catalogo si lo trae (las estaciones de transit_engine
+    agregan " (estacionario)" a la descripción), si no la descripción o la
+    consulta de event_query.
+    """
+    metadata = event.get('metadata') or {}
+    return metadata.get('titulo_catalogo') or event.get('descripcion') or event_query(event)
+
+
+class TitleIndex:
+    """Títulos objetivo con búsqueda exacta y por alias en O(1)."""
+
+    def __init__(self, titles, aliases, conflicts=None, source=None):
+        self.titles = frozenset(titles)
+        self.aliases = aliases
+        self.conflicts = conflicts or {}
+        self.source = source
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __contains__(self, title):
+        return title in self.titles
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as f:
+            titles = parse_titles(f)
+        aliases, conflicts = build_aliases(titles)
+        return cls(titles, aliases, conflicts, str(path))
+
+    @classmethod
+    def load(cls, path, cache_path=None):
+        """
+        Índice del archivo de títulos, desde el cache persistido si sigue
+        vigente; si no, lo parsea y reescribe el cache.
+        """
+        path = Path(path)
+        cache_path = Path(cache_path) if cache_path else path.with_name(path.name + INDEX_SUFFIX)
+        stat = path.stat()
+
+        cached = None
+        if cache_path.is_file():
+            try:
+                cached = json.loads(cache_path.read_text(encoding='utf-8'))
+            except ValueError:
+                cached = None
+        if cached and cached.get('version') == INDEX_VERSION:
+            if cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                return cls._from_cache(cached, path)
+            digest = file_digest(path)
+            if cached['sha256'] == digest:
+                cached.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                _write_cache(cache_path, cached)
+                return cls._from_cache(cached, path)
+        else:
+            digest = file_digest(path)
+
+        index = cls.from_file(path)
+        _write_cache(cache_path, {
+            'version': INDEX_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'titles': sorted(index.titles),
+            'aliases': index.aliases,
+            'conflicts': index.conflicts,
+        })
+        return index
+
+    @classmethod
+    def _from_cache(cls, cached, path):
+        return cls(cached['titles'], cached['aliases'], cached.get('conflicts'), str(path))
+
+    def find(self, title):
+        """Título objetivo que corresponde a `title` (exacto o por alias), o None"""
+        if title in self.titles:
+            return title
+        return self.aliases.get(canonical_key(title))
+
+    def match_events(self, events):
+        """Título objetivo de cada evento del calendario (None si no hay)"""
+        return [self.find(event_query(event)) for event in events]
+
+
+def _write_cache(cache_path, data):
+    """Escritura atómica del cache (archivo temporal + os.replace)"""
+    temporary = f'{cache_path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temporary, cache_path)
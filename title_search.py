@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Índice invertido de tokens y trigramas para emparejar títulos de eventos
+con los títulos de interpretación.
+
+Hoy un título que no coincide exacto cae en reglas ad-hoc
+(_flexible_title_match en el interpretador, search_specific_patterns en el
+diagnóstico) o en un recorrido lineal de todos los títulos.
+TitleSearchIndex, en cambio, construye una vez sobre el conjunto normalizado:
+- Un índice token -> títulos y los "slots" de cada título: planetas/puntos
+  en orden, aspecto, signo y casa.
+- Un índice de trigramas de caracteres sobre el vocabulario, para corregir
+  tokens mal escritos o sin tildes ("mercuro", "pluton") antes de buscar.
+
+Una consulta se tokeniza igual y toma como candidatos la intersección de las
+listas de sus slots. Cada candidato se puntúa por coincidencia de slots
+(orden de planetas incluido) y Jaccard del resto de tokens. Se devuelve el
+mejor con una confianza en [0, 1]. match_events resuelve todos los eventos
+de un calendario y memoriza las consultas repetidas.
+
+Uso:
+    index = TitleSearchIndex(load_catalog_titles())
+    index.best("sol en transito conjuncion a saturno natal")
+    # -> ('Sol en tránsito conjunción Saturno natal', 1.0)
+    index.match_events(eventos)
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+from title_index import NUMBER_WORDS, event_title
+
+CATALOG_PATH = Path(__file__).resolve().parent / 'TITULOS_EVENTOS_PERSONALES_COMPLETOS.txt'
+
+# Vocabulario de slots (sin tildes, como quedan tras fold_title)
+PLANETS = ('sol', 'luna', 'mercurio', 'venus', 'marte', 'jupiter', 'saturno', 'urano', 'neptuno',
+           'pluton', 'quiron', 'lilith', 'ascendente', 'mc', 'nodo_norte', 'nodo_sur')
+ASPECTS = ('conjuncion', 'oposicion', 'cuadratura', 'trigono', 'sextil')
+SIGNS = ('aries', 'tauro', 'geminis', 'cancer', 'leo', 'virgo', 'libra', 'escorpio', 'sagitario',
+         'capricornio', 'acuario', 'piscis')
+
+# Expresiones de varias palabras que son un solo punto
+COMPOUNDS = {
+    'nodo norte': 'nodo_norte',
+    'nodo sur': 'nodo_sur',
+    'medio cielo': 'mc',
+    'medio de cielo': 'mc',
+}
+
+# Palabras sin peso para el puntaje de tokens
+STOPWORDS = frozenset(('a', 'en', 'de', 'del', 'el', 'la', 'los', 'las', 'con', 'y', 'al', 'aspecto'))
+
+SLOT_WEIGHT = 0.75
+TOKEN_WEIGHT = 0.25
+DEFAULT_MIN_CONFIDENCE = 0.85
+# Dice mínimo de trigramas para corregir un token desconocido
+MIN_TOKEN_SIMILARITY = 0.5
+
+_DEGREES = re.compile(r'\(\d+°.*?\)')
+
+
+def load_catalog_titles(path=CATALOG_PATH):
+    """
+    Títulos de TITULOS_EVENTOS_PERSONALES_COMPLETOS.txt: las líneas de
+    contenido, sin comentarios, separadores, encabezados ni el resumen.
+    """
+    titles = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] in '#=-' or line[0].isdigit() or line.isupper():
+                continue
+            if ':' in line and line.split(':', 1)[0].isupper():
+                continue
+            titles.append(line)
+    return titles
+
+
+def fold_title(text):
+    """
+    Minúsculas, sin grados entre paréntesis, tildes ni puntuación, números
+    de casa en dígitos y compuestos unidos. A diferencia de normalize_title
+    conserva lo que sigue a ':' ("Cambio de Señor del Año: Marte").
+    """
+    text = _DEGREES.sub(' ', text.lower())
+    text = unicodedata.normalize('NFD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = ''.join(char if char.isalnum() or char == '_' else ' ' for char in text)
+    text = ' '.join(NUMBER_WORDS.get(word, word) for word in text.split())
+    for compound, token in COMPOUNDS.items():
+        if compound in text:
+            text = text.replace(compound, token)
+    return text
+
+
+def _trigrams(token):
+    padded = f'  {token} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def _slots(tokens):
+    """(planetas en orden, aspecto, signo, casa) de una lista de tokens"""
+    planets = tuple(token for token in tokens if token in _PLANET_SET)
+    aspect = next((token for token in tokens if token in _ASPECT_SET), None)
+    sign = next((token for token in tokens if token in _SIGN_SET), None)
+    house = None
+    for position, token in enumerate(tokens[:-1]):
+        if token == 'casa' and tokens[position + 1].isdigit():
+            house = tokens[position + 1]
+            break
+    return planets, aspect, sign, house
+
+
+_PLANET_SET = frozenset(PLANETS)
+_ASPECT_SET = frozenset(ASPECTS)
+_SIGN_SET = frozenset(SIGNS)
+
+
+def _slot_score(query, candidate):
+    """Fracción de slots en común; el orden de los planetas cuenta a medias"""
+    total = 0
+    score = 0.0
+    if query[0] or candidate[0]:
+        total += 2
+        if query[0] == candidate[0]:
+            score += 2
+        elif set(query[0]) == set(candidate[0]):
+            score += 1
+    for slot in range(1, 4):
+        if query[slot] is not None or candidate[slot] is not None:
+            total += 1
+            score += query[slot] == candidate[slot]
+    return score / total if total else 0.0
+
+
+class TitleSearchIndex:
+    """Índice de tokens y trigramas sobre un conjunto de títulos."""
+
+    def __init__(self, titles):
+        self.titles = list(dict.fromkeys(titles))
+        self.tokens = []
+        self.slots = []
+        self.postings = defaultdict(set)
+        self.exact = {}
+
+        for title_id, title in enumerate(self.titles):
+            tokens = fold_title(title).split()
+            self.tokens.append(frozenset(tokens) - STOPWORDS)
+            self.slots.append(_slots(tokens))
+            self.exact.setdefault(' '.join(tokens), title_id)
+            for token in tokens:
+                self.postings[token].add(title_id)
+
+        # Trigramas del vocabulario para corregir tokens desconocidos
+        self.vocabulary = sorted(self.postings)
+        self.trigrams = defaultdict(list)
+        for token in self.vocabulary:
+            for gram in _trigrams(token):
+                self.trigrams[gram].append(token)
+        self._corrections = {}
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.titles)
+
+    @classmethod
+    def from_file(cls, path=CATALOG_PATH):
+        return cls(load_catalog_titles(path))
+
+    def _correct(self, token):
+        """Token del vocabulario más parecido (Dice de trigramas) o el mismo token"""
+        if token in self.postings or token.isdigit():
+            return token
+        if token in self._corrections:
+            return self._corrections[token]
+
+        grams = _trigrams(token)
+        counts = defaultdict(int)
+        for gram in grams:
+            for candidate in self.trigrams.get(gram, ()):
+                counts[candidate] += 1
+        best, best_score = token, MIN_TOKEN_SIMILARITY
+        for candidate, shared in counts.items():
+            score = 2.0 * shared / (len(grams) + len(candidate) + 1)
+            if score > best_score:
+                best, best_score = candidate, score
+        self._corrections[token] = best
+        return best
+
+    def _candidates(self, tokens, slots):
+        """Intersección de las listas de los slots; si queda vacía, unión de todos los tokens"""
+        planets, aspect, sign, house = slots
+        keys = [*planets, aspect, sign, house and 'casa']
+        lists = [self.postings[key] for key in keys if key and key in self.postings]
+        if house:
+            lists.append(self.postings.get(house, set()))
+        if lists:
+            candidates = set.intersection(*sorted(lists, key=len))
+            if candidates:
+                return candidates
+        candidates = set()
+        for token in tokens:
+            if token not in STOPWORDS:
+                candidates |= self.postings.get(token, set())
+        return candidates
+
+    def search(self, query, limit=5):
+        """Los `limit` mejores títulos para la consulta: [(título, confianza)]"""
+        tokens = [self._correct(token) for token in fold_title(query).split()]
+        exact = self.exact.get(' '.join(tokens))
+        if exact is not None and limit == 1:
+            return [(self.titles[exact], 1.0)]
+
+        slots = _slots(tokens)
+        words = frozenset(tokens) - STOPWORDS
+        scored = []
+        for title_id in self._candidates(tokens, slots):
+            candidate_words = self.tokens[title_id]
+            union = len(words | candidate_words)
+            token_score = len(words & candidate_words) / union if union else 0.0
+            confidence = SLOT_WEIGHT * _slot_score(slots, self.slots[title_id]) + TOKEN_WEIGHT * token_score
+            scored.append((confidence, -title_id))
+        scored.sort(reverse=True)
+        return [(self.titles[-title_id], round(confidence, 4)) for confidence, title_id in scored[:limit]]
+
+    def best(self, query):
+        """(título, confianza) del mejor candidato, o (None, 0.0)"""
+        if query not in self._memo:
+            results = self.search(query, limit=1)
+            self._memo[query] = results[0] if results else (None, 0.0)
+        return self._memo[query]
+
+    def match(self, query, min_confidence=DEFAULT_MIN_CONFIDENCE):
+        """Mejor título si su confianza alcanza min_confidence, si no None"""
+        title, confidence = self.best(query)
+        return title if confidence >= min_confidence else None
+
+    def match_events(self, events, min_confidence=DEFAULT_MIN_CONFIDENCE):
+        """
+        Resuelve todos los eventos de un calendario: [(título o None, confianza)].
+        Usa el título de catálogo del evento (event_title): metadata.titulo_catalogo,
+        la descripción o la consulta armada con planeta1/tipo_aspecto/planeta2.
+        """
+        results = []
+        for event in events:
+            title, confidence = self.best(event_title(event))
+            results.append((title if confidence >= min_confidence else None, confidence))
+        return results
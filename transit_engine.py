@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Motor de tránsitos a la carta natal con los títulos del catálogo personal.
+
+TITULOS_EVENTOS_PERSONALES_COMPLETOS.txt define las familias de eventos del
+calendario personal; la sección 1 es "[Planeta] en tránsito [aspecto]
+[Planeta/Punto] natal" (9 planetas transitantes × puntos natales ×
+conjunción/cuadratura/oposición), exactos o estacionarios.
+
+Para un nativo y un año:
+1. Se toman las posiciones diarias de los planetas transitantes del año
+   (de la tabla mapeada en memoria de ephemeris_table si se pasa una, o de
+   swisseph; en ambos casos se reutilizan para todos los nativos del año).
+2. Se buscan en UNA pasada vectorizada todos los cambios de signo de
+   (tránsito - punto natal - aspecto) para todas las combinaciones.
+3. Cada cruce se refina con Brent sobre swisseph hasta el minuto.
+4. Las estaciones (cambio de signo de la velocidad) se refinan igual y se
+   emiten como evento estacionario si caen dentro del orbe del aspecto. Su
+   descripción es el título del catálogo con " (estacionario)"; el título
+   sin el agregado queda en metadata.titulo_catalogo (ver event_title en
+   title_index) para buscar su interpretación.
+
+Sólo se emiten combinaciones cuyo título existe en el catálogo.
+
+Uso:
+    carta = calcular_carta_natal(datos_usuario)
+    eventos = calcular_transitos(carta['points'], 2025)
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import swisseph as swe
+from immanuel import setup  # configura la ruta de archivos de efemérides de Immanuel
+
+from natal_chart_records import SIGNOS
+from julian_time import year_bounds
+from progressed_moon import brent, jd_to_utc
+
+CATALOG_PATH = Path(__file__).resolve().parent / 'TITULOS_EVENTOS_PERSONALES_COMPLETOS.txt'
+
+# Nombres del catálogo -> nombres de Immanuel / calcular_carta_natal
+PLANET_NAMES = {
+    'Sol': 'Sun',
+    'Luna': 'Moon',
+    'Mercurio': 'Mercury',
+    'Venus': 'Venus',
+    'Marte': 'Mars',
+    'Júpiter': 'Jupiter',
+    'Saturno': 'Saturn',
+    'Urano': 'Uranus',
+    'Neptuno': 'Neptune',
+    'Plutón': 'Pluto',
+    'Ascendente': 'Asc',
+    'MC': 'MC',
+}
+
+SWE_IDS = {
+    'Sun': swe.SUN,
+    'Mercury': swe.MERCURY,
+    'Venus': swe.VENUS,
+    'Mars': swe.MARS,
+    'Jupiter': swe.JUPITER,
+    'Saturn': swe.SATURN,
+    'Uranus': swe.URANUS,
+    'Neptune': swe.NEPTUNE,
+    'Pluto': swe.PLUTO,
+}
+
+# Aspecto del catálogo -> desplazamientos (la cuadratura es creciente y menguante)
+ASPECT_OFFSETS = {
+    'conjunción': (0.0,),
+    'cuadratura': (90.0, 270.0),
+    'oposición': (180.0,),
+}
+
+HARMONY = {
+    'conjunción': 'Neutro',
+    'cuadratura': 'Tensión',
+    'oposición': 'Tensión',
+}
+
+# Orbe dentro del cual una estación se emite como evento estacionario
+DEFAULT_STATION_ORB = 1.0
+
+# Agregado a la descripción de los eventos estacionarios
+STATION_SUFFIX = ' (estacionario)'
+
+FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+_TITLE_PATTERN = re.compile(r'^(\S+) en tránsito (\S+) (.+) natal$')
+
+
+@lru_cache(maxsize=4)
+def load_transit_catalog(path=CATALOG_PATH):
+    """
+    Títulos de tránsitos del catálogo: {(planeta, aspecto, punto): título}
+    con los nombres tal como aparecen en el archivo.
+    """
+    catalog = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            match = _TITLE_PATTERN.match(line.strip())
+            if match and match.group(2) in ASPECT_OFFSETS:
+                catalog[match.groups()] = line.strip()
+    return catalog
+
+
+def _swe_position(body_id, jd):
+    values = swe.calc_ut(jd, body_id, FLAGS)[0]
+    return values[0], values[3]
+
+
+@lru_cache(maxsize=8)
+def _sampled_year_swisseph(year, bodies):
+    """Posiciones y velocidades diarias del año (con un día de margen) desde swisseph"""
+    start_jd, end_jd = year_bounds(year)
+    jds = np.arange(start_jd - 1.0, end_jd + 1.5, 1.0)
+    longitudes = np.empty((len(bodies), len(jds)))
+    speeds = np.empty_like(longitudes)
+    for row, body in enumerate(bodies):
+        body_id = SWE_IDS[body]
+        for column, jd in enumerate(jds):
+            longitudes[row, column], speeds[row, column] = _swe_position(body_id, jd)
+    longitudes.setflags(write=False)
+    speeds.setflags(write=False)
+    return jds, longitudes, speeds
+
+
+def sample_year(year, bodies, table=None):
+    """
+    (jds, longitudes (B, S), velocidades (B, S)) diarias del año para los
+    cuerpos dados. Con una EphemerisTable se recorta el memmap sin llamar a
+    swisseph; sin ella se calcula una vez por año y se reutiliza.
+    """
+    bodies = tuple(bodies)
+    if table is None:
+        return _sampled_year_swisseph(year, bodies)
+
+    start_jd, end_jd = year_bounds(year)
+    series = [table.samples(body, start_jd - 1.0, end_jd + 1.0) for body in bodies]
+    jds = series[0][0]
+    longitudes = np.stack([samples[:, 0] for _, samples in series])
+    speeds = np.stack([samples[:, 2] for _, samples in series])
+    return jds, longitudes, speeds
+
+
+def _wrap(values):
+    return (values + 180.0) % 360.0 - 180.0
+
+
+def _format_position(longitude):
+    """Posición como en los eventos generales: 1°08' Leo"""
+    longitude %= 360.0
+    degrees = longitude % 30.0
+    return f"{int(degrees)}°{int((degrees % 1) * 60):02d}' {SIGNOS[int(longitude // 30)]}"
+
+
+def _event(title, jd, planet, natal_point, aspect, transit_longitude, natal_longitude, orb, station):
+    moment = jd_to_utc(jd)
+    return {
+        'fecha_utc': moment.strftime('%Y-%m-%d'),
+        'hora_utc': moment.strftime('%H:%M'),
+        'tipo_evento': 'Aspecto',
+        'descripcion': title + STATION_SUFFIX if station else title,
+        'planeta1': planet,
+        'planeta2': natal_point,
+        'posicion1': _format_position(transit_longitude),
+        'posicion2': _format_position(natal_longitude),
+        'tipo_aspecto': aspect.capitalize(),
+        'orbe': f"{orb:.2f}°",
+        'es_aplicativo': 'No',
+        'harmony': HARMONY[aspect],
+        'metadata': {'estacionario': station, 'titulo_catalogo': title, 'jd': jd}
+    }
+
+
+def calcular_transitos(natal_points, year, table=None, station_orb=DEFAULT_STATION_ORB,
+                       catalog_path=CATALOG_PATH):
+    """
+    Eventos de tránsito a la carta natal de un año, ordenados por fecha.
+
+    Args:
+        natal_points: result['points'] de calcular_carta_natal (nombre -> {'longitude': ...})
+        year: año calendario (UTC)
+        table: EphemerisTable opcional para el muestreo
+        station_orb: orbe para emitir estaciones dentro de un aspecto
+
+    Returns:
+        lista de eventos con el formato del calendario (tipo_evento 'Aspecto',
+        descripcion = título del catálogo, con " (estacionario)" en las
+        estaciones; metadata.estacionario y metadata.titulo_catalogo)
+    """
+    catalog = load_transit_catalog(catalog_path)
+
+    planets = sorted({planet for planet, _, _ in catalog if PLANET_NAMES.get(planet) in SWE_IDS},
+                     key=lambda name: list(PLANET_NAMES).index(name))
+    points = [point for point in PLANET_NAMES if PLANET_NAMES[point] in natal_points
+              and any(key[2] == point for key in catalog)]
+    bodies = tuple(PLANET_NAMES[planet] for planet in planets)
+
+    # Objetivos: punto natal + desplazamiento del aspecto
+    target_point, target_aspect, target_longitude = [], [], []
+    for point in points:
+        natal_longitude = natal_points[PLANET_NAMES[point]]['longitude']
+        for aspect, offsets in ASPECT_OFFSETS.items():
+            for offset in offsets:
+                target_point.append(point)
+                target_aspect.append(aspect)
+                target_longitude.append((natal_longitude + offset) % 360.0)
+    target_longitude = np.array(target_longitude)
+    natal_longitudes = {point: natal_points[PLANET_NAMES[point]]['longitude'] for point in points}
+
+    jds, longitudes, speeds = sample_year(year, bodies, table)
+    start_jd, end_jd = year_bounds(year)
+
+    # Pasada vectorizada: (cuerpos, objetivos, muestras)
+    difference = _wrap(longitudes[:, None, :] - target_longitude[None, :, None])
+    before, after = difference[..., :-1], difference[..., 1:]
+    crossing = (np.signbit(before) != np.signbit(after)) & (np.abs(after - before) < 90.0)
+
+    events = []
+    for body_index, target_index, sample_index in zip(*np.nonzero(crossing)):
+        planet = planets[body_index]
+        point = target_point[target_index]
+        aspect = target_aspect[target_index]
+        title = catalog.get((planet, aspect, point))
+        if title is None:
+            continue
+
+        body_id = SWE_IDS[bodies[body_index]]
+        target = target_longitude[target_index]
+        exact_jd = brent(lambda jd: _wrap(_swe_position(body_id, jd)[0] - target),
+                         jds[sample_index], jds[sample_index + 1],
+                         before[body_index, target_index, sample_index],
+                         after[body_index, target_index, sample_index])
+        if not start_jd <= exact_jd < end_jd:
+            continue
+        events.append(_event(title, exact_jd, planet, point, aspect, target,
+                             natal_longitudes[point], 0.0, False))
+
+    # Estaciones: cambio de signo de la velocidad dentro del orbe de un aspecto
+    for body_index, sample_index in zip(*np.nonzero(np.signbit(speeds[:, :-1]) != np.signbit(speeds[:, 1:]))):
+        body_id = SWE_IDS[bodies[body_index]]
+        station_jd = brent(lambda jd: _swe_position(body_id, jd)[1],
+                           jds[sample_index], jds[sample_index + 1],
+                           speeds[body_index, sample_index], speeds[body_index, sample_index + 1])
+        if not start_jd <= station_jd < end_jd:
+            continue
+
+        station_longitude = _swe_position(body_id, station_jd)[0]
+        orbs = np.abs(_wrap(station_longitude - target_longitude))
+        planet = planets[body_index]
+        for target_index in np.nonzero(orbs <= station_orb)[0]:
+            point = target_point[target_index]
+            aspect = target_aspect[target_index]
+            title = catalog.get((planet, aspect, point))
+            if title is None:
+                continue
+            events.append(_event(title, station_jd, planet, point, aspect, station_longitude,
+                                 natal_longitudes[point], float(orbs[target_index]), True))
+
+    events.sort(key=lambda event: event['metadata']['jd'])
+    return events